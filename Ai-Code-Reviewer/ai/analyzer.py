@@ -1,30 +1,48 @@
-import json
-import subprocess
 import os
 import time
 
+from ai.cache import ReviewCache, cached_review, review_key, semantic_review
+from ai.llm import LLMError, OllamaClient
+from ai.stream import ReviewParser
+
+PROMPT_VERSION = "ollama-json/1"  # bump when the prompt below changes; part of the cache key
+REVIEW_TIMEOUT = 120  # seconds for one review, model load included
+
 class AIReviewer:
     def __init__(self):
         self.model = "deepseek-coder:6.7b"
+        self.cache = ReviewCache()
+        # one pooled HTTP session to the local server (OLLAMA_HOST); the model stays loaded for
+        # OLLAMA_KEEP_ALIVE after each review instead of being started by every `ollama run`
+        self.llm = OllamaClient(self.model)
         self._check_ollama()
     
     def _check_ollama(self):
-        """Check if Ollama is installed and running"""
+        """Check that the Ollama server is up and has the model, and start loading it"""
         try:
-            result = subprocess.run(['ollama', 'list'], capture_output=True, text=True, timeout=30)
-            print(f"Ollama check - return code: {result.returncode}")
-            print(f"Ollama check - stdout: {result.stdout}")
-            print(f"Ollama check - stderr: {result.stderr}")
+            models = self.llm.models()
+            print(f"Ollama check - models: {models}")
             
-            if result.returncode != 0:
-                print("Warning: Ollama is not responding properly")
+            if self.model not in models and f"{self.model}:latest" not in models:
+                print(f"Warning: model {self.model} is not pulled (ollama pull {self.model})")
                 return False
+            self.llm.warm()
             return True
-        except Exception as e:
+        except LLMError as e:
             print(f"Ollama check failed: {e}")
             return False
     
     def review_code(self, code):
+        """Review code, answering identical or reformatted code from the review cache"""
+        key = review_key(code, "python", self.model, PROMPT_VERSION)
+        cacheable = lambda r: "error" not in r and "raw_response" not in r and not r.get("partial")
+        review = cached_review(self.cache, key, lambda: semantic_review(
+            self.cache, code, "python", self.model, PROMPT_VERSION, lambda: self._review(code), cacheable),
+            cacheable)
+        print(f"Review cache: {review['cache']['status']}")
+        return review
+
+    def _review(self, code):
         print(f"Starting code review for code length: {len(code)}")
         
         # If code is too short, return early
@@ -63,48 +81,47 @@ class AIReviewer:
             print(f"Sending request to Ollama with model: {self.model}")
             start_time = time.time()
             
-            result = subprocess.run([
-                'ollama', 'run', self.model, prompt
-            ], capture_output=True, text=True, timeout=120)
+            # streamed, so reading stops (and Ollama stops generating) once the JSON object is closed
+            parser = ReviewParser()
+            reply = self.llm.stream(prompt, max_tokens=1024, temperature=0.0,
+                                    deadline=time.monotonic() + REVIEW_TIMEOUT)
+            try:
+                for delta in reply:
+                    parser.feed(delta)
+                    if parser.closed:
+                        break
+            finally:
+                reply.close()
             
             end_time = time.time()
             print(f"Ollama response time: {end_time - start_time:.2f} seconds")
-            print(f"Ollama return code: {result.returncode}")
-            print(f"Ollama stdout length: {len(result.stdout)}")
-            print(f"Ollama stderr: {result.stderr}")
+            print(f"Ollama reply length: {len(parser.text)}")
             
-            if result.returncode != 0:
-                error_response = {
-                    "summary": "Error running AI model",
-                    "issues": [],
-                    "rating": 0,
-                    "error": result.stderr
-                }
-                print(f"Error response: {error_response}")
-                return error_response
-            
-            response_text = result.stdout
+            response_text = parser.text
             print(f"Raw AI response: {response_text[:500]}...")  # First 500 chars
             
-            # Try to extract JSON from response
+            # Parse the first JSON object in the response; prose around it is ignored and a
+            # reply cut off mid-object keeps the fields and issues it completed
             try:
-                start_idx = response_text.find('{')
-                end_idx = response_text.rfind('}') + 1
-                if start_idx != -1 and end_idx != 0:
-                    json_str = response_text[start_idx:end_idx]
-                    print(f"Extracted JSON: {json_str}")
-                    parsed_response = json.loads(json_str)
-                    print(f"Parsed response: {parsed_response}")
-                    return parsed_response
-                else:
-                    print("No JSON found in response, using fallback")
-                    return self._create_fallback_response(response_text)
-                    
-            except json.JSONDecodeError as e:
+                parsed_response = parser.result()
+                if not parser.closed:
+                    parsed_response["partial"] = True  # cut off by num_predict or the timeout; shown, never cached
+                print(f"Parsed response: {parsed_response}")
+                return parsed_response
+            except ValueError as e:
                 print(f"JSON parse error: {e}")
                 return self._create_fallback_response(response_text)
                 
-        except subprocess.TimeoutExpired:
+        except LLMError as e:
+            error_response = {
+                "summary": "Error running AI model",
+                "issues": [],
+                "rating": 0,
+                "error": str(e)
+            }
+            print(f"Error response: {error_response}")
+            return error_response
+        except TimeoutError:
             print("Ollama request timed out")
             return {
                 "summary": "AI review timed out",
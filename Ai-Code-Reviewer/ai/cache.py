@@ -0,0 +1,179 @@
+# cache.py  –  content-addressed SQLite cache for finished reviews
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from ai.fingerprint import fingerprint, line_marks, remap_issues
+
+DEFAULT_PATH = os.environ.get(
+    "REVIEW_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "review_cache.sqlite3"))
+TTL = 7 * 24 * 3600          # seconds a review stays valid
+MAX_BYTES = 64 * 1024 * 1024  # stored JSON beyond this is evicted, least recently used first
+
+
+def review_key(code: str, language: str, model: str, prompt_version) -> str:
+    """sha256 over everything that decides what the reviewer answers."""
+    h = hashlib.sha256()
+    for part in (code, language, model, str(prompt_version)):
+        data = part.encode("utf-8")
+        h.update(len(data).to_bytes(8, "little"))  # length-prefixed, so fields cannot run together
+        h.update(data)
+    return h.hexdigest()
+
+
+class ReviewCache:
+    """Reviews keyed by review_key() in one SQLite file.
+
+    Entries older than ttl are misses and are purged on the next write; when
+    the stored JSON exceeds max_bytes the least recently read entries go first.
+    Connections are per thread, so one cache can serve a threaded Flask app.
+    Set REVIEW_CACHE=off to disable it without touching code.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, ttl: float = TTL, max_bytes: int = MAX_BYTES):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.enabled = os.environ.get("REVIEW_CACHE", "on").lower() not in ("0", "off", "false", "no")
+        self._local = threading.local()
+
+    def _db(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("CREATE TABLE IF NOT EXISTS reviews ("
+                       "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+                       "created REAL NOT NULL, used REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS reviews_used ON reviews(used)")
+            self._local.db = db
+        return db
+
+    def get(self, key: str) -> Optional[Dict]:
+        """The cached review with its age in seconds under "_age", or None."""
+        if not self.enabled:
+            return None
+        try:
+            db = self._db()
+            now = time.time()
+            row = db.execute("SELECT value, created FROM reviews WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                db.execute("DELETE FROM reviews WHERE key = ?", (key,))
+                return None
+            db.execute("UPDATE reviews SET used = ? WHERE key = ?", (now, key))
+            review = json.loads(row[0])
+            review["_age"] = now - row[1]
+            return review
+        except (sqlite3.Error, ValueError) as e:
+            print(">>> review cache read failed:", e)
+            return None
+
+    def put(self, key: str, review: Dict) -> bool:
+        if not self.enabled:
+            return False
+        try:
+            value = json.dumps(review)
+            now = time.time()
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                db.execute("INSERT OR REPLACE INTO reviews VALUES (?, ?, ?, ?, ?)",
+                           (key, value, len(value), now, now))
+                db.execute("DELETE FROM reviews WHERE created < ?", (now - self.ttl,))
+                # running total from the most recently used down; everything past the budget goes
+                db.execute("DELETE FROM reviews WHERE key IN (SELECT key FROM ("
+                           "SELECT key, SUM(size) OVER (ORDER BY used DESC, key) AS total FROM reviews"
+                           ") WHERE total > ?)", (self.max_bytes,))
+                db.execute("COMMIT")
+            except sqlite3.Error:
+                db.execute("ROLLBACK")
+                raise
+            return True
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            print(">>> review cache write failed:", e)
+            return False
+
+    def stats(self) -> Dict:
+        entries, size = self._db().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM reviews").fetchone()
+        return {"path": self.path, "entries": entries, "bytes": size, "max_bytes": self.max_bytes, "ttl": self.ttl}
+
+    def clear(self) -> None:
+        self._db().execute("DELETE FROM reviews")
+
+
+def cache_lookup(cache: Optional[ReviewCache], key: str) -> Optional[Dict]:
+    """The stored review with a "cache": {"status": "hit", ...} field, or None."""
+    start = time.perf_counter()
+    if cache is None or not cache.enabled:
+        return None
+    review = cache.get(key)
+    if review is not None:
+        age = review.pop("_age")
+        review["cache"] = {"status": "hit", "key": key[:16], "age_s": round(age, 1),
+                           "ms": round((time.perf_counter() - start) * 1000, 2)}
+    return review
+
+
+def cache_store(cache: Optional[ReviewCache], key: str, review: Dict,
+                cacheable=lambda r: "error" not in r and not r.get("partial")) -> Dict:
+    """Store a freshly computed review if cacheable() and give it its "cache" status field."""
+    if cache is None or not cache.enabled:
+        review["cache"] = {"status": "off"}
+        return review
+    inner = review.pop("cache", None)  # left by semantic_review when an equivalent source matched
+    stored = cacheable(review) and cache.put(key, review)
+    review["cache"] = {"status": "miss", "key": key[:16], "stored": bool(stored)}
+    if inner:
+        review["cache"].update(inner, key=key[:16])
+    return review
+
+
+def cached_review(cache: Optional[ReviewCache], key: str, compute,
+                  cacheable=lambda r: "error" not in r and not r.get("partial")) -> Dict:
+    """Return compute()'s review, served from cache when possible, with a "cache" status field.
+
+    Reviews that fail cacheable() (by default: carrying an "error", e.g. AI
+    offline, or flagged "partial" after a missed deadline) are returned but
+    never stored.
+    """
+    review = cache_lookup(cache, key)
+    if review is None:
+        review = cache_store(cache, key, compute(), cacheable)
+    return review
+
+
+def semantic_review(cache: Optional[ReviewCache], code: str, language: str, model: str, prompt_version,
+                    compute, cacheable=lambda r: "error" not in r and not r.get("partial")) -> Dict:
+    """Reuse a review of equivalent code: same fingerprint, lines moved onto this source.
+
+    Python is compared by normalized AST (no comments or docstrings, locals
+    alpha-renamed), other languages by their comment-free token stream.  On a
+    match the review gets "cache": {"status": "semantic", ...}.  As with
+    cached_review, reviews that fail cacheable() (errors, partial answers) are
+    never stored.
+    """
+    if cache is None or not cache.enabled:
+        return compute()
+    fp = fingerprint(code, language)
+    key = review_key(fp.digest, language, model, f"{prompt_version}/{fp.kind}")
+    entry = cache.get(key)
+    if entry is not None:
+        review = entry["review"]
+        review["issues"] = remap_issues(review.get("issues", []), entry["marks"], fp.lines)
+        review["cache"] = {"status": "semantic", "key": key[:16], "fingerprint": fp.kind,
+                           "age_s": round(entry["_age"], 1)}
+        return review
+    review = compute()
+    if cacheable(review):
+        cache.put(key, {"review": review, "marks": line_marks(fp.lines)})
+    return review
@@ -0,0 +1,83 @@
+// JavaCheck.java  –  resident javac for ai/workers.py (run with `java JavaCheck.java`, JDK 11+)
+// Reads "<n>\n" + n bytes of source from stdin and answers with one
+// "<line>\t<severity>\t<message>" line per diagnostic followed by "END".
+// n = 0 is a health-check ping.  Sources are parsed and attributed in this
+// JVM, so only the first request pays for compiler start-up.
+import com.sun.source.util.JavacTask;
+import java.io.*;
+import java.net.URI;
+import java.nio.charset.StandardCharsets;
+import java.util.List;
+import java.util.Locale;
+import java.util.regex.Matcher;
+import java.util.regex.Pattern;
+import javax.tools.*;
+
+public class JavaCheck {
+    // javac insists that a public top-level type lives in a file of the same name
+    private static final Pattern PUBLIC_TYPE = Pattern.compile(
+            "public\\s+(?:(?:abstract|final|sealed|non-sealed|static|strictfp)\\s+)*"
+            + "(?:class|interface|enum|record|@interface)\\s+(\\w+)");
+
+    public static void main(String[] args) throws IOException {
+        JavaCompiler javac = ToolProvider.getSystemJavaCompiler();
+        StandardJavaFileManager files = javac.getStandardFileManager(null, Locale.ROOT, StandardCharsets.UTF_8);
+        InputStream in = new BufferedInputStream(System.in);
+        PrintStream out = new PrintStream(new FileOutputStream(FileDescriptor.out), false, "UTF-8");
+        out.print("READY\n");
+        out.flush();
+        String header;
+        while ((header = readLine(in)) != null) {
+            int size = Integer.parseInt(header.trim());
+            byte[] data = in.readNBytes(size);
+            if (size > 0) {
+                check(javac, files, new String(data, StandardCharsets.UTF_8), out);
+            }
+            out.print("END\n");
+            out.flush();
+        }
+    }
+
+    static void check(JavaCompiler javac, StandardJavaFileManager files, String code, PrintStream out) {
+        Matcher m = PUBLIC_TYPE.matcher(code);
+        String name = m.find() ? m.group(1) : "Main";
+        JavaFileObject source = new SimpleJavaFileObject(
+                URI.create("string:///" + name + ".java"), JavaFileObject.Kind.SOURCE) {
+            @Override
+            public CharSequence getCharContent(boolean ignoreEncodingErrors) {
+                return code;
+            }
+        };
+        DiagnosticCollector<JavaFileObject> diagnostics = new DiagnosticCollector<>();
+        JavacTask task = (JavacTask) javac.getTask(
+                null, files, diagnostics, List.of("-Xlint", "-proc:none"), null, List.of(source));
+        try {
+            task.analyze();
+        } catch (RuntimeException | Error e) {
+            out.print("1\thigh\tjavac crashed: " + clean(String.valueOf(e)) + "\n");
+        }
+        for (Diagnostic<? extends JavaFileObject> d : diagnostics.getDiagnostics()) {
+            String severity = d.getKind() == Diagnostic.Kind.ERROR ? "high"
+                    : d.getKind() == Diagnostic.Kind.NOTE ? null : "medium";
+            if (severity != null) {
+                out.print(Math.max(1, d.getLineNumber()) + "\t" + severity + "\t" + clean(d.getMessage(Locale.ROOT)) + "\n");
+            }
+        }
+    }
+
+    static String clean(String message) {
+        return message.split("\n", 2)[0].replace('\t', ' ').replace('\r', ' ');
+    }
+
+    static String readLine(InputStream in) throws IOException {
+        StringBuilder line = new StringBuilder();
+        int c;
+        while ((c = in.read()) != -1) {
+            if (c == '\n') {
+                return line.toString();
+            }
+            line.append((char) c);
+        }
+        return line.length() > 0 ? line.toString() : null;
+    }
+}
@@ -0,0 +1,40 @@
+// js_check.js  –  resident JavaScript syntax checker for ai/workers.py
+// Reads "<n>\n" + n bytes of source from stdin and answers with one
+// "<line>\t<severity>\t<message>" line per finding followed by "END".
+// n = 0 is a health-check ping.  Sources are compiled the way `node --check`
+// compiles a CommonJS file (wrapped in the module function, never run).
+'use strict';
+const vm = require('vm');
+
+const PARAMS = ['exports', 'require', 'module', '__filename', '__dirname'];
+let pending = Buffer.alloc(0);
+
+function check(code) {
+  try {
+    vm.compileFunction(code, PARAMS, { filename: 'input.js' });
+    return '';
+  } catch (e) {
+    const at = /input\.js:(\d+)/.exec(e.stack || '');
+    const message = `${e.name}: ${e.message}`.replace(/[\t\r\n]+/g, ' ');
+    return `${at ? at[1] : 1}\thigh\t${message}\n`;
+  }
+}
+
+function drain() {
+  for (;;) {
+    const nl = pending.indexOf(10);
+    if (nl < 0) return;
+    const size = parseInt(pending.subarray(0, nl).toString(), 10);
+    if (pending.length < nl + 1 + size) return;
+    const code = pending.subarray(nl + 1, nl + 1 + size).toString('utf8');
+    pending = pending.subarray(nl + 1 + size);
+    process.stdout.write((size > 0 ? check(code) : '') + 'END\n');
+  }
+}
+
+process.stdin.on('data', (chunk) => {
+  pending = Buffer.concat([pending, chunk]);
+  drain();
+});
+process.stdin.on('end', () => process.exit(0));
+process.stdout.write('READY\n');
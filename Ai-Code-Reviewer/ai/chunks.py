@@ -0,0 +1,160 @@
+# chunks.py  –  split large sources at top-level definitions, review the pieces, merge the answers
+import ast
+import hashlib
+import time
+from concurrent.futures import TimeoutError as FuturesTimeout, as_completed
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+CHUNK_LINES = 150   # a chunk grows up to this many lines; one definition longer than that stays whole
+
+
+class Chunk(NamedTuple):
+    start: int      # first line in the whole file, 1-based
+    end: int        # last line, inclusive
+    code: str
+    digest: str     # sha256 of code; an unchanged chunk is answered from the review cache
+
+
+# ---------- where a file may be cut ----------
+def _python_blocks(code: str, lines: List[str]) -> Optional[List[int]]:
+    """First line of every top-level def/class, with its decorators and the comments right above it."""
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+    starts = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            while start > 1 and lines[start - 2].lstrip().startswith("#"):
+                start -= 1
+            starts.append(start)
+    return starts
+
+
+def _brace_blocks(code: str) -> List[int]:
+    """Line after every '}' that closes a top-level block, skipping strings, chars and comments."""
+    starts = []
+    depth = 0
+    line = 1
+    i, n = 0, len(code)
+    while i < n:
+        c = code[i]
+        if c == "\n":
+            line += 1
+        elif c == "/" and code.startswith("//", i):
+            j = code.find("\n", i)
+            i = n if j < 0 else j
+            continue
+        elif c == "/" and code.startswith("/*", i):
+            j = code.find("*/", i + 2)
+            j = n if j < 0 else j + 2
+            line += code.count("\n", i, j)
+            i = j
+            continue
+        elif c in "\"'`":
+            j = i + 1
+            while j < n and code[j] != c and (c == "`" or code[j] != "\n"):
+                j += 2 if code[j] == "\\" else 1
+            line += code.count("\n", i, j)
+            i = j + 1
+            continue
+        elif c == "{":
+            depth += 1
+        elif c == "}" and depth > 0:
+            depth -= 1
+            if depth == 0:
+                starts.append(line + 1)
+        i += 1
+    return starts
+
+
+def boundaries(code: str, language: str) -> List[int]:
+    """Sorted lines (> 1) where a top-level definition starts: via ast for Python, by brace
+    depth for the C-family (and for Python that does not parse)."""
+    lines = code.splitlines()
+    starts = _python_blocks(code, lines) if language == "python" else None
+    if starts is None:
+        starts = _brace_blocks(code)
+    return sorted({s for s in starts if 1 < s <= len(lines)})
+
+
+def split(code: str, language: str, most: int = CHUNK_LINES) -> List[Chunk]:
+    """Consecutive chunks of at most `most` lines (unless one definition is longer), cut only
+    between top-level definitions."""
+    lines = code.splitlines()
+    cuts = boundaries(code, language) + [len(lines) + 1]
+    chunks = []
+    begin = 1
+    last = 1   # latest possible cut at or after begin
+    for cut in cuts:
+        if cut - begin > most and last > begin:
+            chunks.append(_chunk(lines, begin, last - 1))
+            begin = last
+        last = cut
+    if begin <= len(lines):
+        chunks.append(_chunk(lines, begin, len(lines)))
+    return chunks
+
+
+def _chunk(lines: List[str], start: int, end: int) -> Chunk:
+    code = "\n".join(lines[start - 1:end]) + "\n"
+    return Chunk(start, end, code, hashlib.sha256(code.encode("utf-8")).hexdigest())
+
+
+# ---------- reviewing the pieces ----------
+def merge(chunks: List[Chunk], reviews: List[Optional[Dict]]) -> Dict:
+    """One review from per-chunk reviews (None = not back in time): issue lines moved by each
+    chunk's offset, score weighted by chunk length, summaries of the weakest parts first."""
+    issues, suggestions, scored = [], [], []
+    done = [(c, r) for c, r in zip(chunks, reviews) if r is not None and "error" not in r]
+    for chunk, review in done:
+        for issue in review.get("issues", []):
+            issue = dict(issue)
+            if isinstance(issue.get("line"), int):
+                issue["line"] += chunk.start - 1
+            issues.append(issue)
+        for s in review.get("suggestions", []):
+            if s not in suggestions:
+                suggestions.append(s)
+        if isinstance(review.get("score"), (int, float)):
+            scored.append((review["score"], chunk.end - chunk.start + 1, review.get("summary", "")))
+    issues.sort(key=lambda i: i["line"] if isinstance(i.get("line"), int) else 0)
+    weight = sum(n for _s, n, _t in scored)
+    summaries = [t for _s, _n, t in sorted(scored, key=lambda x: x[0]) if t]
+    late = sum(r is None for r in reviews)
+    failed = len(reviews) - late - len(done)
+    review = {
+        "score": round(sum(s * n for s, n, _t in scored) / weight) if weight else 0,
+        "summary": " ".join(dict.fromkeys(summaries[:3])) or "AI offline – linter only",
+        "issues": issues,
+        "suggestions": suggestions[:5],
+        "chunks": {"total": len(chunks), "late": late, "failed": failed},
+    }
+    if not done:
+        review["error"] = "no chunk was reviewed"
+    elif late or failed or any(r.get("partial") for _c, r in done):
+        review["partial"] = True  # a section missing or cut short: shown, never cached
+    return review
+
+
+def review_chunks(chunks: List[Chunk], review_one: Callable[[Chunk], Dict], executor,
+                  deadline: Optional[float] = None,
+                  on_review: Optional[Callable[[Chunk, Dict], None]] = None) -> Dict:
+    """Review every chunk concurrently on `executor` and merge what is back by `deadline`;
+    on_review(chunk, review) sees each chunk's own answer as soon as it arrives."""
+    futures = {executor.submit(review_one, c): c for c in chunks}
+    try:
+        for f in as_completed(futures, timeout=None if deadline is None else max(0.0, deadline - time.monotonic())):
+            if on_review is not None and not f.exception():
+                on_review(futures[f], f.result())
+    except FuturesTimeout:  # not the builtin TimeoutError before Python 3.11
+        pass  # late chunks are merged as missing
+    reviews = []
+    for f in futures:
+        f.cancel()
+        reviews.append(f.result() if f.done() and not f.cancelled() and not f.exception() else None)
+    review = merge(chunks, reviews)
+    review["chunks"]["cached"] = sum(
+        1 for r in reviews if r and r.get("cache", {}).get("status") in ("hit", "semantic"))
+    return review
@@ -0,0 +1,207 @@
+# diff.py  –  changed regions of a unified diff or of two git revisions, in new-file line numbers
+import hashlib
+import os
+import re
+import subprocess
+from bisect import bisect_right
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+from ai.chunks import CHUNK_LINES, boundaries
+
+CONTEXT = 10        # lines either side of a change when its enclosing definition is too long to send whole
+MAX_FILES = 50      # files reviewed from one diff; the rest are listed as skipped
+GIT_TIMEOUT = 10.0
+
+LANGUAGES = {
+    ".py": "python", ".pyw": "python",
+    ".java": "java",
+    ".js": "javascript", ".mjs": "javascript", ".cjs": "javascript", ".jsx": "javascript",
+    ".cpp": "cpp", ".cc": "cpp", ".cxx": "cpp", ".c++": "cpp", ".hpp": "cpp", ".hh": "cpp", ".hxx": "cpp", ".h": "cpp",
+}
+
+_HUNK = re.compile(r"@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+
+def language_of(path: str) -> Optional[str]:
+    """Reviewer language for a file name, None for files we have no linter or prompt for."""
+    return LANGUAGES.get(os.path.splitext(path)[1].lower())
+
+
+class Region(NamedTuple):
+    start: int                  # first new-file line, 1-based (same fields as chunks.Chunk, so chunks.merge applies)
+    end: int                    # last line, inclusive
+    code: str
+    digest: str                 # sha256 of code and of which lines changed; the AI answer is cached by it
+    changed: Tuple[int, ...]    # new-file lines added or edited inside the region
+
+    def marked(self) -> str:
+        """The region with '+ ' in front of changed lines and '  ' in front of context."""
+        changed = set(self.changed)
+        return "".join(("+ " if self.start + i in changed else "  ") + line + "\n"
+                       for i, line in enumerate(self.code.splitlines()))
+
+
+class Patch(NamedTuple):
+    path: str
+    language: Optional[str]
+    changed: Set[int]           # new-file lines added or edited, or the line after removed ones
+    lines: Dict[int, str]       # new-file lines the diff shows (context and added)
+    source: Optional[str]       # whole new file when known: git mode, or a file the diff adds
+
+
+# ---------- reading diffs ----------
+def _path(header: str) -> Optional[str]:
+    name = header.split("\t", 1)[0].strip()
+    if name == "/dev/null":
+        return None
+    if name.startswith('"') and name.endswith('"'):
+        name = name[1:-1]
+    return name[2:] if name[:2] in ("a/", "b/") else name
+
+
+def parse_diff(text: str) -> List[Patch]:
+    """Files of a unified diff (git or plain `diff -u`) with their changed lines; deleted and
+    binary files are left out."""
+    patches = []
+    path, created, changed, lines = None, False, set(), {}
+    line = old_left = new_left = 0
+    removed = False     # '-' lines since the last line that exists in the new file
+
+    def close():
+        if path is not None and changed:
+            whole = created and sorted(lines) == list(range(1, len(lines) + 1))
+            source = "".join(lines[n] + "\n" for n in sorted(lines)) if whole else None
+            patches.append(Patch(path, language_of(path), set(changed), dict(lines), source))
+
+    for raw in text.splitlines():
+        if old_left > 0 or new_left > 0:            # inside a hunk
+            if raw.startswith("+"):
+                lines[line] = raw[1:]
+                changed.add(line)
+                line, new_left, removed = line + 1, new_left - 1, False
+            elif raw.startswith("-"):
+                old_left, removed = old_left - 1, True
+            elif raw.startswith(" ") or raw == "":
+                lines[line] = raw[1:]
+                if removed:
+                    changed.add(line)
+                line, old_left, new_left, removed = line + 1, old_left - 1, new_left - 1, False
+            if old_left <= 0 and new_left <= 0 and removed:
+                changed.add(line)                   # removed at the end of the hunk: the line after the cut
+            continue
+        m = _HUNK.match(raw)
+        if m:
+            old_left = 1 if m.group(1) is None else int(m.group(1))
+            new_left = 1 if m.group(3) is None else int(m.group(3))
+            line = int(m.group(2)) + (1 if new_left == 0 else 0)  # an empty new side names the line before it
+            removed = False
+        elif raw.startswith("diff ") or raw.startswith("--- ") and path is not None:
+            close()
+            path, created, changed, lines = None, False, set(), {}
+            if raw.startswith("--- "):
+                created = _path(raw[4:]) is None
+        elif raw.startswith("--- "):
+            created = _path(raw[4:]) is None
+        elif raw.startswith("+++ "):
+            path = _path(raw[4:])
+        elif raw.startswith("new file mode"):
+            created = True
+    close()
+    return patches
+
+
+def _git(repo: str, *args: str, data: Optional[bytes] = None) -> bytes:
+    try:
+        done = subprocess.run(["git", "-C", repo, *args], input=data, capture_output=True, timeout=GIT_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise ValueError(f"git failed: {e}")
+    if done.returncode:
+        message = done.stderr.decode("utf-8", "replace").strip().splitlines() or [f"exit status {done.returncode}"]
+        raise ValueError("git failed: " + message[-1])
+    return done.stdout
+
+
+def git_diff(repo: str, base: str, head: Optional[str] = None) -> List[Patch]:
+    """Changes from revision `base` to `head` (the working tree when None) in a local repository,
+    each with the whole new file, so regions can grow to their enclosing definitions."""
+    for rev in (base, head):
+        if rev is not None and (not rev or rev.startswith("-") or any(c.isspace() for c in rev)):
+            raise ValueError(f"bad revision: {rev!r}")
+    if not os.path.isdir(repo):
+        raise ValueError(f"no such repository: {repo}")
+    revs = [base] + ([head] if head else [])
+    text = _git(repo, "diff", "--no-color", "--no-ext-diff", "--find-renames", "-U0", *revs, "--")
+    patches = [p for p in parse_diff(text.decode("utf-8", "replace")) if p.language]
+    if head:
+        sources = _blobs(repo, [f"{head}:{p.path}" for p in patches])
+    else:
+        top = _git(repo, "rev-parse", "--show-toplevel").decode().strip()
+        sources = [_read(os.path.join(top, p.path)) for p in patches]
+    return [p._replace(source=s) for p, s in zip(patches, sources)]
+
+
+def _blobs(repo: str, names: List[str]) -> List[Optional[str]]:
+    """Contents of many "<rev>:<path>" objects from one `git cat-file --batch`."""
+    if not names:
+        return []
+    out = _git(repo, "cat-file", "--batch", data="".join(n + "\n" for n in names).encode("utf-8"))
+    blobs, i = [], 0
+    for _name in names:
+        j = out.index(b"\n", i)
+        header = out[i:j].split()
+        if len(header) != 3 or header[1] != b"blob":
+            blobs.append(None)
+            i = j + 1
+            continue
+        size = int(header[2])
+        blobs.append(out[j + 1:j + 1 + size].decode("utf-8", "replace"))
+        i = j + 1 + size + 1
+    return blobs
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+# ---------- what to review ----------
+def regions(patch: Patch, most: int = CHUNK_LINES, context: int = CONTEXT) -> List[Region]:
+    """Each change grown to its enclosing top-level definition (or to the hunk the diff shows
+    when the whole file is unknown), cut to `context` lines around it when that is over `most`
+    lines; overlapping or touching regions are joined."""
+    if patch.source is not None:
+        text = patch.source.splitlines()
+        lines = dict(enumerate(text, 1))
+        starts = [1] + boundaries(patch.source, patch.language or "")
+        ends = [s - 1 for s in starts[1:]] + [len(text)]
+    else:
+        lines = patch.lines
+        starts, ends = [], []
+        for n in sorted(lines):     # runs of consecutive lines the diff shows
+            if starts and n == ends[-1] + 1:
+                ends[-1] = n
+            else:
+                starts.append(n)
+                ends.append(n)
+    # a cut at the end of the file has no line after it; mark the one before
+    marks = {n if n in lines else n - 1 for n in patch.changed} & lines.keys()
+    spans = []
+    for n in sorted(marks):
+        k = bisect_right(starts, n) - 1
+        s, e = (starts[k], ends[k]) if k >= 0 and n <= ends[k] else (n, n)
+        if e - s + 1 > most:
+            s, e = max(s, n - context), min(e, n + context)
+        if spans and s <= spans[-1][1] + 1:
+            spans[-1][1] = max(spans[-1][1], e)
+        else:
+            spans.append([s, e])
+    out = []
+    for s, e in spans:
+        code = "".join(lines.get(n, "") + "\n" for n in range(s, e + 1))
+        changed = tuple(n for n in range(s, e + 1) if n in marks)
+        digest = hashlib.sha256((code + "\0" + ",".join(str(n - s) for n in changed)).encode("utf-8")).hexdigest()
+        out.append(Region(s, e, code, digest, changed))
+    return out
@@ -0,0 +1,208 @@
+# fingerprint.py  –  formatting-proof fingerprints of source code, with a line map
+import ast
+import hashlib
+import re
+from typing import Dict, List, NamedTuple, Optional
+
+
+class Fingerprint(NamedTuple):
+    digest: str         # equal for code that differs only in layout, comments, docstrings or local names
+    lines: List[int]    # source line of each anchor (statement or token), in canonical order
+    kind: str           # "ast" or "tokens"
+
+
+# ---------- Python: normalized AST ----------
+def _strip_docstring(body: list) -> list:
+    if body and isinstance(body[0], ast.Expr) and isinstance(body[0].value, ast.Constant) \
+            and isinstance(body[0].value.value, str):
+        body = body[1:] or [ast.copy_location(ast.Pass(), body[0])]  # keeps a line for the anchor map
+    return body
+
+
+def _scope_locals(node) -> set:
+    """Names local to a function: arguments, assignment targets, imports, nested defs."""
+    a = node.args
+    names = {x.arg for x in a.posonlyargs + a.args + a.kwonlyargs}
+    names |= {x.arg for x in (a.vararg, a.kwarg) if x}
+    declared = set()
+    todo = list(node.body) if isinstance(node.body, list) else [node.body]
+    while todo:
+        n = todo.pop()
+        if isinstance(n, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(n.name)
+            todo.extend(n.decorator_list)
+            continue  # their bodies are scopes of their own
+        if isinstance(n, ast.Lambda):
+            continue
+        if isinstance(n, (ast.Global, ast.Nonlocal)):
+            declared.update(n.names)
+        elif isinstance(n, ast.Name) and isinstance(n.ctx, (ast.Store, ast.Del)):
+            names.add(n.id)
+        elif isinstance(n, ast.alias):
+            names.add((n.asname or n.name).split(".")[0])
+        elif isinstance(n, ast.ExceptHandler) and n.name:
+            names.add(n.name)
+        todo.extend(ast.iter_child_nodes(n))
+    return names - declared
+
+
+class _Normalizer(ast.NodeTransformer):
+    """Drops docstrings and renames function locals to _0, _1, ... in order of first use."""
+
+    def __init__(self):
+        self.scopes = []  # (locals, mapping) per enclosing function, innermost last
+
+    def rename(self, name: str) -> str:
+        for local, mapping in reversed(self.scopes):
+            if name in local:
+                if name not in mapping:
+                    mapping[name] = f"_{len(mapping)}"
+                return mapping[name]
+        return name
+
+    def visit_Module(self, node):
+        node.body = _strip_docstring(node.body)
+        return self.generic_visit(node)
+
+    def visit_ClassDef(self, node):
+        node.name = self.rename(node.name)
+        node.body = _strip_docstring(node.body)
+        return self.generic_visit(node)
+
+    def _function(self, node):
+        node.name = self.rename(node.name)
+        for field in ("decorator_list", "returns"):
+            value = getattr(node, field)
+            setattr(node, field, [self.visit(v) for v in value] if isinstance(value, list)
+                    else value and self.visit(value))
+        a = node.args
+        a.defaults = [self.visit(d) for d in a.defaults]
+        a.kw_defaults = [d and self.visit(d) for d in a.kw_defaults]
+        self.scopes.append((_scope_locals(node), {}))
+        node.args = self.visit(a)
+        node.body = [self.visit(s) for s in _strip_docstring(node.body)]
+        self.scopes.pop()
+        return node
+
+    visit_FunctionDef = visit_AsyncFunctionDef = _function
+
+    def visit_Lambda(self, node):
+        node.args.defaults = [self.visit(d) for d in node.args.defaults]
+        self.scopes.append((_scope_locals(node), {}))
+        node.args = self.visit(node.args)
+        node.body = self.visit(node.body)
+        self.scopes.pop()
+        return node
+
+    def visit_arguments(self, node):
+        for a in node.posonlyargs + node.args + node.kwonlyargs + [node.vararg, node.kwarg]:
+            if a is not None:
+                a.arg = self.rename(a.arg)
+                if a.annotation:
+                    a.annotation = self.visit(a.annotation)
+        return node
+
+    def visit_Name(self, node):
+        node.id = self.rename(node.id)
+        return node
+
+    def visit_Nonlocal(self, node):
+        node.names = [self.rename(n) for n in node.names]
+        return node
+
+    def visit_ExceptHandler(self, node):
+        if node.name:
+            node.name = self.rename(node.name)
+        return self.generic_visit(node)
+
+    def visit_alias(self, node):
+        if self.scopes:
+            local = node.asname or node.name
+            if "." not in local:
+                node.asname = self.rename(local)
+        return node
+
+
+def _anchors(tree) -> List[int]:
+    """Line of every statement and except clause in source order."""
+    lines = []
+    todo = [tree]
+    while todo:
+        n = todo.pop()
+        if isinstance(n, (ast.stmt, ast.ExceptHandler)):
+            lines.append(n.lineno)
+        todo.extend(reversed(list(ast.iter_child_nodes(n))))
+    return lines
+
+
+def python_fingerprint(code: str) -> Optional[Fingerprint]:
+    try:
+        tree = ast.parse(code)
+    except (SyntaxError, ValueError):
+        return None
+    tree = _Normalizer().visit(tree)
+    dump = ast.dump(tree, annotate_fields=False, include_attributes=False)
+    return Fingerprint(hashlib.sha256(dump.encode()).hexdigest(), _anchors(tree), "ast")
+
+
+# ---------- everything else: token stream ----------
+_TOKEN = re.compile(r"""
+    (?P<comment>//[^\n]*|/\*.*?\*/|\#[^\n]*)
+  | (?P<string>"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])*'|`(?:\\.|[^`\\])*`)
+  | (?P<word>[A-Za-z_$][\w$]*|\d[\w.]*)
+  | (?P<space>\s+)
+  | (?P<op>.)
+""", re.S | re.X)
+
+
+def token_fingerprint(code: str, language: str) -> Fingerprint:
+    """Comments and layout removed; '#' starts a comment only for Python (C/C++ use it for directives)."""
+    h = hashlib.sha256()
+    lines = []
+    line = 1
+    for m in _TOKEN.finditer(code):
+        kind, text = m.lastgroup, m.group()
+        if kind == "comment" and (text[0] != "#" or language == "python"):
+            pass
+        elif kind != "space":
+            h.update(text.encode() + b"\0")
+            lines.append(line)
+        line += text.count("\n")
+    return Fingerprint(h.hexdigest(), lines, "tokens")
+
+
+def fingerprint(code: str, language: str) -> Fingerprint:
+    """AST fingerprint for parseable Python, token-stream fingerprint otherwise."""
+    return (language == "python" and python_fingerprint(code)) or token_fingerprint(code, language)
+
+
+# ---------- moving line numbers between equivalent sources ----------
+def line_marks(lines: List[int]) -> List[List[int]]:
+    """[anchor index, line] wherever the line changes; the compact form kept in the cache."""
+    marks, last = [], None
+    for k, line in enumerate(lines):
+        if line != last:
+            marks.append([k, line])
+            last = line
+    return marks
+
+
+def remap_line(line: int, marks: List[List[int]], new_lines: List[int]) -> int:
+    """Line in the new source holding the anchor that was at (or last before) `line` in the old one."""
+    best = None
+    for index, old in marks:
+        if old <= line and (best is None or old > best[1]):
+            best = index, old
+    if best is None or best[0] >= len(new_lines):
+        return line
+    return new_lines[best[0]]
+
+
+def remap_issues(issues: List[Dict], marks: List[List[int]], new_lines: List[int]) -> List[Dict]:
+    out = []
+    for issue in issues:
+        issue = dict(issue)
+        if isinstance(issue.get("line"), int):
+            issue["line"] = remap_line(issue["line"], marks, new_lines)
+        out.append(issue)
+    return out
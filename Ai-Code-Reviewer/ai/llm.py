@@ -0,0 +1,421 @@
+# llm.py  –  pooled, rate-limited, provider-agnostic LLM client (OpenAI-compatible chat API, or Ollama's own)
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+import httpx
+
+PROVIDERS = {   # base URLs of OpenAI-compatible /chat/completions endpoints
+    "groq": "https://api.groq.com/openai/v1",
+    "openai": "https://api.openai.com/v1",
+    "together": "https://api.together.xyz/v1",
+    "ollama": "http://localhost:11434/v1",
+}
+RPM = float(os.environ.get("LLM_RPM", "30"))        # provider limits; 30 requests is the Groq free tier
+TPM = float(os.environ.get("LLM_TPM", "30000"))     # a large file's sections (~1.5-2k tokens each) go out at once;
+                                                    # the free tier's 6000 holds about three, set LLM_TPM=6000 there
+CONCURRENCY = int(os.environ.get("LLM_CONCURRENCY", "16"))  # upstream calls in flight at once
+RETRY_STATUS = {429, 500, 502, 503, 504}
+MAX_RETRIES = 4
+BACKOFF_BASE = 0.25     # seconds; retry n sleeps a random time up to BACKOFF_BASE * 2**n ("full jitter")
+BACKOFF_CAP = 8.0
+READ_TIMEOUT = 30.0     # longest pause between two streamed chunks when there is no deadline
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "30m")  # how long Ollama keeps the model loaded after a call
+
+
+class LLMError(RuntimeError):
+    """The provider refused or failed a request; status is its HTTP status when there was one."""
+
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+# ---------- rate limits ----------
+class TokenBucket:
+    """`per_minute` units a minute, bursts up to a minute's worth.
+
+    take() spends the units at once, even into debt, and wait_for() counts that
+    debt, so waiting callers are served in arrival order instead of racing each
+    other whenever the bucket refills.
+    """
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = per_minute
+        self.level = per_minute
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def wait_for(self, amount: float) -> float:
+        with self.lock:
+            self._refill()
+            return max(0.0, (amount - self.level) / self.rate)
+
+    def take(self, amount: float) -> None:
+        with self.lock:
+            self._refill()
+            self.level -= amount
+
+    def give(self, amount: float) -> None:
+        """Return over-estimated units (or charge more with a negative amount)."""
+        with self.lock:
+            self._refill()
+            self.level = min(self.capacity, self.level + amount)
+
+    def pause(self, seconds: float) -> None:
+        """Nothing more for `seconds` (the provider said 429)."""
+        with self.lock:
+            self._refill()
+            self.level = min(self.level, -self.rate * seconds)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute buckets checked together."""
+
+    def __init__(self, rpm: float = RPM, tpm: float = TPM):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.lock = threading.Lock()
+
+    def acquire(self, tokens: float, deadline: Optional[float] = None) -> float:
+        """Reserve one request and `tokens` tokens, sleeping until they are available; raises
+        LLMError(429) at once when that would pass the deadline.  Returns the seconds waited."""
+        with self.lock:  # both buckets or neither
+            wait = max(self.requests.wait_for(1), self.tokens.wait_for(tokens))
+            if deadline is not None and time.monotonic() + wait > deadline:
+                raise LLMError(f"rate limit: next slot in {wait:.1f}s, after the deadline", 429)
+            self.requests.take(1)
+            self.tokens.take(tokens)
+        if wait:
+            time.sleep(wait)
+        return wait
+
+    def settle(self, estimated: float, used: float) -> None:
+        self.tokens.give(estimated - used)
+
+    def pause(self, seconds: float) -> None:
+        self.requests.pause(seconds)
+        self.tokens.pause(seconds)
+
+
+# ---------- single flight ----------
+class _Flight:
+    """One upstream call and everyone waiting for it: deltas are kept so late joiners replay them."""
+
+    def __init__(self):
+        self.parts = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.readers = 0
+        self.deadline: Optional[float] = 0.0   # latest reader deadline, None = a reader without one
+        self.cond = threading.Condition()
+
+    def join(self, deadline: Optional[float]) -> None:
+        with self.cond:
+            self.readers += 1
+            if deadline is None or self.deadline is None:
+                self.deadline = None
+            else:
+                self.deadline = max(self.deadline, deadline)
+
+    def push(self, text: str) -> None:
+        with self.cond:
+            self.parts.append(text)
+            self.cond.notify_all()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        with self.cond:
+            self.done, self.error = True, error
+            self.cond.notify_all()
+
+    def expired(self) -> bool:
+        """Every reader's deadline has passed."""
+        with self.cond:
+            return self.deadline is not None and time.monotonic() > self.deadline
+
+    def abandoned(self) -> bool:
+        """Nobody is waiting any more: not worth sending."""
+        with self.cond:
+            return self.readers <= 0 or self.deadline is not None and time.monotonic() > self.deadline
+
+    def read(self, deadline: Optional[float]) -> "_Reader":
+        return _Reader(self, deadline)
+
+    def leave(self) -> None:
+        with self.cond:
+            self.readers -= 1
+
+
+class _Reader:
+    """One caller's deltas of a flight.  The caller stops counting as a reader when the reply
+    ends, fails, or the reader is closed or dropped, started or not."""
+
+    def __init__(self, flight: _Flight, deadline: Optional[float]):
+        self.flight = flight
+        self.deadline = deadline
+        self.seen = 0
+        self.ready = deque()    # deltas fetched but not yet handed out
+        self.left = False
+
+    def __iter__(self) -> "_Reader":
+        return self
+
+    def __next__(self) -> str:
+        if self.ready:
+            return self.ready.popleft()
+        if self.left:
+            raise StopIteration
+        flight = self.flight
+        try:
+            with flight.cond:
+                while self.seen >= len(flight.parts) and not flight.done:
+                    left = None if self.deadline is None else self.deadline - time.monotonic()
+                    if left is not None and left <= 0:
+                        raise TimeoutError("LLM reply missed the deadline")
+                    flight.cond.wait(left)
+                parts, error = flight.parts[self.seen:], flight.error
+        except BaseException:
+            self.close()
+            raise
+        self.seen += len(parts)
+        if parts:
+            self.ready.extend(parts)
+            return self.ready.popleft()
+        self.close()  # done, and everything handed out
+        if error is not None:
+            raise error
+        raise StopIteration
+
+    def close(self) -> None:
+        if not self.left:
+            self.left = True
+            self.flight.leave()
+
+    __del__ = close
+
+
+# ---------- client ----------
+class LLMClient:
+    """Chat completions from any OpenAI-compatible provider.
+
+    - one keep-alive httpx connection pool per client
+    - RPM / TPM token buckets; a request that cannot get a slot before its
+      deadline fails at once instead of queueing
+    - 429 / 5xx / dropped connections are retried with full-jitter exponential
+      backoff (Retry-After wins when the provider sends it; a 429 pauses the
+      whole limiter)
+    - single flight: identical requests in flight share one upstream call,
+      and every caller gets the streamed deltas
+    """
+    path = "/chat/completions"
+    read_timeout = READ_TIMEOUT
+
+    def __init__(self, model: str, provider: str = "groq", api_key: Optional[str] = None,
+                 base_url: Optional[str] = None, rpm: float = RPM, tpm: float = TPM,
+                 concurrency: int = CONCURRENCY):
+        self.model = model
+        self.provider = provider
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.http = httpx.Client(
+            base_url=base_url or PROVIDERS[provider], headers=headers,
+            limits=httpx.Limits(max_connections=max(concurrency, 64), max_keepalive_connections=max(concurrency, 64),
+                                keepalive_expiry=120),  # self.slots is the real cap
+            timeout=httpx.Timeout(self.read_timeout, connect=5.0))
+        self.limiter = RateLimiter(rpm, tpm)
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.runner = ThreadPoolExecutor(max_workers=max(8, 2 * concurrency), thread_name_prefix="llm")
+        self.flights: Dict[str, _Flight] = {}
+        self.lock = threading.Lock()   # flights and stats
+        self.stats = {"requests": 0, "coalesced": 0, "retries": 0, "throttled_s": 0.0}
+
+    def set_concurrency(self, concurrency: int) -> None:
+        """Cap on upstream calls in flight (call before the first request)."""
+        self.slots = threading.BoundedSemaphore(concurrency)
+
+    def complete(self, prompt: str, max_tokens: int = 350, temperature: float = 0.0,
+                 deadline: Optional[float] = None) -> str:
+        """The whole reply text; `deadline` is a time.monotonic() value."""
+        return "".join(self.stream(prompt, max_tokens, temperature, deadline))
+
+    def stream(self, prompt: str, max_tokens: int = 350, temperature: float = 0.0,
+               deadline: Optional[float] = None) -> Iterator[str]:
+        """Reply deltas as they arrive.  Closing the iterator early is fine; raises LLMError
+        or TimeoutError (when `deadline` passes first)."""
+        body = {"model": self.model, "messages": [{"role": "user", "content": prompt}],
+                "max_tokens": max_tokens, "temperature": temperature}
+        key = hashlib.sha256(json.dumps(body, sort_keys=True).encode("utf-8")).hexdigest()
+        with self.lock:
+            flight = self.flights.get(key)
+            fresh = flight is None
+            if fresh:
+                flight = self.flights[key] = _Flight()
+            else:
+                self.stats["coalesced"] += 1
+            flight.join(deadline)
+        if fresh:
+            self.runner.submit(self._run, key, flight, body)
+        return flight.read(deadline)
+
+    def _run(self, key: str, flight: _Flight, body: Dict) -> None:
+        try:
+            self._call(flight, body)
+            flight.finish()
+        except BaseException as e:
+            flight.finish(e)
+        finally:
+            with self.lock:
+                self.flights.pop(key, None)
+
+    def _call(self, flight: _Flight, body: Dict) -> None:
+        estimate = len(body["messages"][0]["content"]) / 4 + body["max_tokens"]  # ~4 characters a token
+        error = None
+        for attempt in range(MAX_RETRIES + 1):
+            if flight.abandoned():
+                raise TimeoutError("LLM request abandoned before it was sent")
+            self._count("throttled_s", self.limiter.acquire(estimate, flight.deadline))
+            left = None if flight.deadline is None else flight.deadline - time.monotonic()
+            slots = self.slots
+            if not slots.acquire(timeout=left if left is None or left > 0 else 0):
+                raise TimeoutError("no free LLM connection before the deadline")
+            try:
+                self._count("requests")
+                read = self.read_timeout if left is None else max(0.05, min(self.read_timeout, left))
+                with self.http.stream("POST", self.path, json=self._payload(body),
+                                      timeout=httpx.Timeout(read, connect=min(5.0, read))) as resp:
+                    if resp.status_code < 400:
+                        used = self._relay(resp, flight)
+                        self.limiter.settle(estimate, used if used is not None else
+                                            estimate - body["max_tokens"] + len("".join(flight.parts)) / 4)
+                        return
+                    resp.read()
+                    error = LLMError(f"{self.provider} answered {resp.status_code}: {resp.text[:200]}",
+                                     resp.status_code, _retry_after(resp.headers))
+                    if resp.status_code not in RETRY_STATUS:
+                        raise error
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError) as e:
+                if flight.parts:
+                    raise  # readers already have half a reply; it cannot be restarted
+                error = LLMError(f"{self.provider} connection failed: {e}")
+            finally:
+                slots.release()
+            if error.status == 429:
+                # the paused limiter makes the next acquire() wait; a little jitter keeps retries apart
+                self.limiter.pause(error.retry_after or min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+                delay = random.uniform(0, BACKOFF_BASE)
+            else:
+                delay = error.retry_after or random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+            if attempt == MAX_RETRIES or flight.deadline is not None and time.monotonic() + delay > flight.deadline:
+                break
+            self._count("retries")
+            time.sleep(delay)
+        raise error
+
+    def _count(self, name: str, amount: float = 1) -> None:
+        with self.lock:
+            self.stats[name] += amount
+
+    def _payload(self, body: Dict) -> Dict:
+        return dict(body, stream=True)
+
+    def _relay(self, resp: httpx.Response, flight: _Flight) -> Optional[int]:
+        """Pass streamed deltas to the flight; returns total tokens when the provider reports usage."""
+        used = None
+        for line in resp.iter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                continue  # read on to the end so the connection goes back to the pool
+            chunk = json.loads(data)
+            for choice in chunk.get("choices") or []:
+                delta = (choice.get("delta") or {}).get("content")
+                if delta:
+                    flight.push(delta)
+            usage = chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage")
+            if usage:
+                used = usage.get("total_tokens", used)
+            if flight.expired():
+                break  # nobody can use the rest; the connection is dropped instead of reused
+        return used
+
+
+class OllamaClient(LLMClient):
+    """A local Ollama server through its native API (/api/chat), which, unlike its
+    OpenAI-compatible one, takes keep_alive: the model stays loaded between reviews
+    instead of being reloaded by every `ollama run`.
+
+    There are no rate limits to respect locally; `concurrency` should match the
+    server's OLLAMA_NUM_PARALLEL, beyond which requests only queue there.  A
+    reply nobody reads any more is cut off, which stops the generation.
+    """
+    path = "/api/chat"
+    read_timeout = 120.0    # loading a model from disk can take a minute before the first token
+
+    def __init__(self, model: str, host: str = OLLAMA_HOST, keep_alive: str = OLLAMA_KEEP_ALIVE,
+                 concurrency: int = 2):
+        if "://" not in host:
+            host = "http://" + host   # OLLAMA_HOST is often just "127.0.0.1:11434"
+        super().__init__(model, "ollama", base_url=host, rpm=1e9, tpm=1e12, concurrency=concurrency)
+        self.keep_alive = keep_alive
+
+    def models(self) -> List[str]:
+        """Names of the locally pulled models; LLMError when the server cannot be reached."""
+        try:
+            resp = self.http.get("/api/tags", timeout=5.0)
+            resp.raise_for_status()
+        except httpx.HTTPError as e:
+            raise LLMError(f"ollama is not reachable at {self.http.base_url}: {e}")
+        return [m["name"] for m in resp.json().get("models", [])]
+
+    def warm(self) -> None:
+        """Load the model in the background, so the first review does not wait for it."""
+        def load():
+            try:
+                self.http.post("/api/generate", json={"model": self.model, "keep_alive": self.keep_alive})
+            except httpx.HTTPError:
+                pass    # the first review will report it
+        self.runner.submit(load)
+
+    def _payload(self, body: Dict) -> Dict:
+        return {"model": body["model"], "messages": body["messages"], "stream": True, "keep_alive": self.keep_alive,
+                "options": {"num_predict": body["max_tokens"], "temperature": body["temperature"]}}
+
+    def _relay(self, resp: httpx.Response, flight: _Flight) -> Optional[int]:
+        """Newline-delimited JSON: {"message": {"content": ...}, "done": false}, ..., then the
+        token counts with "done": true."""
+        used = None
+        for line in resp.iter_lines():
+            if not line.strip():
+                continue
+            chunk = json.loads(line)
+            if chunk.get("error"):
+                raise LLMError(f"ollama: {chunk['error']}")
+            delta = (chunk.get("message") or {}).get("content")
+            if delta:
+                flight.push(delta)
+            if chunk.get("done"):
+                used = chunk.get("prompt_eval_count", 0) + chunk.get("eval_count", 0)
+            elif flight.abandoned():
+                break   # closing the connection makes Ollama stop generating
+        return used
+
+
+def _retry_after(headers) -> Optional[float]:
+    try:
+        return min(BACKOFF_CAP * 4, float(headers.get("retry-after", "")))
+    except ValueError:
+        return None
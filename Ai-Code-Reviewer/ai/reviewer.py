@@ -0,0 +1,146 @@
+# reviewer.py  –  the review pipeline behind ai_reviwer.py (and so app.py); it brings the prompt, model and linters
+import os
+import time
+from concurrent.futures import wait
+from typing import Callable, Collection, Dict, Optional
+
+from ai.cache import cached_review, review_key, semantic_review
+from ai.chunks import merge, review_chunks, split
+from ai.diff import MAX_FILES, git_diff, parse_diff, regions
+
+
+def offline(summary: str, error: str) -> Dict:
+    """A review with no AI part: the linter's findings are all it will carry."""
+    return {"score": 0, "summary": summary, "issues": [], "suggestions": [], "error": error}
+
+
+def done(future):
+    """A finished future's result, None when it is late or failed; late ones are cancelled."""
+    future.cancel()
+    return future.result() if future.done() and not future.cancelled() and not future.exception() else None
+
+
+def combine(code: str, language: str, lint, ai) -> Dict:
+    """One review from the linter and AI futures; a stage that is not done by now is left out."""
+    late = [name for name, f in (("lint", lint), ("ai", ai)) if not f.done() or f.exception()]
+    for f in (lint, ai):
+        f.cancel()  # only stops stages that never started; running ones hit their own timeouts
+    linter = [] if "lint" in late else lint.result()
+    if "ai" in late:
+        print(f">>> AI missed the review deadline ({language})")
+        ai = offline("AI timed out – linter only", "deadline exceeded")
+    else:
+        ai = ai.result()
+    ai["issues"] = (linter + ai["issues"])[:25]
+    ai["total_lines"] = len(code.splitlines())
+    ai["partial"] = bool(late) or bool(ai.get("partial"))  # chunked reviews may miss sections
+    if late:
+        ai["late"] = late
+    return ai
+
+
+def review_file(code: str, language: str, ask: Callable[[str, bool], Dict], executor, cache, model: str,
+                prompt_version: str, deadline: Optional[float] = None, emit: Optional[Callable] = None) -> Dict:
+    """One prompt for a small file; a large one is split at top-level definitions and the
+    sections are reviewed side by side on executor, so it takes about as long as its slowest section.
+
+    ask(code, excerpt) sends one prompt.  Unchanged (or only reformatted)
+    sections come from cache.  With emit, each section's issues are reported
+    as soon as it is back.
+    """
+    chunks = split(code, language)
+    if len(chunks) == 1:
+        return ask(code, False)
+    version = f"{prompt_version}/chunk"
+
+    def review_chunk(chunk):
+        key = review_key(chunk.digest, language, model, version)
+        return cached_review(cache, key, lambda: semantic_review(
+            cache, chunk.code, language, model, version, lambda: ask(chunk.code, True)))
+
+    def on_review(chunk, review):
+        for issue in merge([chunk], [review])["issues"]:  # section lines -> file lines
+            emit("issue", issue)
+
+    # finish a little early so the merged answer beats the review deadline
+    return review_chunks(chunks, review_chunk, executor, None if deadline is None else deadline - 0.05,
+                         on_review if emit else None)
+
+
+def review_diff(diff: Optional[str], repo: Optional[str], base: str, head: Optional[str], deadline: float, *,
+                lint: Callable, ask: Callable, pool, executor, cache, model: str, prompt_version: str,
+                languages: Optional[Collection[str]] = None) -> Dict:
+    """Review only what a change touches: a unified `diff`, or `base`..`head` of a local git
+    `repo` (head None = the working tree), by `deadline` (time.monotonic()).
+
+    lint(source, language, deadline, lines) lints a whole new file and keeps
+    the changed lines; ask(code, language, deadline) reviews one region, its
+    new lines marked, on executor.  Each region is sent with its enclosing
+    definition and cached by its code and changed lines.  Files in none of
+    `languages` (None: any language_of knows) are skipped.  Issue lines are
+    new-file lines and name their "file".
+    """
+    try:
+        patches = parse_diff(diff) if diff is not None else git_diff(repo, base, head)
+    except ValueError as e:
+        return offline(str(e), str(e))
+    skipped = [p.path for p in patches if not p.language or (languages is not None and p.language not in languages)]
+    patches = [p for p in patches if p.path not in skipped]
+    skipped += [p.path for p in patches[MAX_FILES:]]
+    parts = [(p, regions(p)) for p in patches[:MAX_FILES]]
+    skipped += [p.path for p, rs in parts if not rs]
+    parts = [(p, rs) for p, rs in parts if rs]
+
+    def ask_region(region, language):
+        key = review_key(region.digest, language, model, f"{prompt_version}/diff")
+        return cached_review(cache, key, lambda: ask(region.marked(), language, deadline))
+
+    # the linter needs the whole file: git mode always has it, a plain diff only for files it adds
+    lints = [pool.submit(lint, p.source, p.language, deadline, p.changed) if p.source is not None else None
+             for p, _rs in parts]
+    asks = [[executor.submit(ask_region, r, p.language) for r in rs] for p, rs in parts]
+    wait([f for f in lints if f] + [f for fs in asks for f in fs], timeout=max(0.0, deadline - time.monotonic()))
+
+    files, late = [], set()
+    for (p, rs), lint, fs in zip(parts, lints, asks):
+        review = merge(rs, [done(f) for f in fs])  # region lines -> new-file lines
+        linter = [] if lint is None else done(lint)
+        if linter is None:
+            linter = []
+            late.add("lint")
+        if review["chunks"]["late"]:
+            late.add("ai")
+        files.append({
+            "file": p.path, "language": p.language, "regions": [[r.start, r.end] for r in rs],
+            "lines": sum(r.end - r.start + 1 for r in rs), "score": review["score"],
+            "summary": review["summary"], "issues": [dict(i, file=p.path) for i in linter + review["issues"]][:25],
+            "suggestions": review["suggestions"], "partial": bool(review.get("partial") or "error" in review),
+        })
+    scored = [f for f in files if f["score"]]
+    weight = sum(f["lines"] for f in scored)
+    worst = sorted(scored, key=lambda f: f["score"])[:3]
+    return {
+        "score": round(sum(f["score"] * f["lines"] for f in scored) / weight) if weight else 0,
+        "summary": " ".join(f"{f['file']}: {f['summary']}" for f in worst) or "AI offline – linter only",
+        "issues": [i for f in files for i in f["issues"]][:25],
+        "suggestions": list(dict.fromkeys(s for f in files for s in f["suggestions"]))[:5],
+        "files": files,
+        "diff": {"files": len(files), "regions": sum(len(f["regions"]) for f in files),
+                 "lines": sum(f["lines"] for f in files), "skipped": skipped},
+        "total_lines": sum(f["lines"] for f in files),
+        "partial": bool(late) or any(f["partial"] for f in files),
+        **({"late": sorted(late)} if late else {}),
+    }
+
+
+def review_request(reviewer, body: Dict, repo_root: str) -> Dict:
+    """One POST /api/reviews body: {"code", "language"} for a whole file, {"diff"} for a
+    unified diff, or {"repo", "base", "head"} for two revisions of a repository below repo_root."""
+    if body.get("diff"):
+        return reviewer.review_diff(diff=body["diff"])
+    if body.get("repo"):
+        repo = os.path.realpath(body["repo"])
+        if os.path.commonpath([repo, os.path.realpath(repo_root)]) != os.path.realpath(repo_root):
+            return offline("repository is outside REVIEW_REPO_ROOT", "repository is outside REVIEW_REPO_ROOT")
+        return reviewer.review_diff(repo=repo, base=body.get("base") or "HEAD", head=body.get("head"))
+    return reviewer.review_code(body.get("code", ""), body.get("language", "python"))
@@ -0,0 +1,136 @@
+# stream.py  –  incremental parsing of the model's JSON reply, and Server-Sent Event framing
+import json
+from typing import Any, Dict, List, Tuple
+
+
+class ReviewParser:
+    """Reads a reply such as {"score": 7, "issues": [{...}, ...], ...} as it streams in.
+
+    feed() returns ("field", key, value) whenever a top-level value is complete
+    and ("item", key, value) for every complete element of a top-level array,
+    so an issue is known the moment its closing brace arrives.  Text before the
+    first '{' (prose, a ```json fence) and after the object is ignored.  If the
+    reply stops early (max_tokens, deadline) result() keeps everything that was
+    complete, including the issues listed so far.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.pos = 0
+        self.stack = []             # open '{' / '[' from the root object down
+        self.closed = False         # the root object's '}' has arrived
+        self.fields: Dict[str, Any] = {}
+        self.items: Dict[str, List] = {}
+        self._string = False
+        self._escape = False
+        self._key = None            # top-level key whose value is being read
+        self._key_start = None
+        self._value_start = 0
+        self._item_start = None     # start of the current element of a top-level array
+
+    def feed(self, delta: str) -> List[Tuple[str, str, Any]]:
+        events = []
+        self.text += delta
+        text = self.text
+        while self.pos < len(text) and not self.closed:
+            i = self.pos
+            c = text[i]
+            self.pos += 1
+            if not self.stack:
+                if c == "{":
+                    self.stack.append(c)
+                continue
+            if self._string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._string = False
+                continue
+            if c in " \t\r\n":
+                continue
+            depth = len(self.stack)
+            if depth == 1:
+                if self._key is None:           # between members: a key, ':' or the end
+                    if c == '"':
+                        self._string, self._key_start = True, i
+                    elif c == ":" and self._key_start is not None:
+                        self._key = _loads(text[self._key_start:i])
+                        self._key_start, self._value_start = None, self.pos
+                    elif c == "}":
+                        self.closed = True
+                    continue
+                if c in ",}":
+                    value = text[self._value_start:i]
+                    if isinstance(self._key, str) and value.strip():
+                        self._field(self._key, value, events)
+                    self._key = None
+                    self.closed = c == "}"
+                    continue
+            elif depth == 2 and self.stack[-1] == "[" and c in ",]":
+                if self._item_start is not None:
+                    self._item(self._key, text[self._item_start:i], events)
+                    self._item_start = None
+                if c == "]":
+                    self.stack.pop()
+                continue
+            elif depth == 2 and self.stack[-1] == "[" and self._item_start is None:
+                self._item_start = i
+            if c == '"':
+                self._string = True
+            elif c in "{[":
+                self.stack.append(c)
+            elif c in "}]" and depth > 1:
+                self.stack.pop()
+        return events
+
+    def _field(self, key: str, raw: str, events: List) -> None:
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return  # a malformed value is dropped, the rest of the reply still counts
+        self.fields[key] = value
+        events.append(("field", key, value))
+
+    def _item(self, key, raw: str, events: List) -> None:
+        if not isinstance(key, str):
+            return
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return
+        self.items.setdefault(key, []).append(value)
+        events.append(("item", key, value))
+
+    def result(self) -> Dict:
+        """Everything complete so far, always with "issues" and "suggestions" lists (empty when the
+        reply stopped before them); ValueError when the reply held no usable JSON at all."""
+        review = dict(self.fields)
+        for key, items in self.items.items():
+            review.setdefault(key, items)   # an array cut off before its ']' keeps its whole elements
+        if not review:
+            raise ValueError("no JSON object in the model reply")
+        for key in ("issues", "suggestions"):
+            if not isinstance(review.get(key), list):
+                review[key] = []            # reviews add the linter's issues to these
+        return review
+
+
+def _loads(raw: str):
+    try:
+        return json.loads(raw)
+    except ValueError:
+        return None
+
+
+def parse_reply(text: str) -> Dict:
+    """The review in a complete (or cut-off) model reply."""
+    parser = ReviewParser()
+    parser.feed(text)
+    return parser.result()
+
+
+def sse(event: str, data) -> str:
+    """One Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
@@ -0,0 +1,399 @@
+# workers.py  –  warm checker processes for the Java, JavaScript and C++ linters
+import atexit
+import os
+import queue
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+HERE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "checkers")
+SIZE = int(os.environ.get("LINT_WORKERS", "2"))  # warm processes per language; 0 = one-shot processes only
+MAX_RESTARTS = 5        # worker starts allowed per RESTART_WINDOW before the pool trips
+RESTART_WINDOW = 60.0
+COOLDOWN = 300.0        # seconds a tripped pool uses one-shot processes before trying workers again
+PING_AFTER = 30.0       # a worker idle this long is pinged before it gets a request
+BATCH_WINDOW = 0.02     # seconds a C++ check waits for others to share its g++ run
+BATCH_MAX = 8
+
+
+class WorkerError(RuntimeError):
+    """A checker process died, hung or did not answer in time; it has been killed."""
+
+
+class Worker:
+    """One long-lived checker process (see checkers/) speaking a framed protocol.
+
+    It prints "READY" once started.  A request is "<n>\\n" followed by n bytes
+    of UTF-8 source; the answer is one "<line>\\t<severity>\\t<message>" line
+    per finding and then "END".  An empty request is a ping.
+    """
+
+    def __init__(self, argv: List[str], name: str, on_ready: Callable[[], None]):
+        self.name = name
+        self.proc = subprocess.Popen(argv, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                     stderr=subprocess.DEVNULL, bufsize=0)
+        self.lines = queue.Queue()
+        self.ready = threading.Event()
+        self.used = time.monotonic()
+        self._on_ready = on_ready
+        threading.Thread(target=self._read, name=f"{name}-reader", daemon=True).start()
+
+    def _read(self):
+        for raw in self.proc.stdout:
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            if line == "READY" and not self.ready.is_set():
+                self.ready.set()
+                self._on_ready()
+            else:
+                self.lines.put(line)
+        self.lines.put(None)  # end of output: the process is gone
+        self._on_ready()      # wake waiters so they notice
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def request(self, code: str, timeout: float) -> List[Dict]:
+        end = time.monotonic() + timeout
+        data = code.encode("utf-8")
+        try:
+            self.proc.stdin.write(b"%d\n" % len(data) + data)
+            self.proc.stdin.flush()
+        except OSError as e:
+            self.kill()
+            raise WorkerError(f"{self.name}: write failed: {e}")
+        issues = []
+        while True:
+            try:
+                line = self.lines.get(timeout=max(0.0, end - time.monotonic()))
+            except queue.Empty:
+                self.kill()  # mid-request, so its state is unknown
+                raise WorkerError(f"{self.name}: no answer within {timeout:.2f}s")
+            if line is None:
+                self.kill()
+                raise WorkerError(f"{self.name}: checker exited")
+            if line == "END":
+                break
+            parts = line.split("\t", 2)
+            if len(parts) == 3 and parts[0].isdigit():
+                issues.append({"line": int(parts[0]), "severity": parts[1], "message": parts[2]})
+        self.used = time.monotonic()
+        return issues
+
+    def ping(self, timeout: float = 2.0) -> bool:
+        try:
+            self.request("", timeout)
+            return True
+        except WorkerError:
+            return False
+
+    def kill(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+        try:
+            self.proc.wait(1)
+        except subprocess.TimeoutExpired:
+            pass
+
+
+class WorkerPool:
+    """Up to `size` warm workers for one language, with health checks and a restart limit.
+
+    check() hands the source to an idle ready worker, waiting for one if all
+    are busy or still starting.  Dead workers are replaced, but more than
+    MAX_RESTARTS starts within RESTART_WINDOW trip the pool: for COOLDOWN
+    seconds every check runs `cold` (the old one-process-per-request path)
+    instead.  Workers start on the first check (or start()), and checks that
+    arrive before any of them is ready run `cold` too.  argv() is called with
+    cond held, so it must not block: it returns the command line, [] while
+    the checker is still being prepared (checks run `cold` meanwhile), or
+    None without the tool, when the pool stays empty and check() returns no
+    issues, as the one-shot linters always did.
+    """
+
+    def __init__(self, name: str, argv: Callable[[], Optional[List[str]]],
+                 cold: Callable[[str, float], List[Dict]], size: int = SIZE):
+        self.name = name
+        self.argv = argv
+        self.cold = cold
+        self.size = size
+        self.workers: List[Worker] = []
+        self.idle: List[Worker] = []
+        self.cond = threading.Condition()
+        self.starts = deque()
+        self.tripped_until = 0.0
+        self.counts = {"warm": 0, "cold": 0, "starts": 0, "failures": 0}
+
+    def _notify(self):
+        with self.cond:
+            self.cond.notify_all()
+
+    def _fill(self) -> None:
+        """Replace dead workers up to size; call with cond held."""
+        self.workers = [w for w in self.workers if w.alive()]
+        self.idle = [w for w in self.idle if w.alive()]
+        now = time.monotonic()
+        while len(self.workers) < self.size and now >= self.tripped_until:
+            while self.starts and now - self.starts[0] > RESTART_WINDOW:
+                self.starts.popleft()
+            if len(self.starts) >= MAX_RESTARTS:
+                self.tripped_until = now + COOLDOWN
+                print(f">>> {self.name} workers keep dying; one-shot checks for {COOLDOWN:.0f}s")
+                return
+            argv = self.argv()
+            if not argv:
+                return  # tool not installed (None), or still being prepared ([])
+            self.starts.append(now)
+            self.counts["starts"] += 1
+            try:
+                w = Worker(argv, self.name, self._notify)
+            except OSError as e:
+                print(f">>> {self.name} worker failed to start:", e)
+                return
+            self.workers.append(w)
+            self.idle.append(w)
+
+    def start(self) -> "WorkerPool":
+        with self.cond:
+            self._fill()
+        return self
+
+    def _acquire(self, end: float) -> Optional[Worker]:
+        with self.cond:
+            while True:
+                self._fill()
+                if not self.workers or not any(w.ready.is_set() for w in self.workers):
+                    return None  # none yet, or all still starting: a one-shot check beats waiting
+                for w in self.idle:
+                    if w.ready.is_set():
+                        self.idle.remove(w)
+                        return w
+                left = end - time.monotonic()
+                if left <= 0:
+                    raise WorkerError(f"{self.name}: no free worker in time")
+                self.cond.wait(left)
+
+    def _release(self, w: Worker):
+        with self.cond:
+            if w.alive():
+                self.idle.append(w)
+            self.cond.notify_all()
+
+    def check(self, code: str, timeout: float) -> List[Dict]:
+        end = time.monotonic() + timeout
+        try:
+            w = self._acquire(end)
+            while w is not None and time.monotonic() - w.used > PING_AFTER and not w.ping():
+                self.counts["failures"] += 1  # health check failed; ping() killed it
+                self._release(w)
+                w = self._acquire(end)
+        except WorkerError as e:
+            print(">>>", e)
+            return []
+        if w is None:  # no ready workers: starting or being built, pool tripped, LINT_WORKERS=0, or no tool
+            if self.argv() is None:
+                return []
+            self.counts["cold"] += 1
+            return self.cold(code, max(0.05, end - time.monotonic()))
+        try:
+            issues = w.request(code, max(0.05, end - time.monotonic()))
+            self.counts["warm"] += 1
+            return issues
+        except WorkerError as e:
+            self.counts["failures"] += 1
+            print(">>>", e)
+            return []
+        finally:
+            self._release(w)
+
+    def stats(self) -> Dict:
+        with self.cond:
+            return dict(self.counts, alive=sum(w.alive() for w in self.workers),
+                        idle=len(self.idle), tripped=time.monotonic() < self.tripped_until)
+
+    def close(self):
+        with self.cond:
+            for w in self.workers:
+                w.kill()
+            self.workers, self.idle = [], []
+
+
+# ---------- C++: one g++ run for sources that arrive together ----------
+class _Batch:
+    def __init__(self):
+        self.sources: List[str] = []
+        self.results: List[List[Dict]] = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+
+
+_GCC_LINE = re.compile(r"s(\d+)\.cpp:(\d+):(?:\d+:)? (fatal error|error|warning): (.+)")
+
+
+class GccBatcher:
+    """g++ -fsyntax-only over every C++ source that arrives within BATCH_WINDOW.
+
+    The first caller waits the window (or until BATCH_MAX join), runs one g++
+    over all of them and hands each caller its own diagnostics.  At most
+    `parallel` runs go at once, so a burst queues instead of starving the CPU.
+    """
+
+    def __init__(self, window: float = BATCH_WINDOW, most: int = BATCH_MAX, parallel: int = max(1, SIZE)):
+        self.window = window
+        self.most = most
+        self.lock = threading.Lock()
+        self.open: Optional[_Batch] = None
+        self.slots = threading.Semaphore(parallel)
+        self.counts = {"runs": 0, "sources": 0}
+
+    def check(self, code: str, timeout: float) -> List[Dict]:
+        if shutil.which("g++") is None:
+            return []
+        end = time.monotonic() + timeout
+        with self.lock:
+            batch = self.open
+            leader = batch is None or len(batch.sources) >= self.most
+            if leader:
+                batch = self.open = _Batch()
+            index = len(batch.sources)
+            batch.sources.append(code)
+            if len(batch.sources) >= self.most:
+                batch.full.set()
+        if leader:
+            batch.full.wait(min(self.window, timeout / 4))
+            with self.lock:
+                if self.open is batch:
+                    self.open = None
+            self._run(batch, end)
+        else:
+            batch.done.wait(max(0.0, end - time.monotonic()))
+        return batch.results[index] if batch.done.is_set() and index < len(batch.results) else []
+
+    def _run(self, batch: _Batch, end: float):
+        results = [[] for _ in batch.sources]
+        try:
+            if not self.slots.acquire(timeout=max(0.0, end - time.monotonic())):
+                return
+            try:
+                with tempfile.TemporaryDirectory(prefix="lint-cpp-") as tmp:
+                    names = []
+                    for i, code in enumerate(batch.sources):
+                        names.append(f"s{i}.cpp")
+                        with open(os.path.join(tmp, names[-1]), "w", encoding="utf-8") as f:
+                            f.write(code)
+                    out = subprocess.run(["g++", "-fsyntax-only", "-x", "c++", *names],
+                                         cwd=tmp, text=True, capture_output=True, env=dict(os.environ, LC_ALL="C"),
+                                         timeout=max(0.05, end - time.monotonic()))
+                self.counts["runs"] += 1
+                self.counts["sources"] += len(names)
+                for hit in out.stderr.splitlines():
+                    m = _GCC_LINE.match(hit)
+                    if m and int(m.group(1)) < len(results):
+                        results[int(m.group(1))].append({
+                            "line": int(m.group(2)), "severity": "medium" if m.group(3) == "warning" else "high",
+                            "message": m.group(4)})
+            finally:
+                self.slots.release()
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            pass  # g++ vanished or too slow → no findings, as before
+        finally:
+            batch.results = results
+            batch.done.set()
+
+    def stats(self) -> Dict:
+        return dict(self.counts)
+
+    def close(self):
+        pass
+
+
+# ---------- one-shot fallbacks and worker command lines ----------
+_java = {}                   # "classes": JavaCheck's directory, "" while it compiles, None if it cannot be built
+_java_lock = threading.Lock()
+
+
+def _build_java(source: str) -> None:
+    classes = tempfile.mkdtemp(prefix="lint-javacheck-")
+    atexit.register(shutil.rmtree, classes, True)
+    try:
+        subprocess.run(["javac", "-proc:none", "-d", classes, source], capture_output=True, timeout=60)
+    except (OSError, subprocess.TimeoutExpired):
+        pass
+    with _java_lock:
+        _java["classes"] = classes if os.path.exists(os.path.join(classes, "JavaCheck.class")) else None
+
+
+def _java_argv() -> Optional[List[str]]:
+    """java -cp <JavaCheck compiled once per process>, [] while javac builds it, or None without a JDK.
+
+    The build runs on its own thread, so the pool never waits for it under its
+    lock and the first checks use one-shot javac instead.  JavaCheck hosts
+    javac through javax.tools, so a JRE alone (java without javac) would
+    start workers that die before READY and trip the pool.
+    """
+    with _java_lock:
+        if "classes" not in _java:
+            _java["classes"] = None
+            source = os.path.join(HERE, "JavaCheck.java")
+            if shutil.which("java") and shutil.which("javac") and os.path.exists(source):
+                _java["classes"] = ""
+                threading.Thread(target=_build_java, args=(source,), name="javacheck-build", daemon=True).start()
+        classes = _java["classes"]
+    if classes is None:
+        return None
+    return ["java", "-cp", classes, "JavaCheck"] if classes else []
+
+
+def _node_argv() -> Optional[List[str]]:
+    return ["node", os.path.join(HERE, "js_check.js")] if shutil.which("node") else None
+
+
+def _java_cold(code: str, timeout: float) -> List[Dict]:
+    m = re.search(r"public\s+(?:(?:abstract|final|static)\s+)*(?:class|interface|enum|record)\s+(\w+)", code)
+    issues = []
+    try:
+        with tempfile.TemporaryDirectory(prefix="lint-java-") as tmp:
+            path = os.path.join(tmp, f"{m.group(1) if m else 'Main'}.java")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(code)
+            out = subprocess.run(["javac", "-Xlint", "-proc:none", "-d", tmp, path], text=True,
+                                 capture_output=True, timeout=timeout)
+        for hit in out.stderr.splitlines():
+            m = re.match(r".*?\.java:(\d+): (error|warning): (.+)", hit)
+            if m:
+                issues.append({"line": int(m.group(1)), "severity": "high" if m.group(2) == "error" else "medium",
+                               "message": m.group(3)})
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        pass  # javac not installed or too slow → skip silently
+    return issues
+
+
+def _node_cold(code: str, timeout: float) -> List[Dict]:
+    try:
+        out = subprocess.run(["node", "--check"], input=code, text=True, capture_output=True, timeout=timeout)
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return []  # node not installed or too slow → skip silently
+    at = re.search(r"\[stdin\]:(\d+)", out.stderr)
+    error = re.search(r"^(\w*Error: .+)$", out.stderr, re.M)
+    if out.returncode and error:
+        return [{"line": int(at.group(1)) if at else 1, "severity": "high", "message": error.group(1)}]
+    return []
+
+
+def checkers(size: int = SIZE, warm: bool = False) -> Dict:
+    """language -> object with check(code, timeout) -> issues; workers start on first use, or now when warm."""
+    pools = {
+        "java": WorkerPool("javac", _java_argv, _java_cold, size),
+        "javascript": WorkerPool("node", _node_argv, _node_cold, size),
+    }
+    if warm:
+        for pool in pools.values():
+            pool.start()
+    pools["cpp"] = GccBatcher(parallel=max(1, size))
+    for pool in pools.values():
+        atexit.register(pool.close)
+    return pools
@@ -1,83 +1,78 @@
 # ai_reviewer.py  –  multi-language, Groq cloud, zero crashes
-import json, re, subprocess, sys, ast
-from typing import Dict, List
-from groq import Groq
+import os, queue, time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Collection, Dict, Iterator, List, Optional, Tuple
+
+from ai.cache import ReviewCache, cache_lookup, cache_store, cached_review, review_key, semantic_review
+from ai.llm import LLMClient
+from ai.reviewer import combine, offline, review_diff, review_file, review_request
+from ai.rules import VERSION as RULES_VERSION, lint_python
+from ai.stream import ReviewParser
+from ai.workers import checkers
 
 # -------------------- config --------------------
-CLIENT = Groq(api_key="gsk_YOUR_REAL_KEY_HERE")   # <-- your key
 MODEL  = "llama-3.1-8b-instant"                   # Groq fastest
+LLM    = LLMClient(MODEL, "groq", api_key="gsk_YOUR_REAL_KEY_HERE")  # <-- your key; LLM_RPM / LLM_TPM / LLM_CONCURRENCY
+PROMPT_VERSION = "multi-lang/1"                   # bump when the prompt changes; part of the cache key
+CACHE  = ReviewCache()                            # data/review_cache.sqlite3, REVIEW_CACHE=off to disable
+DEADLINE = 6.0                                    # seconds for a whole review; late stages are dropped
+POOL   = ThreadPoolExecutor(max_workers=8, thread_name_prefix="review")  # linter and LLM run side by side
+CHECKERS = checkers()                             # warm linter processes, started on first use; LINT_WORKERS=0 for one-shot ones
+CHUNKS = ThreadPoolExecutor(max_workers=8, thread_name_prefix="chunk")  # sections of large files, reviewed at once
+REPO_ROOT = os.environ.get("REVIEW_REPO_ROOT", os.path.expanduser("~"))  # /api/reviews reads git repos only below this
 # ----------------------------------------------
 
+
+def _budget(deadline: Optional[float], cap: float) -> float:
+    """Seconds a stage may still take: its own cap, cut short by the review deadline."""
+    if deadline is None:
+        return cap
+    return max(0.05, min(cap, deadline - time.monotonic()))
+
 # ---------- 1. language-aware linters ----------
-def _lint(code: str, language: str) -> List[Dict]:
-    """Return static issues for Python / Java / JS / C++; empty list if none."""
+def _lint(code: str, language: str, deadline: Optional[float] = None,
+          lines: Optional[Collection[int]] = None) -> List[Dict]:
+    """Return static issues for Python / Java / JS / C++; empty list if none.
+
+    Tools are killed when `deadline` (time.monotonic()) passes.  With `lines`,
+    only findings on those lines are kept (diff mode lints the whole new file).
+    """
     issues = []
 
     # ----- Python -----
     if language == "python":
-        try:
-            ast.parse(code)
-        except SyntaxError as e:
-            return [{"line": e.lineno or 1, "severity": "high", "message": f"Syntax: {e.msg}"}]
-        try:
-            out = subprocess.run([sys.executable, "-m", "pyflakes"], input=code, text=True,
-                                 capture_output=True, timeout=2)
-            for hit in out.stdout.splitlines():
-                m = re.match(r".*:(\d+):(?:\d+:)? (.+)", hit)
-                if m:
-                    issues.append({"line": int(m.group(1)), "severity": "high", "message": m.group(2)})
-        except Exception:
-            pass
-        # typo heuristics
-        for i, ln in enumerate(code.splitlines(), 1):
-            if re.search(r"salculate|calccdx|qd1|\bretun\b|\bels\b", ln, re.I):
-                issues.append({"line": i, "severity": "medium", "message": "Probable typo"})
-
-    # ----- Java -----
-    elif language == "java":
-        try:
-            out = subprocess.run(["javac", "-Xlint", "-"], input=code, text=True,
-                                 capture_output=True, timeout=3)
-            for hit in out.stderr.splitlines():
-                m = re.match(r".*?(\d+):(?:\d+:)?\s*(.+)", hit)
-                if m:
-                    issues.append({"line": int(m.group(1)), "severity": "high", "message": m.group(2)})
-        except FileNotFoundError:
-            pass  # javac not installed → skip silently
-
-    # ----- JavaScript -----
-    elif language == "javascript":
-        try:
-            out = subprocess.run(["node", "--check"], input=code, text=True,
-                                 capture_output=True, timeout=2)
-            if out.stderr:
-                for hit in out.stderr.splitlines():
-                    m = re.match(r".*?(\d+):(?:\d+:)?\s*(.+)", hit)
-                    if m:
-                        issues.append({"line": int(m.group(1)), "severity": "high", "message": m.group(2)})
-        except FileNotFoundError:
-            pass  # node not installed → skip silently
-
-    # ----- C++ -----
-    elif language == "cpp":
-        try:
-            out = subprocess.run(["g++", "-fsyntax-only", "-x", "c++", "-"], input=code, text=True,
-                                 capture_output=True, timeout=3)
-            for hit in out.stderr.splitlines():
-                m = re.match(r".*?(\d+):(?:\d+:)?\s*(.+)", hit)
-                if m:
-                    issues.append({"line": int(m.group(1)), "severity": "high", "message": m.group(2)})
-        except FileNotFoundError:
-            pass  # g++ not installed → skip silently
+        issues = lint_python(code)  # in-process: pyflakes checks, security patterns, typo scan
 
+    # ----- Java / JavaScript / C++ -----
+    # warm javac and node workers, batched g++ (ai/workers.py); missing tools give no issues
+    elif language in CHECKERS:
+        issues = CHECKERS[language].check(code, _budget(deadline, 3))
+
+    if lines is not None:
+        issues = [i for i in issues if i.get("line") in lines]
     return issues[:20]
 
 
 # --------- 2. language-specific cloud prompt ---------
-def _ai_quick(code: str, language: str) -> Dict:
-    prompt = (
+def _emit_parsed(emit: Callable, kind: str, key: str, value) -> None:
+    """Pass ReviewParser events on as review_stream events."""
+    if kind == "item" and key == "issues" and isinstance(value, dict):
+        emit("issue", value)
+    elif kind == "item" and key == "suggestions":
+        emit("suggestion", value)
+    elif kind == "field" and key in ("score", "summary"):
+        emit(key, value)
+
+
+def _prompt(code: str, language: str, excerpt: bool = False, changed: bool = False) -> str:
+    return (
         f"You are a senior {language} code reviewer.\n"
-        "Output ONLY valid JSON, no extra text.\n"
+        + ("This is one top-level section of a larger file; names defined elsewhere in it are fine.\n"
+           if excerpt else "")
+        + ("This is part of a file in a code change. Lines starting with '+' were added or edited, the rest\n"
+           "is context: review the '+' lines. Line numbers count every line shown, starting at 1.\n"
+           if changed else "")
+        + "Output ONLY valid JSON, no extra text.\n"
         "{\n"
         '  "score": <1-10>,\n'
         '  "summary": "<brief>",\n'
@@ -86,30 +81,110 @@ def _ai_quick(code: str, language: str) -> Dict:
         "}\n\n"
         f"Code:\n{code}"
     )
+
+
+def _ai_quick(code: str, language: str, deadline: Optional[float] = None, excerpt: bool = False,
+              changed: bool = False, emit: Optional[Callable] = None) -> Dict:
+    prompt = _prompt(code, language, excerpt, changed)
+    parser = ReviewParser()  # tolerates fences and prose around the JSON, keeps what a cut-off reply completed
     try:
-        reply = CLIENT.chat.completions.create(
-            model=MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.0,
-            max_tokens=350,
-            timeout=5,
-        )
-        raw = reply.choices[0].message.content.strip()
-        raw = raw.removeprefix("```json").removeprefix("```").removesuffix("```").strip()
-        if not raw.endswith("}"):
-            raw += "}"
-        return json.loads(raw)
+        # rate-limited, retried, and shared with identical requests in flight (ai/llm.py)
+        reply = LLM.stream(prompt, max_tokens=350, temperature=0.0, deadline=deadline)
+        try:
+            for delta in reply:
+                for event in parser.feed(delta):
+                    if emit is not None:  # an issue is emitted once its '}' is in
+                        _emit_parsed(emit, *event)
+                if parser.closed:
+                    break
+        finally:
+            reply.close()
+        review = parser.result()
+        if not parser.closed:
+            review["partial"] = True  # cut off by max_tokens or the deadline; shown, never cached
+        return review
     except Exception as e:
-        print(f">>> Groq error ({language}):", e)
-        return {"score": 0, "summary": "AI offline – linter only", "issues": [], "suggestions": []}
+        print(f">>> {LLM.provider} error ({language}):", e)
+        return offline("AI offline – linter only", str(e))
+
+
+def _ai_review(code: str, language: str, deadline: Optional[float] = None,
+               emit: Optional[Callable] = None) -> Dict:
+    """A file's AI review, large ones in sections side by side (ai/reviewer.py).  With emit,
+    issues are reported as the model writes them (or as each section is back)."""
+    return review_file(code, language, lambda text, excerpt: _ai_quick(
+        text, language, deadline, excerpt, emit=None if excerpt else emit), CHUNKS,
+        CACHE, MODEL, PROMPT_VERSION, deadline, emit)
+
+
+def _ai_part(code: str, language: str, deadline: Optional[float] = None,
+             emit: Optional[Callable] = None) -> Dict:
+    """The AI half of a review; formatting-only edits reuse an earlier answer (replayed to emit)."""
+    review = semantic_review(CACHE, code, language, MODEL, PROMPT_VERSION,
+                             lambda: _ai_review(code, language, deadline, emit))
+    if emit is not None and review.get("cache", {}).get("status") == "semantic":
+        for key in ("score", "summary"):
+            emit(key, review.get(key))
+        for issue in review.get("issues", []):
+            emit("issue", issue)
+        for suggestion in review.get("suggestions", []):
+            emit("suggestion", suggestion)
+    return review
 
 
 # ---------- 3. merge ----------
 class AIReviewer:
-    def review_code(self, code: str, language: str = "python") -> Dict:
-        linter = _lint(code, language)
-        ai    = _ai_quick(code, language)
-        combined = (linter + ai["issues"])[:25]
-        ai["issues"] = combined
-        ai["total_lines"] = len(code.splitlines())
-        return ai
+    def review_code(self, code: str, language: str = "python", deadline: float = DEADLINE) -> Dict:
+        """Identical code is answered from CACHE, reformatted code reuses its AI part; see "cache"."""
+        key = review_key(code, language, MODEL, f"{PROMPT_VERSION}+{RULES_VERSION}")  # linter findings are cached too
+        return cached_review(CACHE, key, lambda: self._review(code, language, deadline))
+
+    def _review(self, code: str, language: str, deadline: float) -> Dict:
+        # linter and LLM run concurrently; whatever is not back by the deadline is left out
+        end = time.monotonic() + deadline
+        lint = POOL.submit(_lint, code, language, end)
+        # formatting-only edits reuse the AI part; the linter always sees the new source
+        ai = POOL.submit(_ai_part, code, language, end)
+        wait((lint, ai), timeout=max(0.0, end - time.monotonic()))
+        return combine(code, language, lint, ai)
+
+    def review_stream(self, code: str, language: str = "python",
+                      deadline: float = DEADLINE) -> Iterator[Tuple[str, object]]:
+        """review_code as it happens: ("lint", issues) as soon as the linter is back, ("issue", issue)
+        the moment the model has finished writing it, ("score", n), ("summary", text) and
+        ("suggestion", text) likewise, then ("done", review) with what review_code returns."""
+        key = review_key(code, language, MODEL, f"{PROMPT_VERSION}+{RULES_VERSION}")
+        review = cache_lookup(CACHE, key)
+        if review is None:
+            end = time.monotonic() + deadline
+            events = queue.SimpleQueue()
+            lint = POOL.submit(_lint, code, language, end)
+            lint.add_done_callback(lambda f: events.put(("lint", None)))
+            ai = POOL.submit(_ai_part, code, language, end, lambda kind, data: events.put((kind, data)))
+            ai.add_done_callback(lambda f: events.put(("ai", None)))
+            waiting = 2
+            while waiting:
+                try:
+                    kind, data = events.get(timeout=max(0.0, end - time.monotonic()))
+                except queue.Empty:
+                    break  # deadline: combine drops the late stage
+                if kind in ("lint", "ai"):
+                    waiting -= 1
+                    if kind == "lint" and not lint.exception():
+                        yield "lint", lint.result()
+                else:
+                    yield kind, data
+            review = cache_store(CACHE, key, combine(code, language, lint, ai))
+        yield "done", review
+
+    def review_diff(self, diff: Optional[str] = None, repo: Optional[str] = None, base: str = "HEAD",
+                    head: Optional[str] = None, deadline: float = DEADLINE) -> Dict:
+        """Review only what a change touches (ai.reviewer.review_diff): a unified `diff`, or
+        `base`..`head` of a local git `repo` (head None = the working tree)."""
+        return review_diff(diff, repo, base, head, time.monotonic() + deadline, lint=_lint,
+                           ask=lambda text, language, end: _ai_quick(text, language, end, excerpt=True, changed=True),
+                           pool=POOL, executor=CHUNKS, cache=CACHE, model=MODEL, prompt_version=PROMPT_VERSION)
+
+    def review_request(self, body: Dict) -> Dict:
+        """One POST /api/reviews body, see ai.reviewer.review_request; repositories must be below REPO_ROOT."""
+        return review_request(self, body, REPO_ROOT)
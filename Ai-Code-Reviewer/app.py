@@ -1,68 +1,82 @@
-# ai_reviewer.py  –  GROQ version
-import json, re, subprocess, sys, ast
-from typing import Dict, List
-from groq import Groq
+# app.py  –  the Flask server: pages, JSON placeholders and the review endpoints (python app.py [--port 5001])
+import argparse, json, os
+from typing import List, Optional
 
-CLIENT = Groq(api_key="gsk_YOUR_REAL_KEY_HERE")  # <-- paste key here
-MODEL  = "llama-3.1-8b-instant"                # 32 k ctx, sub-second
+from flask import Flask, jsonify, render_template
 
-# --------- 1. ultra-fast linter ---------
-def _lint(code: str) -> List[Dict]:
-    issues = []
-    try:
-        ast.parse(code)
-    except SyntaxError as e:
-        return [{"line": e.lineno or 1, "severity": "high", "message": f"Syntax: {e.msg}"}]
-    try:
-        out = subprocess.run([sys.executable, "-m", "pyflakes"], input=code, text=True,
-                             capture_output=True, timeout=2)
-        for hit in out.stdout.splitlines():
-            m = re.match(r".*:(\d+):(?:\d+:)? (.+)", hit)
-            if m:
-                issues.append({"line": int(m.group(1)), "severity": "high", "message": m.group(2)})
-    except Exception:
-        pass
-    # typo scan
-    for i, ln in enumerate(code.splitlines(), 1):
-        if re.search(r"salculate|calccdx|qd1|\bretun\b|\bels\b", ln, re.I):
-            issues.append({"line": i, "severity": "medium", "message": "Probable typo"})
-    return issues[:20]
-
-# ---------- 2. GROQ API (sub-second) ----------
-def _ai_quick(code: str) -> Dict:
-    prompt = (
-        "You are a senior Python reviewer. Output ONLY valid JSON, no extra text.\n"
-        "{\n"
-        '  "score": <1-10>,\n'
-        '  "summary": "<brief>",\n'
-        '  "issues": [{"line": <int>, "severity": "high|medium|low", "message": "<text>"}],\n'
-        '  "suggestions": ["<text>", "<text>", "<text>"]\n'
-        "}\n\n"
-        f"Code:\n{code}"
-    )
+from ai_reviwer import AIReviewer  # the one review pipeline; review_api.REVIEWER is one of these
+from review_api import reviews_api
+
+DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")  # JSON storage (no DB)
+
+app = Flask(__name__)
+app.register_blueprint(reviews_api)  # POST /api/reviews and /api/reviews/stream
+
+__all__ = ["AIReviewer", "app"]
+
+
+def _stored(name: str) -> List:
+    """data/<name>.json, or an empty list while there is none."""
     try:
-        reply = CLIENT.chat.completions.create(
-            model=MODEL,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.0,
-            max_tokens=300,
-            timeout=5,
-        )
-        raw = reply.choices[0].message.content.strip()
-        raw = raw.removeprefix("```json").removeprefix("```").removesuffix("```").strip()
-        if not raw.endswith("}"):
-            raw += "}"
-        return json.loads(raw)
-    except Exception as e:
-        print(">>> Groq error:", e)
-        return {"score": 0, "summary": "AI offline – linter only", "issues": [], "suggestions": []}
-
-# ---------- 3. merge ----------
-class AIReviewer:
-    def review_code(self, code: str, language: str = "python") -> Dict:
-        linter = _lint(code)
-        ai = _ai_quick(code)
-        combined = (linter + ai["issues"])[:25]
-        ai["issues"] = combined
-        ai["total_lines"] = len(code.splitlines())
-        return ai
+        with open(os.path.join(DATA, f"{name}.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+# ---------- pages ----------
+@app.get("/")
+@app.get("/dashboard")
+def dashboard():
+    return render_template("dashboard.html")
+
+
+@app.get("/code_review")
+def code_review():
+    return render_template("code_review.html")
+
+
+@app.get("/style_guides")
+def style_guides():
+    return render_template("style_guides.html")
+
+
+@app.get("/training_data")
+def training_data():
+    return render_template("training_data.html")
+
+
+@app.get("/settings")
+def settings():
+    return render_template("settings.html")
+
+
+# ---------- JSON the pages load ----------
+@app.get("/api/reviews")
+def reviews():
+    """Past reviews for the dashboard (data/reviews.json); reviewing is POST, see review_api.py."""
+    return jsonify(_stored("reviews"))
+
+
+@app.get("/api/style_guides")
+def style_guides_data():
+    return jsonify(_stored("style_guides"))
+
+
+@app.get("/api/training_data")
+def training_data_data():
+    return jsonify(_stored("training_data"))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    ap = argparse.ArgumentParser(description="Serve the AI code review web app.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=5000)
+    ap.add_argument("--debug", action="store_true", help="Flask debug mode (reloader, tracebacks in the browser)")
+    args = ap.parse_args(argv)
+    # threaded: a streamed review holds its connection open while others come in
+    app.run(host=args.host, port=args.port, debug=args.debug, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+# batch_review.py  –  review a whole repository into JSONL (nightly runs; a restart resumes)
+#
+#   python batch_review.py path/to/repo -o reviews.jsonl [--llm 8] [--processes 4]
+#
+# One JSON object per file, written as soon as that file is done.  Files that
+# already have an error-free line in the output are skipped on the next run;
+# a file's last line wins, and a resumed run first compacts the file to those.
+import argparse, json, multiprocessing, os, subprocess, sys, time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Dict, List, NamedTuple, Optional, Set
+
+from ai.diff import language_of
+from ai.rules import lint_python
+
+SKIP_DIRS = {".git", ".hg", ".svn", "node_modules", "venv", ".venv", "env", "__pycache__",
+             "build", "dist", "target", "out", ".tox", ".mypy_cache", ".idea", ".vscode"}
+MAX_BYTES = 256 * 1024      # larger files are usually generated or vendored
+FILE_DEADLINE = 180.0       # seconds per file; batch runs wait for the LLM instead of dropping it
+GIT_COMMITS = 5000          # history read for change recency
+
+
+class Source(NamedTuple):
+    path: str       # relative to the root, "/" separated
+    language: str
+    size: int
+    changed: float  # last commit touching it (mtime outside git)
+
+
+# ---------- what to review, in which order ----------
+def walk(root: str, max_bytes: int = MAX_BYTES) -> List[Source]:
+    """Every reviewable file under root; hidden, vendored and build directories are skipped."""
+    found = []
+    for folder, dirs, names in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in SKIP_DIRS and not d.startswith("."))
+        for name in sorted(names):
+            language = language_of(name)
+            if language is None:
+                continue
+            full = os.path.join(folder, name)
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            if 0 < st.st_size <= max_bytes:
+                found.append(Source(os.path.relpath(full, root).replace(os.sep, "/"), language, st.st_size, st.st_mtime))
+    return found
+
+
+def _commit_times(root: str) -> Dict[str, float]:
+    """path -> time of the newest commit that touched it; empty outside a git work tree."""
+    try:
+        out = subprocess.run(
+            ["git", "-C", root, "log", f"-n{GIT_COMMITS}", "--format=%x00%ct", "--name-only", "--relative", "--no-renames"],
+            capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return {}
+    times = {}
+    for commit in out.stdout.split("\0")[1:] if out.returncode == 0 else []:
+        stamp, *paths = commit.strip().splitlines() or ["0"]
+        for path in filter(None, paths):
+            times.setdefault(path, float(stamp))
+    return times
+
+
+def prioritize(files: List[Source], root: str) -> List[Source]:
+    """Most recently changed day first, smallest first within a day: fresh code gets reviewed
+    before a long run is cut short, and small files keep the LLM pipeline full."""
+    times = _commit_times(root)
+    files = [f._replace(changed=times.get(f.path, f.changed)) for f in files]
+    return sorted(files, key=lambda f: (-int(f.changed // 86400), f.size, f.path))
+
+
+def _finished(out_path: str) -> Set[str]:
+    """Paths whose line in an earlier output is error-free.
+
+    The last line per path wins: a retried file's new line replaces its old
+    one.  The file is rewritten with just those lines (a torn last line is
+    dropped), so retries do not pile up across resumed runs.
+    """
+    latest = {}
+    try:
+        with open(out_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                latest.pop(record["path"], None)  # kept in the order the last lines were written
+                latest[record["path"]] = record
+    except FileNotFoundError:
+        return set()
+    with open(out_path + ".tmp", "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(record, ensure_ascii=False) + "\n" for record in latest.values())
+    os.replace(out_path + ".tmp", out_path)
+    return {path for path, record in latest.items() if "error" not in record and not record.get("partial")}
+
+
+def _read(path: str) -> Optional[str]:
+    with open(path, "rb") as f:
+        data = f.read()
+    if b"\0" in data[:8192]:
+        return None  # binary despite its extension
+    return data.decode("utf-8", "replace")
+
+
+# ---------- lint: worker processes ----------
+_CHECKERS = None
+
+
+def _lint_file(path: str, language: str) -> Dict:
+    """Runs in a pool process: the file's linter findings and how long they took."""
+    global _CHECKERS
+    start = time.perf_counter()
+    code = _read(path)
+    if code is None:
+        return {"issues": [], "ms": 0.0, "binary": True}
+    if language == "python":
+        issues = lint_python(code)
+    else:
+        if _CHECKERS is None:
+            from ai.workers import checkers
+            _CHECKERS = checkers(size=1)  # at most one warm javac / node per process, once one is needed
+        issues = _CHECKERS[language].check(code, 30)
+    return {"issues": issues, "ms": round((time.perf_counter() - start) * 1000, 1)}
+
+
+# ---------- AI: threads, capped by reviewer.LLM ----------
+def _ai_file(reviewer, path: str, language: str) -> Dict:
+    start = time.perf_counter()
+    code = _read(path)
+    if code is None:
+        return {"issues": [], "suggestions": [], "ms": 0.0}
+    end = time.monotonic() + FILE_DEADLINE
+    # the same cache entries as the AI half of AIReviewer.review_code, so either run warms the other
+    review = reviewer.semantic_review(reviewer.CACHE, code, language, reviewer.MODEL, reviewer.PROMPT_VERSION,
+                                      lambda: reviewer._ai_review(code, language, end))
+    review["ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return review
+
+
+def run(root: str, out_path: str, processes: int, llm: int, limit: Optional[int] = None,
+        max_bytes: int = MAX_BYTES, use_ai: bool = True) -> Dict:
+    """Review every file under root into out_path and return run totals."""
+    started = time.perf_counter()
+    files = prioritize(walk(root, max_bytes), root)
+    done = _finished(out_path)
+    pending = [f for f in files if f.path not in done]
+    todo = pending[:limit]
+    totals = {"files": len(files), "resumed": len(files) - len(pending), "reviewed": 0, "errors": 0}
+    if not todo:
+        totals["seconds"] = round(time.perf_counter() - started, 1)
+        return totals
+
+    # spawned, so pool processes import only the linters, never ai_reviwer's LLM client or the threads below
+    lint_pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+    ai_pool = ThreadPoolExecutor(max_workers=llm, thread_name_prefix="batch-ai")
+    reviewer = None
+    if use_ai:
+        import ai_reviwer as reviewer
+        reviewer.LLM.set_concurrency(llm)  # chunked files share the same cap; LLM_RPM / LLM_TPM still apply
+    lints = {f.path: lint_pool.submit(_lint_file, os.path.join(root, f.path), f.language) for f in todo}
+    ais = {ai_pool.submit(_ai_file, reviewer, os.path.join(root, f.path), f.language) if use_ai else lints[f.path]: f
+           for f in todo}
+    try:
+        with open(out_path, "a", encoding="utf-8") as out:
+            for future in as_completed(ais):
+                f = ais[future]
+                record = {"path": f.path, "language": f.language, "bytes": f.size}
+                try:
+                    lint = lints[f.path].result()
+                except Exception as e:
+                    lint = {"issues": [], "ms": 0.0}
+                    record["error"] = f"lint failed: {e}"
+                if use_ai:
+                    try:
+                        ai = future.result()
+                    except Exception as e:
+                        ai = {"issues": [], "suggestions": [], "error": str(e)}
+                    record.update(score=ai.get("score", 0), summary=ai.get("summary", ""),
+                                  issues=lint["issues"] + ai.get("issues", []), suggestions=ai.get("suggestions", []),
+                                  ms={"lint": lint["ms"], "ai": ai.get("ms", 0.0)},
+                                  cache=ai.get("cache", {}).get("status", "miss"))
+                    for key in ("partial", "chunks"):
+                        if ai.get(key):
+                            record[key] = ai[key]
+                    if ai.get("error"):  # after a lint failure too: both halves say what went wrong
+                        record["error"] = "; ".join(filter(None, (record.get("error"), ai["error"])))
+                else:
+                    record.update(issues=lint["issues"], ms={"lint": lint["ms"]})
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()  # a killed run loses at most the file in flight
+                totals["reviewed"] += 1
+                totals["errors"] += "error" in record
+    finally:
+        ai_pool.shutdown(wait=False, cancel_futures=True)
+        lint_pool.shutdown(wait=False, cancel_futures=True)
+    totals["seconds"] = round(time.perf_counter() - started, 1)
+    return totals
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Review every Python / Java / JavaScript / C++ file under a directory.")
+    parser.add_argument("root", help="directory (usually a git checkout) to review")
+    parser.add_argument("-o", "--output", default="reviews.jsonl", help="JSONL file; appended to, and read to resume")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="linter processes")
+    parser.add_argument("--llm", type=int, default=8, help="LLM calls in flight at once (stay under the rate limit)")
+    parser.add_argument("--limit", type=int, help="review at most this many files this run")
+    parser.add_argument("--max-bytes", type=int, default=MAX_BYTES, help="skip larger files")
+    parser.add_argument("--no-ai", action="store_true", help="linters only")
+    args = parser.parse_args(argv)
+    if not os.path.isdir(args.root):
+        parser.error(f"not a directory: {args.root}")
+    try:
+        totals = run(args.root, args.output, max(1, args.processes), max(1, args.llm), args.limit,
+                     args.max_bytes, not args.no_ai)
+    except KeyboardInterrupt:
+        print(">>> interrupted; run again to resume", file=sys.stderr)
+        return 130
+    rate = totals["reviewed"] / totals["seconds"] if totals["seconds"] else 0.0
+    print(f">>> {totals['reviewed']} files in {totals['seconds']}s ({rate:.1f}/s), "
+          f"{totals['resumed']} already done, {totals['errors']} with errors", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
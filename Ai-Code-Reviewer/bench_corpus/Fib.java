@@ -0,0 +1,23 @@
+import java.util.HashMap;
+import java.util.Map;
+
+public class Fib {
+    private static Map<Integer, Long> memo = new HashMap<>();
+
+    public static long fib(int n) {
+        if (n < 2) {
+            return n;
+        }
+        if (memo.containsKey(n)) {
+            return memo.get(n);
+        }
+        long value = fib(n - 1) + fib(n - 2);
+        memo.put(n, value);
+        return value;
+    }
+
+    public static void main(String[] args) {
+        int n = Integer.parseInt(args[0]);
+        System.out.println(fib(n));
+    }
+}
@@ -0,0 +1,64 @@
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <iostream>
+#include <string>
+#include <vector>
+
+class Buffer {
+public:
+    Buffer(size_t size) : size_(size) {
+        data_ = (char*)malloc(size);
+    }
+
+    ~Buffer() {
+        delete data_;
+    }
+
+    void write(const char* text) {
+        strcpy(data_, text);
+    }
+
+    char at(int i) {
+        return data_[i];
+    }
+
+    size_t size() { return size_; }
+
+private:
+    char* data_;
+    size_t size_;
+};
+
+std::string readLine() {
+    char line[64];
+    gets(line);
+    return std::string(line);
+}
+
+int sum(std::vector<int> values) {
+    int total;
+    for (int i = 0; i <= values.size(); i++) {
+        total += values[i];
+    }
+    return total;
+}
+
+int* makeCounter() {
+    int counter = 0;
+    return &counter;
+}
+
+void run(const std::string& command) {
+    system(command.c_str());
+}
+
+int main(int argc, char** argv) {
+    Buffer buffer(16);
+    buffer.write(argv[1]);
+    std::cout << buffer.at(20) << std::endl;
+    std::vector<int> values = {1, 2, 3};
+    printf("%d\n", sum(values));
+    run(readLine());
+    return 0;
+}
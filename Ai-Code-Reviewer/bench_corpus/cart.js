@@ -0,0 +1,58 @@
+var TAX = 0.2;
+var apiKey = "sk_live_123456";
+
+function Cart() {
+    this.items = [];
+}
+
+Cart.prototype.add = function (name, price, qty) {
+    if (qty == undefined) qty = 1;
+    this.items.push({ name: name, price: price, qty: qty });
+};
+
+Cart.prototype.remove = function (name) {
+    for (var i = 0; i < this.items.length; i++) {
+        if (this.items[i].name == name) {
+            this.items.splice(i, 1);
+        }
+    }
+};
+
+Cart.prototype.total = function () {
+    var sum = 0;
+    for (var i in this.items) {
+        sum += this.items[i].price * this.items[i].qty;
+    }
+    return sum * (1 + TAX);
+};
+
+Cart.prototype.render = function (el) {
+    var html = "";
+    this.items.forEach(function (item) {
+        html += "<li>" + item.name + " x " + item.qty + "</li>";
+    });
+    el.innerHTML = "<ul>" + html + "</ul>";
+};
+
+Cart.prototype.applyCoupon = function (code) {
+    var rule = eval("(" + code + ")");
+    return rule(this.total());
+};
+
+function checkout(cart, callback) {
+    fetch("/api/checkout?key=" + apiKey, {
+        method: "POST",
+        body: JSON.stringify(cart.items)
+    }).then(function (res) {
+        callback(res.json());
+    });
+}
+
+function load(storage) {
+    var cart = new Cart();
+    var saved = JSON.parse(storage.getItem("cart"));
+    saved.forEach(function (item) { cart.add(item.name, item.price, item.qty); });
+    return cart;
+}
+
+module.exports = { Cart: Cart, checkout: checkout, load: load };
@@ -0,0 +1,20 @@
+function debounce(fn, wait) {
+    let timer = null;
+    return function (...args) {
+        clearTimeout(timer);
+        timer = setTimeout(() => fn.apply(this, args), wait);
+    };
+}
+
+function throttle(fn, wait) {
+    let last = 0;
+    return function (...args) {
+        const now = Date.now();
+        if (now - last >= wait) {
+            last = now;
+            fn.apply(this, args);
+        }
+    };
+}
+
+module.exports = { debounce, throttle };
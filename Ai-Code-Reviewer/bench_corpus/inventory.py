@@ -0,0 +1,67 @@
+import json
+import os
+import sqlite3
+import subprocess
+
+DB = "inventory.db"
+password = "admin123"
+
+
+def connect():
+    return sqlite3.connect(DB)
+
+
+def add_item(name, qty, price):
+    conn = connect()
+    conn.execute(f"INSERT INTO items VALUES ('{name}', {qty}, {price})")
+    conn.commit()
+
+
+def find_item(name):
+    conn = connect()
+    rows = conn.execute("SELECT * FROM items WHERE name = '" + name + "'").fetchall()
+    return rows[0] if rows else None
+
+
+def total_value():
+    conn = connect()
+    total = 0
+    for name, qty, price in conn.execute("SELECT * FROM items"):
+        total = total + qty * price
+    return total
+
+
+def load(path):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except:
+        data = []
+    for row in data:
+        add_item(row["name"], row["qty"], row["price"])
+    return len(data)
+
+
+def backup(target):
+    subprocess.call("cp " + DB + " " + target, shell=True)
+    return os.path.exists(target)
+
+
+def restock(items, minimum=5, log=[]):
+    for name in items:
+        row = find_item(name)
+        if row == None:
+            continue
+        if row[1] < minimum:
+            log.append(name)
+            add_item(name, minimum - row[1], row[2])
+    return log
+
+
+def report():
+    result = ""
+    conn = connect()
+    for name, qty, price in conn.execute("SELECT * FROM items ORDER BY name"):
+        result += "%s: %d x %.2f\n" % (name, qty, price)
+    print(result)
+    return eval("len(result)")
@@ -0,0 +1,25 @@
+#include <iostream>
+#include <vector>
+
+using Matrix = std::vector<std::vector<double>>;
+
+Matrix multiply(const Matrix& a, const Matrix& b) {
+    size_t n = a.size(), m = b[0].size(), k = b.size();
+    Matrix out(n, std::vector<double>(m, 0.0));
+    for (size_t i = 0; i < n; ++i)
+        for (size_t p = 0; p < k; ++p)
+            for (size_t j = 0; j < m; ++j)
+                out[i][j] += a[i][p] * b[p][j];
+    return out;
+}
+
+int main() {
+    Matrix a = {{1, 2}, {3, 4}};
+    Matrix b = {{5, 6}, {7, 8}};
+    Matrix c = multiply(a, b);
+    for (const auto& row : c) {
+        for (double v : row) std::cout << v << ' ';
+        std::cout << '\n';
+    }
+    return 0;
+}
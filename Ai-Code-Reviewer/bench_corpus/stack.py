@@ -0,0 +1,27 @@
+class Stack:
+    def __init__(self):
+        self.items = []
+
+    def push(self, item):
+        self.items.append(item)
+
+    def pop(self):
+        return self.items.pop()
+
+    def peek(self):
+        return self.items[len(self.items) - 1]
+
+    def is_empty(self):
+        return self.items == []
+
+
+def balanced(text):
+    pairs = {")": "(", "]": "[", "}": "{"}
+    stack = Stack()
+    for c in text:
+        if c in "([{":
+            stack.push(c)
+        elif c in pairs:
+            if stack.is_empty() or stack.pop() != pairs[c]:
+                return False
+    return stack.is_empty()
@@ -0,0 +1,326 @@
+# bench_review.py  –  end-to-end review latency against a fake LLM; compare the JSON across commits
+#
+#   python bench_review.py -o bench.json [--concurrency 1,4,16] [--requests 48] [--latency 0.15] [--tps 500]
+#   python bench_review.py -o after.json --compare before.json
+#
+# Every file in bench_corpus/ (Python, Java, JavaScript, C++), and each of them repeated past
+# CHUNK_LINES so chunked reviews are covered, goes through AIReviewer.review_code and through
+# POST /api/reviews on a local Flask server, with the model replaced by fake_llm.py.  The review
+# cache is off and every request is tagged with a unique comment, so each one runs the linter and
+# the model; rate limits are off, since they would measure the provider rather than this code.
+import argparse, itertools, json, logging, os, platform, shutil, subprocess, sys, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from ai.chunks import CHUNK_LINES
+from batch_review import walk
+import fake_llm
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CORPUS = os.path.join(HERE, "bench_corpus")
+COMMENT = {"python": "#", "java": "//", "javascript": "//", "cpp": "//"}
+STAGES = ("request", "review", "lint", "ai", "prompt", "llm_first_token", "llm", "parse")
+PERCENTILES = (50, 95, 99)
+
+
+class Sample(NamedTuple):
+    name: str
+    language: str
+    parts: Tuple[str, ...]      # copies of the file; each gets its own tag, so no two prompts are alike
+
+    def code(self, n: int) -> str:
+        mark = COMMENT[self.language]
+        return "".join(f"{mark} bench {n}.{k}\n{part}" for k, part in enumerate(self.parts))
+
+    @property
+    def lines(self) -> int:
+        return sum(part.count("\n") + 1 for part in self.parts)
+
+
+def corpus(root: str = CORPUS, large: bool = True) -> List[Sample]:
+    samples = []
+    for f in walk(root):
+        with open(os.path.join(root, f.path), encoding="utf-8") as fh:
+            code = fh.read()
+        samples.append(Sample(f.path, f.language, (code,)))
+        if large:
+            copies = 2 * CHUNK_LINES // max(1, code.count("\n")) + 1
+            samples.append(Sample(f"{f.path} x{copies}", f.language, (code,) * copies))
+    return samples
+
+
+# ---------- timing ----------
+class Stages:
+    """Seconds spent per stage, from every thread."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples: Dict[str, List[float]] = {}
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self.lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.samples = {}
+
+    def summary(self) -> Dict[str, Dict]:
+        with self.lock:
+            samples = {k: sorted(v) for k, v in self.samples.items()}
+        out = {}
+        for stage in STAGES:
+            values = samples.get(stage)
+            if values:
+                out[stage] = {"n": len(values), "mean": _ms(sum(values) / len(values)),
+                              **{f"p{p}": _ms(_percentile(values, p)) for p in PERCENTILES}}
+        return out
+
+
+def _percentile(values: List[float], p: float) -> float:
+    """Linear interpolation between the closest ranks of sorted values."""
+    k = (len(values) - 1) * p / 100
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _timed(stages: Stages, stage: str, fn: Callable) -> Callable:
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stages.add(stage, time.perf_counter() - start)
+    return timed
+
+
+def _instrument(reviewer, stages: Stages) -> None:
+    """Wrap the stages of ai_reviwer in timers; everything looks them up at call time."""
+    reviewer._lint = _timed(stages, "lint", reviewer._lint)
+    reviewer._prompt = _timed(stages, "prompt", reviewer._prompt)
+    reviewer._ai_part = _timed(stages, "ai", reviewer._ai_part)
+    reviewer.AIReviewer.review_code = _timed(stages, "review", reviewer.AIReviewer.review_code)
+    stream = reviewer.LLM.stream
+
+    def timed_stream(*args, **kwargs):
+        start = time.perf_counter()
+        reply = stream(*args, **kwargs)
+
+        def deltas():
+            first = True
+            try:
+                for delta in reply:
+                    if first:
+                        stages.add("llm_first_token", time.perf_counter() - start)
+                        first = False
+                    yield delta
+            finally:
+                reply.close()
+                stages.add("llm", time.perf_counter() - start)
+        return deltas()
+
+    reviewer.LLM.stream = timed_stream
+
+    class TimedParser(reviewer.ReviewParser):
+        """JSON parsing time per reply, all of its feed() calls together."""
+
+        def __init__(self):
+            super().__init__()
+            self.spent = 0.0
+
+        def feed(self, delta):
+            start = time.perf_counter()
+            try:
+                return super().feed(delta)
+            finally:
+                self.spent += time.perf_counter() - start
+
+        def result(self):
+            start = time.perf_counter()
+            try:
+                return super().result()
+            finally:
+                stages.add("parse", self.spent + time.perf_counter() - start)
+
+    reviewer.ReviewParser = TimedParser
+
+
+# ---------- runs ----------
+def _drive(review: Callable[[str, str], Dict], samples: List[Sample], concurrency: int, requests: int,
+           tags: Iterator, stages: Stages, target: str) -> Dict:
+    jobs = [(samples[i % len(samples)], next(tags)) for i in range(requests)]
+    counts = {"errors": 0, "partial": 0}
+    lock = threading.Lock()
+
+    def one(sample: Sample, n: int) -> None:
+        start = time.perf_counter()
+        try:
+            result = review(sample.code(n), sample.language)
+        except Exception as e:
+            print(f">>> {target} {sample.name}: {e}", file=sys.stderr)
+            result = {"error": str(e)}
+        if target == "http":
+            stages.add("request", time.perf_counter() - start)
+        with lock:
+            counts["errors"] += "error" in result
+            counts["partial"] += bool(result.get("partial"))
+
+    stages.reset()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="bench") as pool:
+        for future in [pool.submit(one, s, n) for s, n in jobs]:
+            future.result()
+    seconds = time.perf_counter() - start
+    return {"target": target, "concurrency": concurrency, "requests": requests, "seconds": round(seconds, 3),
+            "throughput": round(requests / seconds, 2), **counts, "stages": stages.summary()}
+
+
+def _flask(reviewer) -> Tuple[object, str]:
+    """A threaded local server with the review blueprint, as the app runs it."""
+    from flask import Flask
+    from werkzeug.serving import make_server
+    from review_api import reviews_api
+    app = Flask("bench_review")
+    app.register_blueprint(reviews_api)
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)  # no access log line per request
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="bench-flask", daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def run(levels: List[int], requests: int, latency: float, tps: float, parallel: int = 0,
+        targets: Tuple[str, ...] = ("review_code", "http"), large: bool = True, root: str = CORPUS) -> Dict:
+    os.environ["REVIEW_CACHE"] = "off"  # before ai_reviwer builds its CACHE
+    import httpx
+    import ai_reviwer as reviewer
+    from ai.llm import LLMClient
+
+    fake = fake_llm.serve(latency=latency, tps=tps, parallel=parallel, models=[reviewer.MODEL])
+    reviewer.LLM = LLMClient(reviewer.MODEL, "fake", base_url=fake.url + "/v1", rpm=1e9, tpm=1e12)
+    stages = Stages()
+    _instrument(reviewer, stages)
+    samples = corpus(root, large)
+    tags = itertools.count()
+    direct = reviewer.AIReviewer()
+    calls = {"review_code": direct.review_code}
+    server = client = None
+    if "http" in targets:
+        server, url = _flask(reviewer)
+        client = httpx.Client(base_url=url, timeout=60.0,
+                              limits=httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels)))
+        calls["http"] = lambda code, language: client.post("/api/reviews", json={"code": code, "language": language}).json()
+
+    report = {
+        "commit": _commit(), "python": platform.python_version(), "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "config": {"latency_s": latency, "tokens_per_s": tps, "llm_parallel": parallel, "requests": requests,
+                   "deadline_s": reviewer.DEADLINE, "chunk_lines": CHUNK_LINES, "lint_workers": _lint_workers()},
+        "corpus": {},
+        "runs": [],
+    }
+    for s in samples:
+        entry = report["corpus"].setdefault(s.language, {"samples": 0, "lines": 0})
+        entry["samples"] += 1
+        entry["lines"] += s.lines
+    try:
+        for target in targets:
+            # warm up: linter workers, the Flask app, pooled connections
+            _drive(calls[target], samples, min(4, len(samples)), len(samples), tags, stages, target)
+            for level in levels:
+                result = _drive(calls[target], samples, level, requests, tags, stages, target)
+                report["runs"].append(result)
+                total = result["stages"].get("request" if target == "http" else "review", {})
+                print(f">>> {target:<11} x{level:<3} {result['throughput']:7.2f}/s  "
+                      f"p50 {total.get('p50', 0):8.1f} ms  p95 {total.get('p95', 0):8.1f} ms  "
+                      f"p99 {total.get('p99', 0):8.1f} ms  {result['partial']} partial, {result['errors']} errors",
+                      file=sys.stderr)
+    finally:
+        if client is not None:
+            client.close()
+        if server is not None:
+            server.shutdown()
+        fake.shutdown()
+    report["llm"] = {"server": dict(fake.replies.stats), "client": dict(reviewer.LLM.stats)}
+    return report
+
+
+def _commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "-C", HERE, "describe", "--always", "--dirty"], capture_output=True, text=True,
+                             timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return out.stdout.strip() or None
+
+
+def _lint_workers() -> Dict[str, bool]:
+    """Which external linters exist here; without them a language's lint stage measures nothing."""
+    return {"java": bool(shutil.which("javac")), "javascript": bool(shutil.which("node")),
+            "cpp": bool(shutil.which("g++"))}
+
+
+def compare(base: Dict, new: Dict) -> List[str]:
+    """One line per run in both reports: throughput and p50 / p95 per stage, new vs base."""
+    old = {(r["target"], r["concurrency"]): r for r in base.get("runs", [])}
+    lines = [f"base {base.get('commit')} -> {new.get('commit')}"]
+    if base.get("config") != new.get("config") or base.get("corpus") != new.get("corpus"):
+        lines.append("(the runs used different settings or samples; differences are not only the code's)")
+    for run in new["runs"]:
+        was = old.get((run["target"], run["concurrency"]))
+        if was is None:
+            continue
+        lines.append(f"{run['target']} x{run['concurrency']}: throughput "
+                     f"{was['throughput']} -> {run['throughput']}/s ({_change(was['throughput'], run['throughput'])})")
+        for stage, now in run["stages"].items():
+            then = was["stages"].get(stage)
+            if then:
+                lines.append(f"  {stage:<16} p50 {then['p50']:>9} -> {now['p50']:>9} ms ({_change(then['p50'], now['p50'])})"
+                             f"   p95 {then['p95']:>9} -> {now['p95']:>9} ms ({_change(then['p95'], now['p95'])})")
+    return lines
+
+
+def _change(before: float, after: float) -> str:
+    return f"{(after - before) / before * 100:+.0f}%" if before else "n/a"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Review latency and throughput against a fake LLM.")
+    parser.add_argument("-o", "--output", default="bench.json", help="JSON report ('-' for stdout)")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma-separated levels of reviews in flight")
+    parser.add_argument("--requests", type=int, default=48, help="reviews per level and target")
+    parser.add_argument("--latency", type=float, default=0.15, help="fake LLM seconds to first token")
+    parser.add_argument("--tps", type=float, default=500.0, help="fake LLM tokens a second (0: instant)")
+    parser.add_argument("--llm-parallel", type=int, default=0, help="fake LLM requests served at once (0: no cap)")
+    parser.add_argument("--target", choices=("review_code", "http"), action="append",
+                        help="what to drive (default: both)")
+    parser.add_argument("--corpus", default=CORPUS, help="directory of samples")
+    parser.add_argument("--no-large", action="store_true", help="skip the repeated samples that get chunked")
+    parser.add_argument("--compare", help="an earlier report to compare with")
+    args = parser.parse_args(argv)
+    try:
+        levels = sorted({max(1, int(c)) for c in args.concurrency.split(",") if c.strip()})
+    except ValueError:
+        parser.error(f"bad --concurrency: {args.concurrency}")
+    if not levels:
+        parser.error("no --concurrency levels")
+    report = run(levels, max(1, args.requests), args.latency, args.tps, args.llm_parallel,
+                 tuple(args.target or ("review_code", "http")), not args.no_large, args.corpus)
+    text = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            print("\n".join(compare(json.load(f), report)), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+# fake_llm.py  –  stand-in LLM server that replays canned completions (offline testing and benchmarks)
+#
+#   python fake_llm.py [--port 11434] [--latency 0.2] [--tps 50] [--parallel 2] [--replies replies.json]
+#
+# Speaks Ollama's API (/api/tags, /api/chat, /api/generate) and the OpenAI-compatible one
+# (/v1/chat/completions), streamed or not, so OllamaClient and LLMClient both work against it:
+#   OLLAMA_HOST=127.0.0.1:11434                      ai/analyzer.py
+#   LLMClient(MODEL, base_url="http://127.0.0.1:11434/v1")
+#
+# --replies is a JSON list of {"match": "<text in the prompt>", "reply": "<completion>"}; the
+# first match wins and any other prompt gets REPLY.  Tokens are ~4 characters, sent --tps a
+# second after --latency seconds of "prompt processing".
+import argparse, json, socket, sys, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+REPLY = json.dumps({
+    "score": 7, "rating": 7,
+    "summary": "Readable code; a few edge cases are not handled.",
+    "issues": [
+        {"line": 1, "type": "bug", "severity": "medium", "message": "Input is not validated",
+         "description": "Input is not validated", "suggestion": "Check arguments before use"},
+        {"line": 2, "type": "style", "severity": "low", "message": "Name could be more descriptive",
+         "description": "Name could be more descriptive", "suggestion": "Rename it"},
+    ],
+    "suggestions": ["Add input validation", "Add tests for edge cases", "Document the public functions"],
+}, indent=2)
+
+
+class Replies:
+    """Canned completions, timing, and what was served."""
+
+    def __init__(self, replies: Optional[List[Dict]] = None, latency: float = 0.0, tps: float = 0.0,
+                 parallel: int = 0, models: Optional[List[str]] = None):
+        self.replies = replies or []
+        self.latency = latency          # seconds before the first token
+        self.tps = tps                  # tokens a second after it, 0 = all at once
+        self.slots = threading.Semaphore(parallel) if parallel > 0 else None  # like OLLAMA_NUM_PARALLEL
+        self.models = models or ["deepseek-coder:6.7b"]
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "tokens": 0}
+
+    def reply(self, prompt: str) -> str:
+        for canned in self.replies:
+            if canned.get("match", "") in prompt:
+                return canned["reply"]
+        return REPLY
+
+    def tokens(self, prompt: str, limit: Optional[int]) -> List[str]:
+        text = self.reply(prompt)
+        tokens = [text[i:i + 4] for i in range(0, len(text), 4)]
+        return tokens[:limit] if limit and limit > 0 else tokens
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"   # keep-alive, so pooled clients reuse their connections
+    server: "FakeLLM"
+
+    def setup(self):
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)  # tokens go out as they are written
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self._json({"models": [{"name": m, "model": m} for m in self.server.replies.models]})
+        elif self.path in ("/v1/models", "/models"):
+            self._json({"object": "list", "data": [{"id": m, "object": "model"} for m in self.server.replies.models]})
+        else:
+            self._json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+        if self.path in ("/api/chat", "/api/generate"):
+            ollama = True
+            if self.path == "/api/generate":
+                prompt = body.get("prompt", "")
+                if not prompt:      # a load request: {"model": ..., "keep_alive": ...}
+                    return self._json({"model": body.get("model"), "response": "", "done": True})
+            else:
+                prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+            limit = (body.get("options") or {}).get("num_predict")
+            stream = body.get("stream", True)
+        elif self.path in ("/v1/chat/completions", "/chat/completions"):
+            ollama = False
+            prompt = "\n".join(m.get("content", "") for m in body.get("messages", []))
+            limit = body.get("max_tokens")
+            stream = body.get("stream", False)
+        else:
+            return self._json({"error": "not found"}, 404)
+
+        replies = self.server.replies
+        if replies.slots is not None:
+            replies.slots.acquire()
+        try:
+            tokens = replies.tokens(prompt, limit)
+            with replies.lock:
+                replies.stats["requests"] += 1
+                replies.stats["tokens"] += len(tokens)
+            time.sleep(replies.latency)
+            usage = (len(prompt) // 4, len(tokens))
+            if not stream:
+                if replies.tps:
+                    time.sleep(len(tokens) / replies.tps)
+                return self._json(_whole(ollama, self.path, body, "".join(tokens), usage))
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson" if ollama else "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            start = time.monotonic()
+            for i, token in enumerate(tokens):
+                if replies.tps:
+                    pause = start + i / replies.tps - time.monotonic()
+                    if pause > 0:
+                        time.sleep(pause)
+                self._chunk(_piece(ollama, self.path, body, token))
+            self._chunk(_last(ollama, self.path, body, usage))
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True    # the client stopped reading, as Ollama's would
+        finally:
+            if replies.slots is not None:
+                replies.slots.release()
+
+    def _chunk(self, data: str) -> None:
+        raw = data.encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(raw), raw))
+        self.wfile.flush()
+
+    def _json(self, data: Dict, status: int = 200) -> None:
+        raw = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+
+def _piece(ollama: bool, path: str, body: Dict, token: str) -> str:
+    if not ollama:
+        return "data: " + json.dumps({"object": "chat.completion.chunk", "model": body.get("model"),
+                                      "choices": [{"index": 0, "delta": {"content": token}}]}) + "\n\n"
+    if path == "/api/generate":
+        return json.dumps({"model": body.get("model"), "response": token, "done": False}) + "\n"
+    return json.dumps({"model": body.get("model"), "message": {"role": "assistant", "content": token},
+                       "done": False}) + "\n"
+
+
+def _last(ollama: bool, path: str, body: Dict, usage) -> str:
+    prompt_tokens, tokens = usage
+    if not ollama:
+        done = {"object": "chat.completion.chunk", "model": body.get("model"),
+                "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": tokens,
+                          "total_tokens": prompt_tokens + tokens}}
+        return "data: " + json.dumps(done) + "\n\ndata: [DONE]\n\n"
+    done = {"model": body.get("model"), "done": True, "done_reason": "stop",
+            "prompt_eval_count": prompt_tokens, "eval_count": tokens}
+    done.update({"response": ""} if path == "/api/generate" else {"message": {"role": "assistant", "content": ""}})
+    return json.dumps(done) + "\n"
+
+
+def _whole(ollama: bool, path: str, body: Dict, text: str, usage) -> Dict:
+    prompt_tokens, tokens = usage
+    if not ollama:
+        return {"object": "chat.completion", "model": body.get("model"),
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": tokens,
+                          "total_tokens": prompt_tokens + tokens}}
+    done = {"model": body.get("model"), "done": True, "prompt_eval_count": prompt_tokens, "eval_count": tokens}
+    done.update({"response": text} if path == "/api/generate" else {"message": {"role": "assistant", "content": text}})
+    return done
+
+
+class FakeLLM(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, replies: Replies):
+        super().__init__(address, Handler)
+        self.replies = replies
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def serve(host: str = "127.0.0.1", port: int = 0, **options) -> FakeLLM:
+    """Start a stand-in on a background thread (port 0 picks a free one); .url, .shutdown()."""
+    server = FakeLLM((host, port), Replies(**options))
+    threading.Thread(target=server.serve_forever, name="fake-llm", daemon=True).start()
+    return server
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay canned LLM completions over the Ollama and OpenAI APIs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds before the first token")
+    parser.add_argument("--tps", type=float, default=50.0, help="tokens a second (0: the whole reply at once)")
+    parser.add_argument("--parallel", type=int, default=0, help="requests served at once, the rest wait (0: no cap)")
+    parser.add_argument("--replies", help='JSON list of {"match": ..., "reply": ...}')
+    parser.add_argument("--model", action="append", help="model names listed by /api/tags")
+    args = parser.parse_args(argv)
+    replies = None
+    if args.replies:
+        with open(args.replies, encoding="utf-8") as f:
+            replies = json.load(f)
+    server = FakeLLM((args.host, args.port), Replies(replies, args.latency, args.tps, args.parallel, args.model))
+    print(f">>> fake LLM on {server.url} ({args.latency}s to first token, {args.tps} tokens/s)", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
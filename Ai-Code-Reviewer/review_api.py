@@ -0,0 +1,31 @@
+# review_api.py  –  review endpoints (one-shot and streamed); app.py registers them on the web app
+from flask import Blueprint, Response, jsonify, request, stream_with_context
+
+from ai.stream import sse
+from ai_reviwer import AIReviewer
+
+reviews_api = Blueprint("reviews_api", __name__)
+REVIEWER = AIReviewer()
+
+
+def _events(body):
+    if body.get("diff") or body.get("repo"):
+        yield "done", REVIEWER.review_request(body)  # diff reviews arrive whole
+    else:
+        yield from REVIEWER.review_stream(body.get("code", ""), body.get("language", "python"))
+
+
+@reviews_api.post("/api/reviews")
+def review():
+    """The whole review as one JSON object (see AIReviewer.review_request for the body)."""
+    return jsonify(REVIEWER.review_request(request.get_json(silent=True) or {}))
+
+
+@reviews_api.post("/api/reviews/stream")
+def review_stream():
+    """Server-Sent Events for one review: "lint" at once, then "issue", "score", "summary" and
+    "suggestion" while the model writes, and "done" with the whole review (as POST /api/reviews)."""
+    body = request.get_json(silent=True) or {}
+    frames = (sse(kind, data) for kind, data in _events(body))
+    return Response(stream_with_context(frames), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
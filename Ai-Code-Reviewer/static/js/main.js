@@ -85,30 +85,145 @@ function performCodeReview() {
     reviewBtn.innerHTML = '<i class="fas fa-spinner fa-spin"></i> Analyzing...';
     reviewBtn.disabled = true;
 
-    fetch('/api/reviews', {
-        method: 'POST',
-        headers: {
-            'Content-Type': 'application/json',
-        },
-        body: JSON.stringify({
-            code: code,
-            language: language
+    // a pasted unified diff is reviewed hunk by hunk instead of as one file
+    const body = JSON.stringify(isUnifiedDiff(code) ? { diff: code } : {
+        code: code,
+        language: language
+    });
+
+    // issues show up as they are found; the one-shot endpoint is the fallback
+    streamCodeReview(body)
+    .catch(error => {
+        console.warn('Streaming review unavailable:', error);
+        return fetch('/api/reviews', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: body
         })
-    })
-    .then(response => response.json())
-    .then(result => {
-        displayReviewResults(result);
-        reviewBtn.innerHTML = '<i class="fas fa-robot"></i> Analyze Code';
-        reviewBtn.disabled = false;
+        .then(response => response.json())
+        .then(result => displayReviewResults(result));
     })
     .catch(error => {
         console.error('Error:', error);
         alert('Error performing code review');
+    })
+    .finally(() => {
         reviewBtn.innerHTML = '<i class="fas fa-robot"></i> Analyze Code';
         reviewBtn.disabled = false;
     });
 }
 
+// Server-Sent Events over a POST (EventSource can only GET); resolves after the "done" event
+function streamCodeReview(body) {
+    return fetch('/api/reviews/stream', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+        },
+        body: body
+    })
+    .then(response => {
+        if (!response.ok || !response.body) {
+            throw new Error(`stream unavailable (${response.status})`);
+        }
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let finished = false;
+        startStreamedResults();
+
+        const pump = () => reader.read().then(({ value, done }) => {
+            buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+            let end;
+            while ((end = buffer.indexOf('\n\n')) >= 0) {
+                finished = handleReviewEvent(buffer.slice(0, end)) || finished;
+                buffer = buffer.slice(end + 2);
+            }
+            if (done) {
+                if (!finished) {
+                    throw new Error('review stream ended early');
+                }
+                return;
+            }
+            return pump();
+        });
+        return pump();
+    });
+}
+
+function startStreamedResults() {
+    document.getElementById('reviewResults').style.display = 'block';
+    document.getElementById('scoreBadge').textContent = '…';
+    document.getElementById('reviewSummary').textContent = 'Reviewing…';
+    document.getElementById('issuesContainer').innerHTML = '';
+    document.getElementById('suggestionsContainer').innerHTML = '';
+}
+
+// one SSE frame; returns true for the final "done" event
+function handleReviewEvent(frame) {
+    let event = 'message';
+    let data = '';
+    frame.split('\n').forEach(line => {
+        if (line.startsWith('event:')) {
+            event = line.slice(6).trim();
+        } else if (line.startsWith('data:')) {
+            data += line.slice(5).trim();
+        }
+    });
+    if (!data) {
+        return false;
+    }
+    const value = JSON.parse(data);
+    const issuesContainer = document.getElementById('issuesContainer');
+
+    switch (event) {
+        case 'lint':
+            issuesContainer.insertAdjacentHTML('beforeend', value.map(issueHtml).join(''));
+            break;
+        case 'issue':
+            issuesContainer.insertAdjacentHTML('beforeend', issueHtml(value));
+            break;
+        case 'score':
+            if (typeof value === 'number') {
+                document.getElementById('scoreBadge').textContent = value.toFixed(1);
+            }
+            break;
+        case 'summary':
+            document.getElementById('reviewSummary').textContent = value;
+            break;
+        case 'suggestion':
+            document.getElementById('suggestionsContainer').insertAdjacentHTML('beforeend', suggestionHtml(value));
+            break;
+        case 'done':
+            displayReviewResults({ review: value });  // the final list replaces what was streamed
+            return true;
+    }
+    return false;
+}
+
+function issueHtml(issue) {
+    return `
+            <div class="issue-item">
+                <span class="issue-severity severity-${issue.severity}">${issue.severity.toUpperCase()}</span>
+                <strong>${issue.file ? issue.file + ' ' : ''}Line ${issue.line}:</strong> ${issue.message}
+            </div>
+        `;
+}
+
+function suggestionHtml(suggestion) {
+    return `
+            <div class="suggestion-item">
+                <i class="fas fa-lightbulb"></i> ${suggestion}
+            </div>
+        `;
+}
+
+function isUnifiedDiff(text) {
+    return /^(diff --git |--- \S)/m.test(text) && /^@@ -\d+(,\d+)? \+\d+(,\d+)? @@/m.test(text);
+}
+
 function displayReviewResults(result) {
     const resultsSection = document.getElementById('reviewResults');
     const scoreBadge = document.getElementById('scoreBadge');
@@ -126,23 +241,14 @@ function displayReviewResults(result) {
     
     // Display issues
     if (result.review.issues && result.review.issues.length > 0) {
-        issuesContainer.innerHTML = result.review.issues.map(issue => `
-            <div class="issue-item">
-                <span class="issue-severity severity-${issue.severity}">${issue.severity.toUpperCase()}</span>
-                <strong>Line ${issue.line}:</strong> ${issue.message}
-            </div>
-        `).join('');
+        issuesContainer.innerHTML = result.review.issues.map(issueHtml).join('');
     } else {
         issuesContainer.innerHTML = '<p>No issues found!</p>';
     }
 
     // Display suggestions
     if (result.review.suggestions && result.review.suggestions.length > 0) {
-        suggestionsContainer.innerHTML = result.review.suggestions.map(suggestion => `
-            <div class="suggestion-item">
-                <i class="fas fa-lightbulb"></i> ${suggestion}
-            </div>
-        `).join('');
+        suggestionsContainer.innerHTML = result.review.suggestions.map(suggestionHtml).join('');
     } else {
         suggestionsContainer.innerHTML = '<p>No additional suggestions.</p>';
     }
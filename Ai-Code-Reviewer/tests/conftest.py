@@ -0,0 +1,5 @@
+# conftest.py  –  the reviewer's top-level modules and ai/ package import from the project root
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
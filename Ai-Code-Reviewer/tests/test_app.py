@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+import ai_reviwer
+import app
+import fake_llm
+from ai.cache import ReviewCache
+from ai.llm import LLMClient
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    """The real Flask app, its reviewer answered by a stand-in LLM."""
+    server = fake_llm.serve()
+    monkeypatch.setattr(ai_reviwer, "LLM", LLMClient(ai_reviwer.MODEL, "fake", base_url=server.url + "/v1",
+                                                     rpm=1e9, tpm=1e12))
+    monkeypatch.setattr(ai_reviwer, "CACHE", ReviewCache(str(tmp_path / "cache.sqlite3")))
+    monkeypatch.setattr(app, "DATA", str(tmp_path))
+    yield app.app.test_client()
+    server.shutdown()
+
+
+@pytest.mark.parametrize("path", ["/", "/dashboard", "/code_review", "/style_guides", "/training_data", "/settings"])
+def test_pages(client, path):
+    assert client.get(path).status_code == 200
+
+
+def test_the_pages_json(client, tmp_path):
+    assert client.get("/api/reviews").get_json() == []
+    (tmp_path / "reviews.json").write_text(json.dumps([{"language": "python", "status": "completed"}]))
+    assert client.get("/api/reviews").get_json()[0]["status"] == "completed"
+    assert client.get("/api/style_guides").get_json() == []
+
+
+def test_review_endpoints_are_served(client):
+    body = {"code": "import os\nx = 1\n", "language": "python"}
+    review = client.post("/api/reviews", json=body).get_json()
+    assert "'os' imported but unused" in [i["message"] for i in review["issues"]]
+    stream = client.post("/api/reviews/stream", json=dict(body, code="import sys\ny = 2\n"))  # not cached yet
+    assert stream.status_code == 200 and stream.mimetype == "text/event-stream"
+    frames = stream.get_data(as_text=True)
+    assert frames.startswith("event: lint\n") and "event: done\n" in frames
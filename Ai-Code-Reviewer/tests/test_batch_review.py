@@ -0,0 +1,84 @@
+import json
+import os
+
+import pytest
+
+import ai_reviwer
+import batch_review
+import fake_llm
+from ai.cache import ReviewCache
+from ai.llm import LLMClient
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    (root / "pkg").mkdir(parents=True)
+    (root / "node_modules").mkdir()
+    (root / "pkg" / "a.py").write_text("import os\n\n\ndef f():\n    return 1\n")
+    (root / "pkg" / "b.js").write_text("let x = 1;\n")
+    (root / "notes.txt").write_text("not code\n")
+    (root / "node_modules" / "dep.js").write_text("let vendored = 1;\n")
+    (root / "empty.py").write_text("")
+    return root
+
+
+def records(path):
+    with open(path, encoding="utf-8") as f:
+        return {r["path"]: r for r in map(json.loads, f)}
+
+
+def test_walk_skips_vendored_empty_and_unknown(repo):
+    assert sorted(f.path for f in batch_review.walk(str(repo))) == ["pkg/a.py", "pkg/b.js"]
+
+
+def test_lint_only_run_resumes(repo, tmp_path):
+    out = str(tmp_path / "reviews.jsonl")
+    totals = batch_review.run(str(repo), out, processes=1, llm=1, use_ai=False)
+    assert totals["reviewed"] == 2 and totals["errors"] == 0
+    found = records(out)
+    assert "'os' imported but unused" in [i["message"] for i in found["pkg/a.py"]["issues"]]
+    again = batch_review.run(str(repo), out, processes=1, llm=1, use_ai=False)
+    assert again["resumed"] == 2 and again["reviewed"] == 0
+
+
+def test_torn_and_failed_lines_are_redone(tmp_path):
+    out = tmp_path / "reviews.jsonl"
+    out.write_text(json.dumps({"path": "a.py"}) + "\n" + json.dumps({"path": "b.py", "error": "x"}) + "\n"
+                   + json.dumps({"path": "c.py", "partial": True}) + "\n" + '{"path": "d.p')
+    assert batch_review._finished(str(out)) == {"a.py"}
+
+
+def test_resume_keeps_the_last_line_per_path(tmp_path):
+    out = tmp_path / "reviews.jsonl"
+    lines = [{"path": "a.py", "error": "x"}, {"path": "b.py"}, {"path": "a.py", "score": 7},
+             {"path": "c.py", "partial": True}, {"path": "c.py", "error": "y"}]
+    out.write_text("".join(json.dumps(r) + "\n" for r in lines) + '{"path": "d.p')
+    assert batch_review._finished(str(out)) == {"a.py", "b.py"}
+    assert [json.loads(line) for line in out.read_text().splitlines()] == [lines[1], lines[2], lines[4]]
+
+
+def test_lint_and_ai_errors_are_both_kept(tmp_path, monkeypatch):
+    gone = batch_review.Source("gone.py", "python", 10, 0.0)  # listed, then deleted before it is read
+    monkeypatch.setattr(batch_review, "walk", lambda root, max_bytes: [gone])
+    monkeypatch.setattr(ai_reviwer, "LLM", LLMClient(ai_reviwer.MODEL, "fake", base_url="http://127.0.0.1:9/v1"))
+    out = tmp_path / "reviews.jsonl"
+    assert batch_review.run(str(tmp_path), str(out), processes=1, llm=1)["errors"] == 1
+    error = records(out)["gone.py"]["error"]
+    assert error.startswith("lint failed: ") and error.count("No such file") == 2 and "; " in error
+
+
+def test_ai_run(repo, tmp_path, monkeypatch):
+    server = fake_llm.serve()
+    monkeypatch.setattr(ai_reviwer, "LLM", LLMClient(ai_reviwer.MODEL, "fake", base_url=server.url + "/v1",
+                                                     rpm=1e9, tpm=1e12))
+    monkeypatch.setattr(ai_reviwer, "CACHE", ReviewCache(str(tmp_path / "cache.sqlite3")))
+    out = str(tmp_path / "reviews.jsonl")
+    try:
+        totals = batch_review.run(str(repo), out, processes=1, llm=2)
+    finally:
+        server.shutdown()
+    assert totals["reviewed"] == 2 and totals["errors"] == 0
+    for record in records(out).values():
+        assert record["score"] == 7 and record["suggestions"] and "partial" not in record
+    assert os.path.exists(tmp_path / "cache.sqlite3")  # the AI half is shared with AIReviewer's cache
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+import ai_reviwer
+import bench_review
+from ai.cache import ReviewCache
+from ai.workers import checkers
+
+
+@pytest.fixture
+def bench(monkeypatch, tmp_path):
+    """bench_review.run rewires ai_reviwer for timing; every attribute it touches is put back afterwards."""
+    monkeypatch.setenv("REVIEW_CACHE", "off")
+    for name in ("_lint", "_prompt", "_ai_part", "LLM", "ReviewParser"):
+        monkeypatch.setattr(ai_reviwer, name, getattr(ai_reviwer, name))
+    monkeypatch.setattr(ai_reviwer.AIReviewer, "review_code", ai_reviwer.AIReviewer.review_code)
+    monkeypatch.setattr(ai_reviwer, "CACHE", ReviewCache(str(tmp_path / "cache.sqlite3")))
+    pools = checkers(size=1)  # the app's own pools stay cold
+    monkeypatch.setattr(ai_reviwer, "CHECKERS", pools)
+    yield tmp_path
+    for pool in pools.values():
+        pool.close()
+
+
+def test_corpus_adds_chunked_copies():
+    small = bench_review.corpus(large=False)
+    both = bench_review.corpus()
+    assert {s.language for s in small} == {"python", "java", "javascript", "cpp"}
+    assert len(both) == 2 * len(small)
+    assert all(s.lines > bench_review.CHUNK_LINES for s in both if " x" in s.name)
+
+
+def test_sample_tags_make_every_prompt_unique():
+    sample = bench_review.Sample("a.py", "python", ("x = 1\n", "x = 1\n"))
+    assert sample.code(1) != sample.code(2)
+    assert sample.code(1).splitlines()[::2] == ["# bench 1.0", "# bench 1.1"]
+
+
+def test_report_and_compare(bench):
+    out = bench / "bench.json"
+    args = ["-o", str(out), "--concurrency", "1,2", "--requests", "4", "--latency", "0", "--tps", "0",
+            "--target", "review_code", "--target", "http", "--no-large"]
+    assert bench_review.main(args) == 0
+    report = json.loads(out.read_text())
+    assert [(r["target"], r["concurrency"]) for r in report["runs"]] == [
+        ("review_code", 1), ("review_code", 2), ("http", 1), ("http", 2)]
+    for run in report["runs"]:
+        assert run["requests"] == 4 and run["errors"] == 0
+        assert {"review", "ai", "llm", "parse"} <= set(run["stages"])
+    assert report["llm"]["server"]["requests"] > 0
+    lines = bench_review.compare(report, report)
+    assert len([line for line in lines if " throughput " in line]) == 4 and "different settings" not in "".join(lines)
@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ai.cache import ReviewCache, cached_review, review_key, semantic_review
+from ai.reviewer import review_file
+
+BIG = "".join(f"def f{i}(a):\n    return a + {i}\n\n\n" for i in range(100))
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.delenv("REVIEW_CACHE", raising=False)
+    return ReviewCache(str(tmp_path / "cache.sqlite3"))
+
+
+def test_hit_after_miss(cache):
+    key = review_key("x = 1\n", "python", "m", "p")
+    first = cached_review(cache, key, lambda: {"score": 7, "issues": []})
+    second = cached_review(cache, key, lambda: pytest.fail("computed twice"))
+    assert (first["cache"]["status"], second["cache"]["status"]) == ("miss", "hit") and second["score"] == 7
+
+
+def test_errors_and_partial_answers_are_not_stored(cache):
+    for review in ({"error": "offline", "issues": []}, {"partial": True, "issues": []}):
+        key = review_key(repr(review), "python", "m", "p")
+        assert not cached_review(cache, key, lambda: dict(review))["cache"]["stored"]
+        assert cache.get(key) is None
+        assert semantic_review(cache, "def g(b):\n    return b\n", "python", "m", repr(review),
+                               lambda: dict(review)).get("cache") is None
+
+
+def test_reformatted_code_reuses_the_review(cache):
+    semantic_review(cache, "def f(a):\n    return a\n", "python", "m", "p",
+                    lambda: {"score": 5, "issues": [{"line": 2, "message": "m"}]})
+    again = semantic_review(cache, "# note\n\ndef f(b):  # same\n    return b\n", "python", "m", "p",
+                            lambda: pytest.fail("not reused"))
+    assert again["cache"]["status"] == "semantic" and again["issues"][0]["line"] == 4
+
+
+def test_partial_chunks_are_asked_again(cache):
+    asked = []
+
+    def ask(code, excerpt):
+        review = {"score": 8, "summary": "s", "issues": [], "suggestions": []}
+        if not asked:
+            review["partial"] = True  # the first answer is cut off
+        asked.append(code)
+        return review
+
+    with ThreadPoolExecutor(max_workers=1) as executor:  # one at a time, so the first section is cut off
+        first = review_file(BIG, "python", ask, executor, cache, "m", "p")
+        sections = first["chunks"]["total"]
+        cut = asked[0]
+        del asked[1:]
+        second = review_file(BIG, "python", ask, executor, cache, "m", "p")
+    assert sections > 1 and first["partial"] and "partial" not in second
+    assert asked == [cut, cut]  # only the cut-off section went to the model again
+    assert second["chunks"]["cached"] == sections - 1
@@ -0,0 +1,58 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ai.chunks import review_chunks, split
+
+BIG = "".join(f"def f{i}():\n    return {i}\n\n\n" for i in range(100))
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        yield pool
+
+
+def answer(chunk):
+    return {"score": 8, "summary": f"lines {chunk.start}", "issues": [{"line": 1, "message": "first"}],
+            "suggestions": ["s"]}
+
+
+def test_split_at_definitions():
+    chunks = split(BIG, "python", most=50)
+    assert len(chunks) > 1
+    assert all(c.code.startswith("def ") for c in chunks)
+    assert "".join(c.code for c in chunks).strip() == BIG.strip()
+
+
+def test_issue_lines_move_to_the_file(executor):
+    chunks = split(BIG, "python", most=50)
+    review = review_chunks(chunks, answer, executor)
+    assert [i["line"] for i in review["issues"]] == [c.start for c in chunks]
+    assert review["chunks"] == {"total": len(chunks), "late": 0, "failed": 0, "cached": 0}
+    assert "partial" not in review and review["score"] == 8
+
+
+def test_late_chunks_are_left_out(executor):
+    chunks = split(BIG, "python", most=50)
+    release = threading.Event()
+
+    def slow_first(chunk):
+        if chunk is chunks[0]:
+            release.wait(5)
+        return answer(chunk)
+
+    start = time.monotonic()
+    review = review_chunks(chunks, slow_first, executor, time.monotonic() + 0.3)
+    release.set()
+    assert time.monotonic() - start < 2
+    assert review["chunks"]["late"] == 1 and review["partial"]
+    assert chunks[0].start not in [i["line"] for i in review["issues"]]
+
+
+def test_no_chunk_back_is_an_error(executor):
+    chunks = split(BIG, "python", most=50)
+    review = review_chunks(chunks, lambda c: {"error": "offline"}, executor)
+    assert review["error"] and review["chunks"]["failed"] == len(chunks)
@@ -0,0 +1,97 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from ai.diff import parse_diff, regions
+from ai.reviewer import review_diff, review_request
+
+DIFF = """\
+diff --git a/pkg/new.py b/pkg/new.py
+new file mode 100644
+--- /dev/null
++++ b/pkg/new.py
+@@ -0,0 +1,6 @@
++import os
++
++
++def f():
++    x = 1
++    return 2
+diff --git a/notes.txt b/notes.txt
+--- a/notes.txt
++++ b/notes.txt
+@@ -1,2 +1,2 @@
+ a
+-b
++c
+diff --git a/web/app.js b/web/app.js
+--- a/web/app.js
++++ b/web/app.js
+@@ -3,3 +3,3 @@
+ let a = 1;
+-let b = 2;
++let b = 3;
+ let c = 4;
+"""
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
+def test_parse_diff():
+    patches = {p.path: p for p in parse_diff(DIFF)}
+    assert patches["pkg/new.py"].changed == set(range(1, 7)) and patches["pkg/new.py"].source.startswith("import os")
+    assert patches["web/app.js"].changed == {4} and patches["web/app.js"].source is None
+    assert patches["notes.txt"].language is None
+    region, = regions(patches["web/app.js"])
+    assert (region.start, region.end, region.changed) == (3, 5, (4,))
+    assert region.marked() == "  let a = 1;\n+ let b = 3;\n  let c = 4;\n"
+
+
+def review(executor, languages=None, asked=None):
+    def lint(source, language, deadline, lines):
+        return [{"line": 1, "severity": "high", "message": "'os' imported but unused"}]
+
+    def ask(code, language, deadline):
+        if asked is not None:
+            asked.append(code)
+        return {"score": 6, "summary": language, "issues": [{"line": 2, "message": "look"}], "suggestions": []}
+
+    return review_diff(DIFF, None, "HEAD", None, time.monotonic() + 5, lint=lint, ask=ask, pool=executor,
+                       executor=executor, cache=None, model="m", prompt_version="p", languages=languages)
+
+
+def test_issue_lines_are_new_file_lines(executor):
+    asked = []
+    result = review(executor, asked=asked)
+    files = {f["file"]: f for f in result["files"]}
+    assert set(files) == {"pkg/new.py", "web/app.js"} and result["diff"]["skipped"] == ["notes.txt"]
+    assert [(i["file"], i["line"]) for i in files["pkg/new.py"]["issues"]] == [("pkg/new.py", 1), ("pkg/new.py", 2)]
+    assert [i["line"] for i in files["web/app.js"]["issues"]] == [4]  # region 3-5, line 2 of it
+    assert all(line.startswith("+ ") for code in asked for line in code.splitlines() if "let b" in line)
+    assert result["score"] == 6 and not result["partial"]
+
+
+def test_only_the_given_languages(executor):
+    result = review(executor, languages=("python",))
+    assert [f["file"] for f in result["files"]] == ["pkg/new.py"]
+    assert sorted(result["diff"]["skipped"]) == ["notes.txt", "web/app.js"]
+
+
+def test_unreadable_diff_source():
+    result = review_diff(None, "/nonexistent/repo", "HEAD", None, time.monotonic() + 1, lint=None, ask=None,
+                         pool=None, executor=None, cache=None, model="m", prompt_version="p")
+    assert result["error"] and result["issues"] == []
+
+
+def test_request_outside_repo_root(tmp_path):
+    class Reviewer:
+        def review_diff(self, **kwargs):
+            raise AssertionError("must not be reached")
+
+    result = review_request(Reviewer(), {"repo": "/"}, str(tmp_path))
+    assert result["error"] == "repository is outside REVIEW_REPO_ROOT"
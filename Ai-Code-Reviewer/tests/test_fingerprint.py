@@ -0,0 +1,48 @@
+from ai.fingerprint import fingerprint, line_marks, remap_issues
+
+CODE = '''\
+def total(values, limit):
+    """Sum of the small values."""
+    result = 0
+    for v in values:
+        if v < limit:
+            result += v
+    return result
+'''
+
+REFORMATTED = '''\
+# helpers
+
+
+def total(items, cap):  # renamed locals, no docstring
+    acc = 0
+    for item in items:
+        if item < cap: acc += item
+    return acc
+'''
+
+
+def test_layout_comments_docstrings_and_locals_do_not_matter():
+    a, b = fingerprint(CODE, "python"), fingerprint(REFORMATTED, "python")
+    assert a.kind == b.kind == "ast" and a.digest == b.digest
+
+
+def test_behaviour_changes_do():
+    for changed in (CODE.replace("<", "<="), CODE.replace("def total", "def summed"), CODE.replace("0\n", "1\n")):
+        assert fingerprint(changed, "python").digest != fingerprint(CODE, "python").digest
+
+
+def test_issue_lines_follow_their_statement():
+    old, new = fingerprint(CODE, "python"), fingerprint(REFORMATTED, "python")
+    issues = [{"line": 6, "message": "augmented"}, {"line": 7, "message": "return"}, {"message": "no line"}]
+    moved = remap_issues(issues, line_marks(old.lines), new.lines)
+    assert [i.get("line") for i in moved] == [7, 8, None]
+
+
+def test_other_languages_by_tokens():
+    js = "function f(a) {\n  return a + 1; // one\n}\n"
+    same = "/* f */ function f(a) { return a + 1; }"
+    assert fingerprint(js, "javascript").digest == fingerprint(same, "javascript").digest
+    assert fingerprint(js, "javascript").digest != fingerprint(js.replace("1", "2"), "javascript").digest
+    assert fingerprint("#include <a.h>\n", "cpp").digest != fingerprint("\n", "cpp").digest
+    assert fingerprint("def f(:\n  # x\n", "python").kind == "tokens"
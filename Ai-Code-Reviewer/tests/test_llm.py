@@ -0,0 +1,91 @@
+import gc
+import threading
+import time
+
+import pytest
+
+import ai_reviwer
+import fake_llm
+from ai.chunks import split
+from ai.llm import TPM, LLMClient, LLMError, RateLimiter
+
+
+@pytest.fixture
+def server():
+    server = fake_llm.serve(latency=0.3)
+    yield server
+    server.shutdown()
+
+
+def client(server, **options):
+    options = {"rpm": 1e9, "tpm": 1e12, **options}
+    return LLMClient("m", "fake", base_url=server.url + "/v1", **options)
+
+
+def test_identical_requests_share_one_call(server):
+    llm = client(server)
+    replies = [None] * 4
+
+    def ask(i):
+        replies[i] = llm.complete("same prompt")
+
+    threads = [threading.Thread(target=ask, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert replies == [fake_llm.REPLY] * 4
+    assert server.replies.stats["requests"] == 1 and llm.stats["coalesced"] == 3
+
+
+@pytest.mark.parametrize("leave", ["close", "drop"])
+def test_a_reader_never_started_still_leaves(server, leave):
+    llm = client(server)
+    reply = llm.stream("nobody reads this")
+    flight, = llm.flights.values()
+    assert flight.readers == 1
+    if leave == "close":
+        reply.close()
+    else:
+        del reply
+        gc.collect()
+    assert flight.readers == 0 and flight.abandoned()  # a retry would not be sent
+
+
+def test_deadline(server):
+    llm = client(server)
+    reply = llm.stream("slow", deadline=time.monotonic() + 0.1)
+    flight, = llm.flights.values()
+    with pytest.raises(TimeoutError):
+        list(reply)
+    assert flight.readers == 0
+
+
+def test_stats_are_exact_under_threads(server):
+    llm = client(server)
+    threads = [threading.Thread(target=lambda: [llm._count("retries") for _ in range(10000)]) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert llm.stats["retries"] == 80000
+
+
+def test_rate_limit_fails_fast():
+    limiter = RateLimiter(rpm=60, tpm=1000)
+    limiter.acquire(900)
+    with pytest.raises(LLMError) as e:
+        limiter.acquire(900, deadline=time.monotonic() + 1)
+    assert e.value.status == 429
+
+
+def test_default_tpm_takes_a_large_file_at_once():
+    code = "".join(f"def f{i}(values, limit):\n" + "    total = sum(v for v in values if v < limit)\n" * 3
+                   + "    return total\n\n\n" for i in range(200))  # 1200 lines
+    chunks = split(code, "python")
+    estimate = sum(len(ai_reviwer._prompt(c.code, "python", excerpt=True)) / 4 + 350 for c in chunks)
+    assert len(chunks) > 5 and estimate < TPM
+    limiter = RateLimiter(tpm=TPM)
+    for c in chunks:
+        limiter.acquire(len(ai_reviwer._prompt(c.code, "python", excerpt=True)) / 4 + 350,
+                        deadline=time.monotonic() + 0.01)
@@ -0,0 +1,66 @@
+import functools
+import threading
+
+import pytest
+
+import fake_llm
+from ai import analyzer
+from ai.cache import ReviewCache
+from ai.llm import LLMError, OllamaClient
+
+MODEL = "deepseek-coder:6.7b"
+CODE = "def f(a):\n    return a + 1\n"
+
+
+@pytest.fixture
+def server():
+    server = fake_llm.serve(latency=0.3)
+    yield server
+    server.shutdown()
+
+
+def test_models_and_a_streamed_reply(server):
+    llm = OllamaClient(MODEL, host=server.url)
+    assert MODEL in llm.models()
+    assert llm.complete("review this") == fake_llm.REPLY
+
+
+def test_identical_prompts_share_one_generation(server):
+    llm = OllamaClient(MODEL, host=server.url)
+    replies = [None] * 3
+
+    def ask(i):
+        replies[i] = llm.complete("same prompt")
+
+    threads = [threading.Thread(target=ask, args=(i,)) for i in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert replies == [fake_llm.REPLY] * 3
+    assert server.replies.stats["requests"] == 1 and llm.stats["coalesced"] == 2
+
+
+def test_unreachable_server_is_an_llm_error():
+    with pytest.raises(LLMError):
+        OllamaClient(MODEL, host="127.0.0.1:9").models()
+
+
+@pytest.fixture(params=[False, True], ids=["whole", "cut-off"])
+def reviewer(request, monkeypatch, tmp_path):
+    """ai.analyzer against a stand-in Ollama whose reply is whole, or stops half way through the issues."""
+    reply = fake_llm.REPLY[:fake_llm.REPLY.index('"line": 2')] if request.param else fake_llm.REPLY
+    server = fake_llm.serve(replies=[{"match": "", "reply": reply}])
+    monkeypatch.setattr(analyzer, "OllamaClient", functools.partial(OllamaClient, host=server.url))
+    monkeypatch.setattr(analyzer, "ReviewCache", lambda: ReviewCache(str(tmp_path / "cache.sqlite3")))
+    yield analyzer.AIReviewer(), request.param
+    server.shutdown()
+
+
+def test_only_whole_replies_are_cached(reviewer):
+    reviewer, cut = reviewer
+    first = reviewer.review_code(CODE)
+    second = reviewer.review_code(CODE)
+    assert first["cache"]["status"] == "miss" and bool(first.get("partial")) == cut
+    assert len(first["issues"]) == (1 if cut else 2)
+    assert second["cache"]["status"] == ("miss" if cut else "hit")
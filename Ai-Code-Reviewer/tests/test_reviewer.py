@@ -0,0 +1,24 @@
+from concurrent.futures import Future
+
+from ai.reviewer import combine
+
+
+def finished(value):
+    f = Future()
+    f.set_result(value)
+    return f
+
+
+def test_combine_both_back():
+    ai = {"score": 8, "summary": "ok", "issues": [{"line": 2, "message": "ai"}], "suggestions": []}
+    review = combine("a\nb\n", "python", finished([{"line": 1, "message": "lint"}]), finished(ai))
+    assert [i["message"] for i in review["issues"]] == ["lint", "ai"]
+    assert review["total_lines"] == 2 and review["partial"] is False and "late" not in review
+
+
+def test_combine_drops_a_late_stage():
+    late = Future()
+    review = combine("x = 1\n", "python", finished([{"line": 1, "message": "lint"}]), late)
+    assert late.cancelled()
+    assert review["late"] == ["ai"] and review["partial"] and review["error"] == "deadline exceeded"
+    assert [i["message"] for i in review["issues"]] == ["lint"]
@@ -0,0 +1,97 @@
+import glob
+import importlib.util
+import os
+import re
+
+import pytest
+
+from ai.rules import lint_python
+
+api = pytest.importorskip("pyflakes.api")
+reporter = pytest.importorskip("pyflakes.reporter")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# findings of the security and typo rules, which pyflakes does not have
+EXTRA = re.compile(r"arbitrary code|goes through the shell|shell injection|yaml\.load\(\)|weak hash|mktemp|"
+                   r"verify=False\)|without timeout=|SQL built|hardcoded password|silently swallows|^Probable typo$")
+
+CASES = [
+    # a __future__ import read before a local of the same name is bound
+    "from __future__ import annotations\ndef f():\n    annotations = 1\n    return annotations\n",
+    "import os\ndef f():\n    print(os)\n    os = 1\n    return os\n",
+    "from os import *\n__all__ = ['path', 'nothing']\n",
+    "import typing as t\nfrom typing import Union\nif t.TYPE_CHECKING:\n    from os import PathLike\n"
+    "A = Union['PathLike', int]\nB = t.Optional['PathLike']\n",
+    "from typing import TypeAlias, TYPE_CHECKING\nif TYPE_CHECKING:\n    from os import PathLike\n"
+    "P: TypeAlias = 'PathLike[str]'\n",
+    "from typing import Literal\nx: Literal['missing'] = 'missing'\n",
+    "import sys\ndef f(x: 'Undefined') -> 'sys.X':\n    y = 1\n",
+    # only typing's cast, TypeVar, ... take types as strings
+    "cast = lambda a: a\ncast(getattr(object, 'or'))\n",
+    "from typing import cast, TYPE_CHECKING\nif TYPE_CHECKING:\n    from os import PathLike\n"
+    "x = cast('PathLike', 1)\ny = cast(typ='Nope', val=1)\n",
+    "import typing\nT = typing.TypeVar('T', 'Missing', bound='Other', covariant='X')\n",
+    "from typing import NamedTuple, TypedDict\nN = NamedTuple('N', [('a', 'A'), ('b', int)])\n"
+    "D = TypedDict('D', {'a': 'B'}, total='C')\n",
+]
+
+
+class Collect(reporter.Reporter):
+    def __init__(self):
+        self.found = set()
+
+    def flake(self, message):
+        self.found.add((message.lineno, message.message % message.message_args))
+
+    def unexpectedError(self, filename, message):
+        raise AssertionError(message)
+
+    def syntaxError(self, *args):
+        pass
+
+
+def pyflakes(code):
+    collect = Collect()
+    api.check(code, "case.py", collect)
+    return collect.found
+
+
+def ours(code):
+    return {(i["line"], i["message"]) for i in lint_python(code) if not EXTRA.search(i["message"])}
+
+
+def corpus():
+    """This project's sources plus modules that once crashed the linter, where installed."""
+    files = sorted(glob.glob(os.path.join(ROOT, "**", "*.py"), recursive=True))
+    for package, module in (("pydantic", "_internal/_generics.py"), ("groq", "_utils/_transform.py"),
+                            ("anyio", "_typedattr.py")):
+        spec = importlib.util.find_spec(package)
+        if spec is not None and spec.origin:
+            path = os.path.join(os.path.dirname(spec.origin), module)
+            if os.path.exists(path):
+                files.append(path)
+    return files
+
+
+@pytest.mark.parametrize("code", CASES)
+def test_matches_pyflakes(code):
+    assert ours(code) == pyflakes(code)
+
+
+@pytest.mark.parametrize("path", corpus(), ids=lambda p: os.path.relpath(p, ROOT) if p.startswith(ROOT) else
+                         os.path.basename(os.path.dirname(p)) + "/" + os.path.basename(p))
+def test_corpus_matches_pyflakes(path):
+    with open(path, encoding="utf-8") as f:
+        code = f.read()
+    assert ours(code) == pyflakes(code)
+
+
+def test_security_and_typos():
+    code = "import pickle\ndef load(b):\n    return pickle.loads(b)\nx = 1  # retun\n"
+    messages = [i["message"] for i in lint_python(code)]
+    assert "pickle.loads() can run arbitrary code when fed untrusted data" in messages
+    assert "Probable typo" in messages
+
+
+def test_syntax_error():
+    assert lint_python("def f(:\n")[0]["message"].startswith("Syntax: ")
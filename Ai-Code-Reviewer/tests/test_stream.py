@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+import ai_reviwer
+import fake_llm
+from ai.cache import ReviewCache
+from ai.llm import LLMClient
+from ai.stream import ReviewParser, parse_reply, sse
+
+REPLY = json.dumps({"score": 6, "summary": "ok", "issues": [{"line": 1, "message": "a"}, {"line": 3, "message": "b"}],
+                    "suggestions": ["x", "y"]})
+
+
+def test_events_do_not_depend_on_how_the_reply_is_cut():
+    whole = ReviewParser().feed("```json\n" + REPLY + "\n```")
+    for size in (1, 2, 7):
+        parser = ReviewParser()
+        events = [e for i in range(0, len(REPLY), size) for e in parser.feed(REPLY[i:i + size])]
+        assert events == whole and parser.closed
+    assert ("item", "issues", {"line": 3, "message": "b"}) in whole and ("field", "score", 6) in whole
+
+
+@pytest.mark.parametrize("cut, issues, suggestions", [('"issues"', 0, 0), ('{"line": 3', 1, 0), ('"y"', 2, 1)])
+def test_truncated_reply_keeps_what_was_complete(cut, issues, suggestions):
+    parser = ReviewParser()
+    parser.feed(REPLY[:REPLY.index(cut)])
+    review = parser.result()
+    assert not parser.closed and review["score"] == 6
+    assert review["issues"] == json.loads(REPLY)["issues"][:issues]
+    assert review["suggestions"] == ["x", "y"][:suggestions]
+
+
+def test_no_json_at_all():
+    with pytest.raises(ValueError):
+        parse_reply("Sorry, I cannot review this.")
+    assert parse_reply('{"summary": "x", "issues": null}')["issues"] == []
+
+
+def test_sse_frame():
+    assert sse("issue", {"line": 1}) == 'event: issue\ndata: {"line": 1}\n\n'
+
+
+@pytest.fixture(params=['"issues"', '{"line": 3'])
+def reviewer(request, monkeypatch, tmp_path):
+    """ai_reviwer against a stand-in LLM whose reply stops before, or half way through, the issues."""
+    server = fake_llm.serve(replies=[{"match": "", "reply": REPLY[:REPLY.index(request.param)]}])
+    monkeypatch.setattr(ai_reviwer, "LLM", LLMClient(ai_reviwer.MODEL, "fake", base_url=server.url + "/v1",
+                                                     rpm=1e9, tpm=1e12))
+    monkeypatch.setattr(ai_reviwer, "CACHE", ReviewCache(str(tmp_path / "cache.sqlite3")))
+    yield ai_reviwer.AIReviewer()
+    server.shutdown()
+
+
+def test_truncated_sse_reply_is_shown_not_cached(reviewer):
+    code = "import os\nx = 1\n"
+    review = reviewer.review_code(code)
+    assert review["partial"] and review["score"] == 6
+    assert "'os' imported but unused" in [i["message"] for i in review["issues"]]
+    assert review["cache"]["status"] == "miss"
+    assert reviewer.review_code(code)["cache"]["status"] == "miss"  # a partial answer is never stored
+    events = list(reviewer.review_stream(code))
+    assert events[0][0] == "lint" and ("score", 6) in events and events[-1][1]["partial"]
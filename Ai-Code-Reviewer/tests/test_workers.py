@@ -0,0 +1,59 @@
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from ai import workers
+
+
+def test_nothing_starts_at_import():
+    import ai_reviwer
+    for pool in ai_reviwer.CHECKERS.values():
+        assert not getattr(pool, "workers", [])
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node not installed")
+def test_pool_starts_on_first_check():
+    pool = workers.checkers(size=1)["javascript"]
+    assert not pool.workers
+    bad = "let x = ;"
+    assert pool.check(bad, 5)[0]["message"].startswith("SyntaxError")  # one-shot while the worker starts
+    assert len(pool.workers) == 1
+    end = time.monotonic() + 10
+    while pool.stats()["warm"] == 0 and time.monotonic() < end:
+        assert pool.check(bad, 5)[0]["line"] == 1
+        time.sleep(0.05)
+    assert pool.stats()["warm"] >= 1 and pool.check("let x = 1;", 5) == []
+    pool.close()
+
+
+def test_java_needs_a_compiler(monkeypatch):
+    monkeypatch.setattr(workers, "_java", {})
+    monkeypatch.setattr(workers.shutil, "which", lambda tool: None if tool == "javac" else "/usr/bin/" + tool)
+    assert workers._java_argv() is None
+    pool = workers.WorkerPool("javac", workers._java_argv, lambda code, timeout: [{"line": 1}], 1)
+    assert pool.check("class A {}", 1) == [] and not pool.workers
+
+
+def test_java_checks_run_cold_while_javacheck_compiles(monkeypatch):
+    built = threading.Event()
+
+    def javac(argv, **kwargs):  # a slow javac that leaves JavaCheck.class behind
+        built.wait(5)
+        classes = argv[argv.index("-d") + 1]
+        open(os.path.join(classes, "JavaCheck.class"), "w").close()
+
+    monkeypatch.setattr(workers, "_java", {})
+    monkeypatch.setattr(workers.shutil, "which", lambda tool: "/usr/bin/" + tool)
+    monkeypatch.setattr(workers.subprocess, "run", javac)
+    pool = workers.WorkerPool("javac", workers._java_argv, lambda code, timeout: [{"line": 1}], 1)
+    start = time.monotonic()
+    assert pool.check("class A {}", 1) == [{"line": 1}] and not pool.workers
+    assert time.monotonic() - start < 1 and pool.stats()["cold"] == 1
+    built.set()
+    end = time.monotonic() + 5
+    while workers._java_argv() == [] and time.monotonic() < end:
+        time.sleep(0.01)
+    assert workers._java_argv()[:2] == ["java", "-cp"]
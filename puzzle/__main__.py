@@ -0,0 +1,150 @@
+# __main__.py  –  headless command line: python -m puzzle {solve,batch,bench,render}
+import argparse
+import json
+import random
+import sys
+
+from puzzle.batch import parse_board, read_boards, solve_batch, solve_record
+from puzzle.pdb import PDB_DIR, load_partition, parse_partition
+from puzzle.solver import Solver
+
+METHODS = ["astar", "idastar", "bidirectional", "anytime", "sma", "hda", "table"]
+
+
+def make_solver(args):
+    solver = Solver(args.n)
+    if args.partition:
+        solver.heuristic = load_partition(solver.board, parse_partition(args.partition), args.pdb_dir)
+    return solver
+
+
+def method_options(args, method):
+    options = {"method": method}
+    if method == "anytime" and args.budget_ms:
+        options["budget_ms"] = args.budget_ms
+    if method == "sma" and args.memory_mb:
+        options["budget_bytes"] = int(args.memory_mb * (1 << 20))
+    return options
+
+
+def cmd_solve(args):
+    solver = make_solver(args)
+    rng = random.Random(args.seed)
+    board = parse_board(args.board) if args.board else solver.board.scramble(args.scramble, rng)
+    print(json.dumps(solve_record(solver, 0, board, method_options(args, args.method))))
+
+
+def cmd_batch(args):
+    partition = parse_partition(args.partition) if args.partition else None
+    options = method_options(args, args.method)
+    options.pop("method")
+    solved = solve_batch(read_boards(args.boards), args.out, args.n, args.method, args.workers,
+                         args.chunksize, not args.fresh, partition, args.pdb_dir, **options)
+    print(f"{solved} boards solved -> {args.out}")
+
+
+def cmd_bench(args):
+    from puzzle import bench
+    partition = parse_partition(args.partition) if args.partition else None
+    heuristics = args.heuristics.split(",")
+    if "pdb" in heuristics and not partition:
+        raise SystemExit("--heuristics pdb needs --partition")
+    methods = args.methods.split(",")
+    options = {m: method_options(args, m) for m in methods}
+    for o in options.values():
+        o.pop("method")
+    configs = bench.configs(methods, heuristics, args.open_lists.split(","), options)
+    report = bench.benchmark(configs, args.n, [int(d) for d in args.depths.split(",")], args.count,
+                             0 if args.seed is None else args.seed, partition, args.pdb_dir,
+                             not args.in_process)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    for r in report["results"]:
+        print(f"{r['method']:>13} {r['heuristic']:>9} {r['open_list']:>8}  solved {r['solved']}/{r['boards']}"
+              f"  expanded {r['expanded']:>9}  {r['seconds']:8.3f}s  {r['nodes_per_sec'] or 0:>8} n/s"
+              f"  peak RSS {r['peak_rss_kb']} KiB", file=sys.stderr)
+    if args.baseline:
+        problems = bench.compare(report, bench.load(args.baseline), args.tolerance)
+        for p in problems:
+            print("REGRESSION", p, file=sys.stderr)
+        if problems:
+            raise SystemExit(1)
+
+
+def replay(start, tiles):
+    """Boards visited when sliding `tiles` into the blank one after another."""
+    path = [list(start)]
+    for t in tiles:
+        b = path[-1][:]
+        z, i = b.index(0), b.index(t)
+        b[z], b[i] = t, 0
+        path.append(b)
+    return path
+
+
+def cmd_render(args):
+    from puzzle.viz import export_paths  # pulls in matplotlib, Agg canvas only
+    with open(args.results) as f:
+        recs = [json.loads(line) for line in f if line.strip()]
+    paths = [(r["id"], replay(r["start"], r["tiles"])) for r in recs if r.get("tiles") is not None]
+    files = export_paths(paths[:args.limit] if args.limit else paths, args.out, args.format, args.fps)
+    print(f"{len(files)} videos -> {args.out}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m puzzle", description="Sliding puzzle solver")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--n", type=int, default=3, help="board width")
+    common.add_argument("--partition", default=None, help="pattern-database tile groups, e.g. 1,2,3,4/5,6,7,8")
+    common.add_argument("--pdb-dir", default=PDB_DIR)
+    common.add_argument("--budget-ms", type=float, default=None, help="time budget for the anytime method")
+    common.add_argument("--memory-mb", type=float, default=None, help="node memory budget for the sma method")
+    common.add_argument("--seed", type=int, default=None)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("solve", parents=[common], help="solve one board and print a JSON line")
+    p.add_argument("board", nargs="?", help="tiles, e.g. '1 2 3 4 5 6 7 0 8'; omit to scramble")
+    p.add_argument("--scramble", type=int, default=30, help="random slides when no board is given")
+    p.add_argument("--method", default="astar", choices=METHODS)
+    p.set_defaults(func=cmd_solve)
+
+    p = sub.add_parser("batch", parents=[common], help="solve a file of boards into JSONL")
+    p.add_argument("boards", help="one board per line")
+    p.add_argument("out", help="JSONL output, appended to unless --fresh")
+    p.add_argument("--method", default="astar", choices=METHODS)
+    p.add_argument("--workers", type=int, default=None)
+    p.add_argument("--chunksize", type=int, default=16)
+    p.add_argument("--fresh", action="store_true", help="overwrite out instead of resuming")
+    p.set_defaults(func=cmd_batch)
+
+    p = sub.add_parser("bench", parents=[common],
+                       help="compare methods and heuristics on a seeded corpus; writes a JSON report")
+    p.add_argument("--methods", default="astar,idastar")
+    p.add_argument("--heuristics", default="manhattan", help="comma list of manhattan,pdb (pdb needs --partition)")
+    p.add_argument("--open-lists", default="bucket", help="comma list of open lists tried with astar")
+    p.add_argument("--depths", default="10,15,20,25,30", help="scramble lengths in the corpus")
+    p.add_argument("--count", type=int, default=10, help="boards per depth")
+    p.add_argument("--out", default=None, help="report file; printed to stdout if omitted")
+    p.add_argument("--baseline", default=None, help="earlier report; exit 1 on regressions against it")
+    p.add_argument("--tolerance", type=float, default=0.25, help="allowed growth of time and RSS")
+    p.add_argument("--in-process", action="store_true", help="skip the fresh process per configuration")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("render", help="render solutions from a batch JSONL file to videos, no display needed")
+    p.add_argument("results", help="JSONL written by the batch command")
+    p.add_argument("out", help="directory for the videos")
+    p.add_argument("--format", default="gif", choices=["gif", "mp4"])
+    p.add_argument("--fps", type=float, default=4)
+    p.add_argument("--limit", type=int, default=None, help="only the first N solutions")
+    p.set_defaults(func=cmd_render)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# anytime.py  –  weighted A* that keeps improving its answer until a deadline
+import heapq
+import time
+
+from puzzle.heuristics import Manhattan
+
+INF = float("inf")
+CLOCK_EVERY = 256  # expansions between deadline checks
+
+
+def anytime(board, start, budget_ms=None, weight=2.0, limit=None, heuristic=None, monitor=None):
+    """Anytime weighted A* (AWA*); returns (path, steps, expanded, bound).
+
+    Nodes are ordered by g + weight*h, so a first solution turns up quickly.
+    The search then keeps expanding, pruning anything whose g + h cannot beat
+    the incumbent.  It stops when the open list runs dry (the incumbent is then
+    optimal, bound 1.0), after budget_ms or after `limit` expansions.  bound is
+    incumbent cost / lowest g + h left open, so the true optimum is at least
+    len(path)-1 divided by it.
+    """
+    if not board.solvable(start):
+        return None, None, None, None
+    deadline = time.perf_counter() + budget_ms / 1000 if budget_ms else None
+    if heuristic is None:
+        heuristic = Manhattan(board)
+    s0, z0 = board.pack(start)
+    h0 = heuristic(s0)
+    goal, moves, mask, update = board.goal, board.moves, board.mask, heuristic.update
+    push, pop = heapq.heappush, heapq.heappop
+
+    open_set = [(weight * h0, 0, s0, z0, h0)]
+    gscore = {s0: 0}
+    parent = {s0: -1}
+    best, incumbent = (0, s0) if s0 == goal else (INF, None)
+    steps = 0; expanded = 0
+    if monitor:
+        monitor.start()
+    next_sample = monitor.every if monitor else -1
+
+    while open_set:
+        fw, g, s, z, h = pop(open_set)
+        steps += 1
+        if g > gscore[s] or g + h >= best:
+            continue
+        expanded += 1
+        if expanded == next_sample:
+            monitor.sample(len(open_set), len(gscore), expanded)
+            next_sample += monitor.every
+        if (limit and expanded > limit) or \
+                (deadline and expanded % CLOCK_EVERY == 0 and time.perf_counter() > deadline):
+            push(open_set, (fw, g, s, z, h))  # still open: it counts towards the bound
+            break
+
+        tg = g + 1
+        for nz, sn, sz in moves[z]:
+            t = (s >> sn) & mask
+            ns = s ^ (t << sn) ^ (t << sz)
+            if tg < gscore.get(ns, tg + 1):
+                nh = update(h, ns, t, nz, z)
+                if tg + nh >= best:
+                    continue
+                gscore[ns] = tg
+                parent[ns] = s
+                if ns == goal:
+                    best, incumbent = tg, ns
+                    continue
+                push(open_set, (tg + weight * nh, tg, ns, nz, nh))
+
+    if incumbent is None:
+        return None, steps, expanded, None
+    path = board.trace(parent, incumbent)
+    cost = len(path) - 1
+    lower = min((g + h for _fw, g, s, _z, h in open_set if g == gscore[s]), default=cost)
+    return path, steps, expanded, max(1.0, cost / lower) if lower else 1.0
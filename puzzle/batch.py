@@ -0,0 +1,124 @@
+# batch.py  –  solve many boards on a process pool, streaming JSONL results
+import json
+import os
+import time
+
+from puzzle.pdb import PDB_DIR, build_partition, load_partition
+from puzzle.solver import Solver
+
+_SOLVER = None   # one per worker process, built by _init
+_OPTIONS = {}
+
+
+# --- Input ---
+def parse_board(text):
+    """'[1,2,3,...]', '1 2 3 ...' or '1,2,3,...' -> list of ints."""
+    text = text.strip()
+    if text.startswith("["):
+        return json.loads(text)
+    return [int(v) for v in text.replace(",", " ").split()]
+
+
+def read_boards(path):
+    """Yield (id, board) per non-empty line; JSON objects may carry their own "id"."""
+    with open(path) as f:
+        for i, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                rec = json.loads(line)
+                yield rec.get("id", i), rec["start"]
+            else:
+                yield i, parse_board(line)
+
+
+def done_ids(out_path):
+    """Ids already written to out_path; a torn last line from a crash is cut off."""
+    ids = set()
+    if not os.path.exists(out_path):
+        return ids
+    with open(out_path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end != len(data):
+            f.truncate(end)
+    for line in data[:end].splitlines():
+        try:
+            ids.add(json.loads(line)["id"])
+        except (ValueError, KeyError):
+            pass
+    return ids
+
+
+# --- Workers ---
+def _init(n, partition, pdb_dir, options):
+    global _SOLVER, _OPTIONS
+    _SOLVER = Solver(n)
+    if partition:
+        # tables are built by the parent first; workers only map them
+        _SOLVER.heuristic = load_partition(_SOLVER.board, partition, pdb_dir, build_missing=False)
+    _OPTIONS = options
+
+
+def solve_record(solver, key, board, options):
+    """Solve one board and describe the outcome as a JSON-ready dict."""
+    t0 = time.perf_counter()
+    rec = {"id": key, "start": board, "moves": None, "tiles": None, "steps": None, "expanded": None}
+    if solver.board.solvable(board):
+        result = solver.solve(board, **options)
+        path, rec["steps"], rec["expanded"] = result[:3]
+        if len(result) > 3:
+            rec["bound"] = result[3]
+        if path:
+            rec["moves"] = len(path) - 1
+            rec["tiles"] = [a[b.index(0)] for a, b in zip(path, path[1:])]  # tile slid at each step
+    rec["seconds"] = round(time.perf_counter() - t0, 6)
+    return rec
+
+
+def _solve_one(item):
+    return solve_record(_SOLVER, item[0], item[1], _OPTIONS)
+
+
+# --- Driver ---
+def solve_batch(items, out_path, n=3, method="astar", workers=None, chunksize=16,
+                resume=True, partition=None, pdb_dir=PDB_DIR, **options):
+    """Solve (id, board) pairs from any iterable and append one JSON line per board.
+
+    Lines are written in completion order and flushed as they arrive.  With
+    resume, ids already in out_path are skipped, so a killed run picks up where
+    it stopped.  Extra keyword options go to the solver method (e.g. limit,
+    budget_ms).  Returns the number of boards solved in this call; unsolvable
+    boards and searches that hit their limit are written but not counted.
+    With method "hda" boards are solved one at a time, each on `workers`
+    processes of its own, since pool workers cannot start processes.
+    """
+    from multiprocessing import Pool  # keeps `python -m puzzle solve` start-up small
+    if partition:
+        build_partition(n, partition, pdb_dir)
+    skip = done_ids(out_path) if resume else set()
+    todo = ((key, board) for key, board in items if key not in skip)
+    options["method"] = method
+    with open(out_path, "a" if resume else "w") as out:
+        if method == "hda":
+            # HDA* starts its own processes, which daemonic pool workers may not do:
+            # boards are solved one after another here, each over `workers` processes
+            solver = Solver(n)
+            if partition:
+                solver.heuristic = load_partition(solver.board, partition, pdb_dir, build_missing=False)
+            options["workers"] = workers
+            return _write(out, (solve_record(solver, key, board, options) for key, board in todo))
+        with Pool(workers, initializer=_init, initargs=(n, partition, pdb_dir, options)) as pool:
+            return _write(out, pool.imap_unordered(_solve_one, todo, chunksize))
+
+
+def _write(out, records):
+    """Append and flush each record as it arrives; returns how many were solved."""
+    count = 0
+    for rec in records:
+        out.write(json.dumps(rec) + "\n")
+        out.flush()
+        count += rec["moves"] is not None
+    return count
+
@@ -0,0 +1,199 @@
+# bench.py  –  fixed-seed benchmark corpus and a JSON report for catching regressions
+import json
+import platform
+import random
+import time
+
+from puzzle.monitor import SearchMonitor, peak_rss_kb, rss_kb
+from puzzle.packed import PackedBoard
+from puzzle.pdb import PDB_DIR
+
+DEPTHS = (10, 15, 20, 25, 30)
+MONITORED = {"astar", "idastar", "bidirectional", "anytime", "sma"}  # methods that take monitor=
+SCHEMA = 1
+SLACK = {"seconds": 0.05, "peak_rss_kb": 1024}  # absolute noise allowed on top of the tolerance
+UNORDERED = {"hda"}  # methods whose expansion count depends on process scheduling
+
+
+# --- Corpus ---
+def corpus(n=3, depths=DEPTHS, per_depth=10, seed=0):
+    """[(depth, board)] from seeded random walks of `depth` slides; the same arguments give the same boards."""
+    board = PackedBoard(n)
+    rng = random.Random(seed)
+    boards = []
+    for d in depths:
+        for _ in range(per_depth):
+            # a walk that never undoes its last slide, so d tracks the real depth more closely
+            s, z, prev = board.goal, board.goal_blank, -1
+            for _ in range(d):
+                s, nz, _t = rng.choice([m for m in board.successors(s, z) if m[1] != prev])
+                prev, z = z, nz
+            boards.append((d, board.unpack(s)))
+    return boards
+
+
+# --- Running one configuration ---
+def make_heuristic(solver, name, partition, pdb_dir):
+    if name == "manhattan":
+        return solver.heuristic
+    if name == "pdb":
+        from puzzle.pdb import load_partition
+        if not partition:
+            raise ValueError("the pdb heuristic needs a partition")
+        return load_partition(solver.board, partition, pdb_dir)
+    raise ValueError(f"unknown heuristic: {name}")
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else None
+
+
+def run_config(config, boards, n=3, partition=None, pdb_dir=PDB_DIR, every=64):
+    """Solve every (depth, board) with one {method, heuristic, open_list, options} config."""
+    from puzzle.solver import Solver
+    solver = Solver(n, open_list=config["open_list"])
+    solver.heuristic = make_heuristic(solver, config["heuristic"], partition, pdb_dir)
+    method = config["method"]
+    options = dict(config.get("options") or {})
+    rss_start = rss_kb()
+    times, expanded, moves, by_depth = [], 0, 0, {}
+    solved = 0; steps = 0; peak_open = 0; peak_closed = 0
+    for depth, board in boards:
+        monitor = SearchMonitor(every) if method in MONITORED else None
+        if monitor:
+            options["monitor"] = monitor
+        t0 = time.perf_counter()
+        result = solver.solve(board, method, **options)
+        seconds = time.perf_counter() - t0
+        path, s, e = result[:3]
+        times.append(seconds)
+        if monitor:
+            monitor.finish(e)
+            peak_open = max(peak_open, monitor.peak_open)
+            peak_closed = max(peak_closed, monitor.peak_closed)
+        d = by_depth.setdefault(str(depth), {"boards": 0, "moves": 0, "expanded": 0, "seconds": 0.0})
+        d["boards"] += 1
+        d["seconds"] += seconds
+        if path:
+            solved += 1
+            moves += len(path) - 1
+            d["moves"] += len(path) - 1
+            steps += s or 0
+            expanded += e or 0
+            d["expanded"] += e or 0
+    total = sum(times)
+    for d in by_depth.values():
+        d["mean_moves"] = round(d.pop("moves") / d["boards"], 2)
+        d["mean_expanded"] = round(d.pop("expanded") / d["boards"], 1)
+        d["mean_ms"] = round(d.pop("seconds") * 1000 / d["boards"], 3)
+    return dict(config, **{
+        "boards": len(boards),
+        "solved": solved,
+        "moves": moves,
+        "steps": steps,
+        "expanded": expanded,
+        "seconds": round(total, 6),
+        "p50_ms": round(percentile(times, 0.5) * 1000, 3) if times else None,
+        "p95_ms": round(percentile(times, 0.95) * 1000, 3) if times else None,
+        "nodes_per_sec": round(expanded / total) if total else None,
+        "peak_open": peak_open,
+        "peak_closed": peak_closed,
+        "rss_start_kb": rss_start,
+        "peak_rss_kb": peak_rss_kb(),
+        "by_depth": by_depth,
+    })
+
+
+def _child(conn, args):
+    try:
+        conn.send(("ok", run_config(*args)))
+    except Exception as e:  # reported to the parent, which re-raises
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    conn.close()
+
+
+def run_isolated(config, boards, n=3, partition=None, pdb_dir=PDB_DIR, every=64):
+    """run_config in a fresh process, so peak RSS belongs to this configuration alone."""
+    import multiprocessing
+    parent, child = multiprocessing.Pipe(duplex=False)
+    proc = multiprocessing.Process(target=_child, args=(child, (config, boards, n, partition, pdb_dir, every)))
+    proc.start()
+    child.close()
+    status, result = parent.recv()
+    proc.join()
+    if status != "ok":
+        raise RuntimeError(f"benchmark of {config} failed: {result}")
+    return result
+
+
+# --- Report ---
+def configs(methods, heuristics, open_lists, options=None):
+    """Every method x heuristic x open list combination; open lists only matter for astar."""
+    out = []
+    for method in methods:
+        for heuristic in heuristics:
+            for open_list in (open_lists if method == "astar" else open_lists[:1]):
+                out.append({"method": method, "heuristic": heuristic, "open_list": open_list,
+                            "options": (options or {}).get(method, {})})
+    return out
+
+
+def benchmark(configs, n=3, depths=DEPTHS, per_depth=10, seed=0, partition=None, pdb_dir=PDB_DIR,
+              isolate=True, every=64):
+    """Run each config over the seeded corpus and return the JSON-ready report."""
+    if partition:
+        from puzzle.pdb import build_partition
+        build_partition(n, partition, pdb_dir)  # once here, not inside every child
+    boards = corpus(n, depths, per_depth, seed)
+    run = run_isolated if isolate else run_config
+    return {
+        "schema": SCHEMA,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "corpus": {"n": n, "depths": list(depths), "per_depth": per_depth, "seed": seed,
+                   "partition": [list(t) for t in partition] if partition else None},
+        "isolated": isolate,
+        "results": [run(c, boards, n, partition, pdb_dir, every) for c in configs],
+    }
+
+
+def key(result):
+    return result["method"], result["heuristic"], result["open_list"]
+
+
+def compare(report, baseline, tolerance=0.25):
+    """Regressions of report against baseline, one message each.
+
+    Solved count, total moves and expanded nodes are deterministic for a given
+    corpus and must not get worse at all; time and peak RSS may grow by up to
+    `tolerance` (a fraction) plus a small absolute SLACK before they count.
+    Runs with a time budget (budget_ms) stop wherever the clock does, so their
+    moves and expanded nodes are not compared, nor HDA*'s expanded nodes.
+    """
+    if report["corpus"] != baseline["corpus"]:
+        return ["corpus differs from the baseline; results are not comparable"]
+    old = {key(r): r for r in baseline["results"]}
+    problems = []
+    for r in report["results"]:
+        b = old.get(key(r))
+        if b is None:
+            continue
+        name = "/".join(key(r))
+        if r["solved"] < b["solved"]:
+            problems.append(f"{name}: solved {r['solved']} < {b['solved']}")
+        timed = bool((r.get("options") or {}).get("budget_ms"))
+        if r["moves"] > b["moves"] and r["solved"] == b["solved"] and not timed:
+            problems.append(f"{name}: total moves {r['moves']} > {b['moves']}")
+        if r["expanded"] > b["expanded"] and not timed and r["method"] not in UNORDERED:
+            problems.append(f"{name}: expanded {r['expanded']} > {b['expanded']}")
+        for field, slack in SLACK.items():
+            if r[field] > b[field] * (1 + tolerance) + slack:
+                problems.append(f"{name}: {field} {r[field]} > {b[field]} +{tolerance:.0%}")
+    return problems
+
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,69 @@
+# bidirectional.py  –  bidirectional A* meeting in the middle
+import heapq
+
+from puzzle.heuristics import Manhattan
+
+INF = float("inf")
+
+
+def bidirectional(board, start, limit=200000, heuristic=None, monitor=None):
+    """Alternating forward/backward A*; returns (path, steps, expanded) like astar.
+
+    The forward front uses the solver's heuristic towards the goal, the backward
+    front Manhattan distance towards start.  Every generated state is checked
+    against the opposite front, and the search stops once the best meeting cost
+    U is no larger than either front's lowest f, which keeps U optimal.
+    """
+    if not board.solvable(start):
+        return None, None, None
+    s0, z0 = board.pack(start)
+    fwd_h = heuristic or Manhattan(board)
+    bwd_h = Manhattan(board, target=start)
+    moves, mask = board.moves, board.mask
+
+    # per front: open heap, gscore, parent, heuristic
+    fronts = []
+    for root, zr, h in ((s0, z0, fwd_h), (board.goal, board.goal_blank, bwd_h)):
+        h0 = h(root)
+        fronts.append(([(h0, 0, root, zr, h0)], {root: 0}, {root: -1}, h))
+
+    best, meet = (0, s0) if s0 == board.goal else (INF, None)
+    steps = 0; expanded = 0
+    if monitor:
+        monitor.start()
+    next_sample = monitor.every if monitor else -1
+    while fronts[0][0] and fronts[1][0]:
+        if best <= max(fronts[0][0][0][0], fronts[1][0][0][0]):
+            break
+        side = 0 if len(fronts[0][0]) <= len(fronts[1][0]) else 1
+        open_set, gscore, parent, h_obj = fronts[side]
+        other_g = fronts[1 - side][1]
+        f, g, s, z, h = heapq.heappop(open_set)
+        if g > gscore[s]:
+            continue
+        steps += 1
+        expanded += 1
+        if expanded == next_sample:
+            monitor.sample(len(fronts[0][0]) + len(fronts[1][0]), len(fronts[0][1]) + len(fronts[1][1]), expanded)
+            next_sample += monitor.every
+        if steps > limit:
+            return None, None, None
+
+        tg = g + 1
+        update = h_obj.update
+        for nz, sn, sz in moves[z]:
+            t = (s >> sn) & mask
+            ns = s ^ (t << sn) ^ (t << sz)
+            if tg < gscore.get(ns, tg + 1):
+                gscore[ns] = tg
+                parent[ns] = s
+                nh = update(h, ns, t, nz, z)
+                heapq.heappush(open_set, (tg + nh, tg, ns, nz, nh))
+                if ns in other_g and tg + other_g[ns] < best:
+                    best, meet = tg + other_g[ns], ns
+
+    if meet is None:
+        return None, None, None
+    head = board.trace(fronts[0][2], meet)
+    tail = board.trace(fronts[1][2], meet)[::-1]
+    return head + tail[1:], steps, expanded
@@ -0,0 +1,50 @@
+# core.py  –  list-based puzzle API (formerly the top of Apuzzle.py); no plotting imports
+import random
+
+from puzzle.solver import Solver
+
+# --- Puzzle setup ---
+goal = [1,2,3,4,5,6,7,8,0]
+N = 3
+
+def idx_to_rc(i): return divmod(i, N)
+def swap(arr,i,j): 
+    a = arr.copy()
+    a[i],a[j] = a[j],a[i]
+    return a
+
+def manhattan(state):
+    d=0
+    for i,v in enumerate(state):
+        if v==0: continue
+        r1,c1 = idx_to_rc(i)
+        r2,c2 = idx_to_rc(v-1)
+        d += abs(r1-r2)+abs(c1-c2)
+    return d
+
+def neighbors(state):
+    z = state.index(0)
+    r,c = idx_to_rc(z)
+    moves=[]
+    for dr,dc in [(1,0),(-1,0),(0,1),(0,-1)]:
+        nr,nc=r+dr,c+dc
+        if 0<=nr<N and 0<=nc<N:
+            ni = nr*N+nc
+            moves.append(swap(state,z,ni))
+    return moves
+
+def serialize(s): return tuple(s)
+
+# --- A* implementation ---
+SOLVER = Solver(N)
+
+def astar(start, limit=200000):
+    # states are searched as packed ints, see puzzle/packed.py
+    return SOLVER.astar(start,limit)
+
+# --- Scramble ---
+def scramble(moves=20):
+    s=goal[:]
+    for _ in range(moves):
+        s=random.choice(neighbors(s))
+    return s
@@ -0,0 +1,195 @@
+# hda.py  –  hash-distributed A* (HDA*) over worker processes
+import heapq
+import multiprocessing
+import os
+import time
+from queue import Empty
+
+from puzzle.heuristics import Manhattan
+from puzzle.ida import HASH_MUL
+
+INF = float("inf")
+EVERY = 128        # expansions between inbox polls; outgoing batches are flushed as often
+IDLE_WAIT = 0.01   # seconds an idle worker blocks on its inbox
+
+
+def owner(s, nworkers):
+    return ((s * HASH_MUL) >> 32) % nworkers
+
+
+# --- Worker ---
+def _worker(wid, nworkers, board, heuristic, root, inboxes, report, limit):
+    """Owns every state that hashes to wid.
+
+    Inbox messages: ("nodes", [(s, z, g, h, parent), ...]), ("bound", U),
+    ("probe", wave), ("parent", s) and ("stop",).  Successors owned elsewhere
+    are buffered per destination and sent once per polling round.
+    """
+    inbox = inboxes[wid]
+    moves, mask, goal, update = board.moves, board.mask, board.goal, heuristic.update
+    push, pop = heapq.heappush, heapq.heappop
+    open_set = []
+    gscore = {}
+    parent = {}
+    best = INF
+    sent = 0; recv = 0; steps = 0; expanded = 0
+    out = [[] for _ in range(nworkers)]
+
+    def add(s, z, g, h, p):
+        if g + h < best and g < gscore.get(s, g + 1):
+            gscore[s] = g
+            parent[s] = p
+            push(open_set, (g + h, -g, s, z, h))  # deepest first on equal f
+
+    if root is not None:
+        add(*root)
+
+    while True:
+        idle = not open_set or open_set[0][0] >= best
+        # drain the inbox, blocking briefly only when there is nothing to expand
+        while True:
+            try:
+                msg = inbox.get(timeout=IDLE_WAIT) if idle else inbox.get_nowait()
+            except Empty:
+                break
+            kind = msg[0]
+            if kind == "nodes":
+                recv += len(msg[1])
+                for node in msg[1]:
+                    add(*node)
+            elif kind == "bound":
+                best = min(best, msg[1])
+            elif kind == "probe":
+                idle = not open_set or open_set[0][0] >= best
+                report.put(("ack", wid, msg[1], idle, sent, recv))
+            elif kind == "parent":
+                report.put(("parent", msg[1], parent[msg[1]]))
+            elif kind == "stop":
+                report.put(("stats", wid, steps, expanded))
+                return
+            idle = False  # something changed; look at the open list again
+
+        for _ in range(EVERY):
+            if not open_set:
+                break
+            f, g, s, z, h = pop(open_set)
+            g = -g
+            if g > gscore[s]:
+                continue
+            if f >= best:
+                push(open_set, (f, -g, s, z, h))
+                break
+            steps += 1
+            if s == goal:
+                best = g
+                report.put(("goal", g, s))
+                continue
+            expanded += 1
+            if limit and expanded > limit:
+                report.put(("abort", wid))
+                limit = 0  # report once, then keep serving requests until stopped
+                open_set.clear()
+                break
+            tg = g + 1
+            for nz, sn, sz in moves[z]:
+                t = (s >> sn) & mask
+                ns = s ^ (t << sn) ^ (t << sz)
+                nh = update(h, ns, t, nz, z)
+                dst = owner(ns, nworkers)
+                if dst == wid:
+                    add(ns, nz, tg, nh, s)
+                elif tg + nh < best:
+                    out[dst].append((ns, nz, tg, nh, s))
+
+        for dst, buf in enumerate(out):
+            if buf:
+                inboxes[dst].put(("nodes", buf))
+                sent += len(buf)
+                out[dst] = []
+
+
+# --- Coordinator ---
+def hda(board, start, workers=None, heuristic=None, limit=None):
+    """HDA* on `workers` processes; returns (path, steps, expanded) like astar.
+
+    Termination uses Mattern's four-counter method: the coordinator probes all
+    workers in waves and stops once two consecutive waves find every worker
+    idle (open list empty or no f below the incumbent) with identical, balanced
+    totals of nodes sent and received, so nothing is left in flight.  `limit`
+    caps expansions, split evenly between the workers (at least one each).
+    """
+    if not board.solvable(start):
+        return None, None, None
+    nworkers = workers or os.cpu_count() or 1
+    if heuristic is None:
+        heuristic = Manhattan(board)
+    s0, z0 = board.pack(start)
+    root = (s0, z0, 0, heuristic(s0), -1)
+
+    inboxes = [multiprocessing.Queue() for _ in range(nworkers)]
+    report = multiprocessing.Queue()
+    procs = [multiprocessing.Process(
+        target=_worker, daemon=True,
+        args=(w, nworkers, board, heuristic, root if w == owner(s0, nworkers) else None,
+              inboxes, report, max(1, limit // nworkers) if limit else None))
+        for w in range(nworkers)]
+    for p in procs:
+        p.start()
+
+    best, found = INF, None
+    wave, acks, last, aborted = 0, [], None, False
+
+    def broadcast(msg):
+        for q in inboxes:
+            q.put(msg)
+
+    broadcast(("probe", wave))
+    while True:
+        msg = report.get()
+        kind = msg[0]
+        if kind == "goal" and msg[1] < best:
+            best, found = msg[1], msg[2]
+            broadcast(("bound", best))
+        elif kind == "abort":
+            aborted = True
+            break
+        elif kind == "ack" and msg[2] == wave:
+            acks.append(msg)
+            if len(acks) < nworkers:
+                continue
+            quiet = all(a[3] for a in acks)
+            counts = (sum(a[4] for a in acks), sum(a[5] for a in acks))
+            if quiet and counts[0] == counts[1] and counts == last:
+                break
+            last = counts if quiet and counts[0] == counts[1] else None
+            if not quiet:
+                time.sleep(IDLE_WAIT)  # no point probing a busy pool back to back
+            wave += 1
+            acks = []
+            broadcast(("probe", wave))
+
+    path = None
+    if found is not None and not aborted:
+        path = [found]
+        while path[-1] != s0:
+            inboxes[owner(path[-1], nworkers)].put(("parent", path[-1]))
+            msg = report.get()
+            while msg[0] != "parent":
+                msg = report.get()
+            path.append(msg[2])
+        path = [board.unpack(s) for s in reversed(path)]
+
+    broadcast(("stop",))
+    steps = 0; expanded = 0
+    stopped = 0
+    while stopped < nworkers:
+        msg = report.get()
+        if msg[0] == "stats":
+            stopped += 1
+            steps += msg[2]
+            expanded += msg[3]
+    for p in procs:
+        p.join()
+    if path is None:
+        return None, None, None
+    return path, steps, expanded
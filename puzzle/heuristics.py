@@ -0,0 +1,31 @@
+# heuristics.py  –  admissible estimates for packed boards
+#
+# A heuristic is called once on the root state and then updated per slide with
+# update(h, ns, tile, src, dst): `tile` moved from cell `src` to cell `dst` and
+# `ns` is the resulting packed state.  Searches never call it any other way.
+
+
+class Manhattan:
+    """Sum of tile distances to their target cells; a slide only changes one term.
+
+    target defaults to the standard goal; backward searches pass their start board.
+    """
+
+    def __init__(self, board, target=None):
+        self.board = board
+        if target is None:
+            self.dist = board.dist
+        else:
+            n = board.n
+            self.dist = [[0] * board.size for _ in range(board.size)]
+            for cell, t in enumerate(target):
+                if t:
+                    self.dist[t] = [abs(p // n - cell // n) + abs(p % n - cell % n) for p in range(board.size)]
+
+    def __call__(self, s):
+        bits, mask, dist = self.board.bits, self.board.mask, self.dist
+        return sum(dist[(s >> (i * bits)) & mask][i] for i in range(self.board.size))
+
+    def update(self, h, ns, tile, src, dst):
+        d = self.dist[tile]
+        return h + d[dst] - d[src]
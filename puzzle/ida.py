@@ -0,0 +1,106 @@
+# ida.py  –  IDA* with a bounded transposition table
+from array import array
+from math import factorial
+
+from puzzle.heuristics import Manhattan
+
+HASH_MUL = 0x9E3779B97F4A7C15  # Fibonacci hashing; packed states have poor low bits
+INF = float("inf")
+
+
+class TranspositionTable:
+    """Direct-mapped slots of (state, iteration stamp, g), reusable across searches.
+
+    Every IDA* iteration takes a fresh stamp, so slots written by earlier
+    iterations or earlier searches simply stop matching; nothing is cleared.
+    """
+
+    def __init__(self, bits):
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+        self.keys = [-1] * (1 << bits)
+        self.vals = array("Q", bytes(8 << bits))  # stamp << 16 | g
+        self.stamp = 0
+
+
+def bits_for(board, most=20):
+    """Slots for a board: enough for every reachable state, at most 2**most."""
+    return min(most, (factorial(board.size) // 2 - 1).bit_length())
+
+
+def idastar(board, start, limit=None, heuristic=None, table_bits=20, monitor=None, table=None):
+    """Iterative-deepening A*; memory is the DFS path plus the transposition table.
+
+    The table remembers (state, g) of visits this iteration and cuts a branch
+    that reaches a state already searched with no larger g.  Slots are direct
+    mapped and always replaced, so collisions only cost re-expansions.  Pass a
+    TranspositionTable to reuse one across calls; otherwise one of
+    2**bits_for(board, table_bits) slots is made.  `limit` caps expanded
+    nodes; returns (path, steps, expanded) like astar.  A monitor sees the DFS
+    depth as its open size and no closed set.
+    """
+    if heuristic is None:
+        heuristic = Manhattan(board)
+    if not board.solvable(start):
+        return None, None, None
+    if table is None:
+        table = TranspositionTable(bits_for(board, table_bits))
+    s0, z0 = board.pack(start)
+    goal, moves, mask, update = board.goal, board.moves, board.mask, heuristic.update
+    keys, vals, smask = table.keys, table.vals, table.mask
+    steps = 0; expanded = 0
+    if monitor:
+        monitor.start()
+    next_sample = monitor.every if monitor else -1
+
+    h0 = bound = heuristic(s0)
+    while True:
+        table.stamp += 1
+        stamp = table.stamp
+        tag = stamp << 16
+        nxt = INF                       # smallest f cut off by this bound
+        frames = []                     # [s, z, prev, g, h, next move] along the DFS path
+        node = (s0, z0, -1, 0, h0)      # reached, not yet looked at
+        while True:
+            if node is not None:
+                s, z, prev, g, h = node
+                node = None
+                steps += 1
+                f = g + h
+                if f > bound:
+                    if f < nxt:
+                        nxt = f
+                elif s == goal:
+                    return [board.unpack(fr[0]) for fr in frames] + [board.unpack(s)], steps, expanded
+                else:
+                    i = ((s * HASH_MUL) >> 32) & smask
+                    v = vals[i]
+                    # a state searched this iteration from no larger g already reported its cut-offs
+                    if keys[i] != s or v >> 16 != stamp or v & 0xFFFF > g:
+                        keys[i] = s
+                        vals[i] = tag | g
+                        expanded += 1
+                        frames.append([s, z, prev, g, h, 0])
+                        if expanded == next_sample:
+                            monitor.sample(len(frames), 0, expanded)
+                            next_sample += monitor.every
+                        if limit and expanded > limit:
+                            return None, None, None
+            if not frames:
+                break
+            top = frames[-1]
+            s, z, prev, g, h, k = top
+            opts = moves[z]
+            if k < len(opts) and opts[k][0] == prev:
+                k += 1  # never slide straight back
+            if k >= len(opts):
+                frames.pop()
+                continue
+            nz, sn, sz = opts[k]
+            top[5] = k + 1
+            t = (s >> sn) & mask
+            ns = s ^ (t << sn) ^ (t << sz)
+            node = (ns, nz, z, g + 1, update(h, ns, t, nz, z))
+        if nxt == INF:
+            return None, None, None
+        bound = nxt
@@ -0,0 +1,99 @@
+# incremental.py  –  D* Lite style replanning when the start board moves
+import heapq
+
+from puzzle.heuristics import Manhattan
+
+INF = float("inf")
+
+
+class IncrementalPlanner:
+    """Backward search from the goal whose tree survives between calls.
+
+    g/rhs values are kept from one plan() to the next; when the start board
+    changes (the user nudged some tiles) the keys are shifted by km, the
+    Manhattan distance between the old and new start, and the search simply
+    resumes until the new start is consistent.  Slides never change cost, so
+    vertices are only ever over-consistent and the D* Lite repair branch for
+    raised edge costs is not needed.
+    """
+
+    def __init__(self, board):
+        self.board = board
+        self.goal = board.goal
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.blank = {self.goal: board.goal_blank}
+        self.queue = []
+        self.queued = {}      # state -> key it is queued under (lazy deletion)
+        self.km = 0
+        self.start = None
+        self.h = None
+
+    def key(self, s, hs):
+        m = min(self.g.get(s, INF), self.rhs.get(s, INF))
+        return m + hs + self.km, m
+
+    def push(self, s, k):
+        self.queued[s] = k
+        heapq.heappush(self.queue, (k[0], k[1], s))
+
+    def plan(self, start):
+        """Shortest path from start to the goal; returns (path, steps, expanded) like astar."""
+        board = self.board
+        if not board.solvable(start):
+            return None, None, None
+        s_start, z_start = board.pack(start)
+        if self.start is None:
+            self.h = Manhattan(board, target=start)
+            self.push(self.goal, self.key(self.goal, self.h(self.goal)))
+        elif s_start != self.start:
+            self.km += Manhattan(board, target=board.unpack(self.start))(s_start)
+            self.h = Manhattan(board, target=start)
+        self.start = s_start
+        self.blank[s_start] = z_start
+
+        g, rhs, blank, queue, queued = self.g, self.rhs, self.blank, self.queue, self.queued
+        moves, mask, h = board.moves, board.mask, self.h
+        steps = 0; expanded = 0
+        while queue:
+            k1, k2, u = queue[0]
+            if queued.get(u) != (k1, k2):
+                heapq.heappop(queue)
+                continue
+            if (k1, k2) >= self.key(s_start, 0) and rhs.get(s_start, INF) == g.get(s_start, INF):
+                break
+            heapq.heappop(queue)
+            del queued[u]
+            steps += 1
+            hu = h(u)
+            k_new = self.key(u, hu)
+            if (k1, k2) < k_new:
+                self.push(u, k_new)  # queued under a stale km
+                continue
+            expanded += 1
+            g[u] = rhs[u]
+            z = blank[u]
+            for nz, sn, sz in moves[z]:
+                t = (u >> sn) & mask
+                p = u ^ (t << sn) ^ (t << sz)
+                if g[u] + 1 < rhs.get(p, INF):
+                    rhs[p] = g[u] + 1
+                    blank[p] = nz
+                    self.push(p, self.key(p, h.update(hu, p, t, nz, z)))
+
+        if g.get(s_start, INF) == INF:
+            return None, steps, expanded
+        # walk downhill in g from the start
+        path = [s_start]
+        s, z = s_start, z_start
+        while s != self.goal:
+            nxt = None
+            for nz, sn, sz in moves[z]:
+                t = (s >> sn) & mask
+                p = s ^ (t << sn) ^ (t << sz)
+                if g.get(p, INF) == g[s] - 1:
+                    nxt = p, nz
+                    break
+            s, z = nxt
+            path.append(s)
+        return [board.unpack(s) for s in path], steps, expanded
@@ -0,0 +1,92 @@
+# monitor.py  –  optional sampling hooks for the searches
+import os
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # not on Windows
+    resource = None
+
+PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def rss_kb():
+    """Current resident set size in KiB; falls back to the peak where /proc is missing."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * PAGE // 1024
+    except (OSError, ValueError, IndexError):
+        return peak_rss_kb()
+
+
+def peak_rss_kb():
+    """Highest resident set size of this process so far in KiB (0 if unknown)."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS
+
+
+class SearchMonitor:
+    """Samples a running search every `every` expansions.
+
+    Searches that take monitor= call start() once and then
+    sample(open_size, closed_size, expanded) as they go, closed_size being
+    the number of states they store (a g-score table, SMA*'s node slots);
+    whoever ran the search calls finish(expanded) afterwards.  Peaks of the
+    open list, the closed set and RSS are kept; with keep=True every sample
+    is also stored in .samples, and callback(sample) sees each one as it is
+    taken.  Searches without an open list (IDA*) report their DFS depth as
+    the open size and no closed set.
+    """
+
+    def __init__(self, every=4096, keep=False, callback=None):
+        self.every = every
+        self.keep = keep
+        self.callback = callback
+        self.start()
+
+    def start(self):
+        self.samples = []
+        self.peak_open = 0
+        self.peak_closed = 0
+        self.rss_start = self.peak_rss = rss_kb()
+        self.expanded = 0
+        self.seconds = 0.0
+        self.t0 = time.perf_counter()
+
+    def sample(self, open_size, closed_size, expanded):
+        self.seconds = time.perf_counter() - self.t0
+        self.expanded = expanded
+        if open_size > self.peak_open:
+            self.peak_open = open_size
+        if closed_size > self.peak_closed:
+            self.peak_closed = closed_size
+        rss = rss_kb()
+        if rss > self.peak_rss:
+            self.peak_rss = rss
+        if self.keep or self.callback:
+            point = {"seconds": round(self.seconds, 6), "expanded": expanded, "open": open_size,
+                     "closed": closed_size, "nodes_per_sec": round(self.rate()), "rss_kb": rss}
+            if self.keep:
+                self.samples.append(point)
+            if self.callback:
+                self.callback(point)
+
+    def finish(self, expanded):
+        self.seconds = time.perf_counter() - self.t0
+        self.expanded = expanded or 0
+        rss = rss_kb()
+        if rss > self.peak_rss:
+            self.peak_rss = rss
+        return self.summary()
+
+    def rate(self):
+        return self.expanded / self.seconds if self.seconds else 0.0
+
+    def summary(self):
+        return {"seconds": round(self.seconds, 6), "expanded": self.expanded,
+                "nodes_per_sec": round(self.rate()), "peak_open": self.peak_open,
+                "peak_closed": self.peak_closed, "peak_rss_kb": self.peak_rss,
+                "rss_growth_kb": self.peak_rss - self.rss_start}
@@ -0,0 +1,91 @@
+# openlist.py  –  interchangeable open lists for A*
+#
+# push(f, g, item) / pop() -> (f, g, item) / len().  Stale entries are never
+# removed eagerly: the search pushes a fresh copy when it finds a cheaper g and
+# drops the old one when it is popped (lazy deletion).
+import heapq
+
+
+class HeapOpenList:
+    """Binary heap; ties on f go to the smaller g, then to the smaller item."""
+
+    def __init__(self):
+        self.heap = []
+
+    def push(self, f, g, item):
+        heapq.heappush(self.heap, (f, g, item))
+
+    def pop(self):
+        return heapq.heappop(self.heap)
+
+    def __len__(self):
+        return len(self.heap)
+
+
+class BucketOpenList:
+    """Array of buckets indexed by f; O(1) push and amortized O(1) pop for small integer f.
+
+    tie="lifo" pops the newest entry of the lowest bucket, tie="g" the entry with
+    the largest g (deepest first, which reaches the goal with fewer expansions).
+    """
+
+    def __init__(self, tie="lifo"):
+        if tie not in ("lifo", "g"):
+            raise ValueError(f"unknown tie-breaking rule: {tie}")
+        self.by_g = tie == "g"
+        self.buckets = []
+        self.top = []      # per f: highest g sub-bucket that may be non-empty (tie="g")
+        self.fmin = 0
+        self.count = 0
+
+    def push(self, f, g, item):
+        buckets = self.buckets
+        while f >= len(buckets):
+            buckets.append([])
+            self.top.append(-1)
+        if self.by_g:
+            sub = buckets[f]
+            while g >= len(sub):
+                sub.append([])
+            sub[g].append(item)
+            if g > self.top[f]:
+                self.top[f] = g
+        else:
+            buckets[f].append((g, item))
+        if f < self.fmin:
+            self.fmin = f  # only happens with inconsistent heuristics
+        self.count += 1
+
+    def pop(self):
+        if not self.count:
+            raise IndexError("pop from an empty open list")
+        self.count -= 1
+        buckets = self.buckets
+        f = self.fmin
+        if self.by_g:
+            while self.top[f] < 0:
+                f += 1
+            sub, g = buckets[f], self.top[f]
+            item = sub[g].pop()
+            top = g
+            # the pointer ends at -1 once the whole bucket is empty
+            while top >= 0 and not sub[top]:
+                top -= 1
+            self.top[f] = top
+            self.fmin = f
+            return f, g, item
+        while not buckets[f]:
+            f += 1
+        self.fmin = f
+        g, item = buckets[f].pop()
+        return f, g, item
+
+    def __len__(self):
+        return self.count
+
+
+OPEN_LISTS = {
+    "heap": HeapOpenList,
+    "bucket": BucketOpenList,
+    "bucket-g": lambda: BucketOpenList(tie="g"),
+}
@@ -0,0 +1,140 @@
+# packed.py  –  bit-packed board states for the sliding puzzle
+import random
+
+from puzzle.heuristics import Manhattan
+from puzzle.openlist import HeapOpenList
+
+BITS = 4  # one nibble per cell -> 3x3 fits in 36 bits, 4x4 in 64
+
+
+# --- Board geometry ---
+class PackedBoard:
+    """Lookup tables for an n x n board stored as one int (tile of cell i at bits i*bits)."""
+
+    def __init__(self, n=3):
+        self.n = n
+        self.size = n * n
+        # a nibble per cell up to the 15-puzzle, wider cells for 24-puzzle and up
+        self.bits = bits = max(BITS, (self.size - 1).bit_length())
+        self.mask = (1 << bits) - 1
+        # moves[z] -> ((nz, shift of nz, shift of z), ...) for every cell the blank can slide to
+        self.moves = []
+        for z in range(self.size):
+            r, c = divmod(z, n)
+            opts = []
+            for dr, dc in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < n and 0 <= nc < n:
+                    nz = nr * n + nc
+                    opts.append((nz, nz * bits, z * bits))
+            self.moves.append(tuple(opts))
+        # dist[t][p] -> Manhattan distance of tile t sitting on cell p from its goal cell t-1
+        self.dist = [[0] * self.size]
+        for t in range(1, self.size):
+            gr, gc = divmod(t - 1, n)
+            self.dist.append([abs(p // n - gr) + abs(p % n - gc) for p in range(self.size)])
+        self.goal, self.goal_blank = self.pack(list(range(1, self.size)) + [0])
+
+    def pack(self, state):
+        """List of tiles -> (packed int, blank cell)."""
+        if sorted(state) != list(range(self.size)):
+            raise ValueError(f"not a {self.n}x{self.n} board: {state}")
+        s = 0
+        for i, v in enumerate(state):
+            s |= v << (i * self.bits)
+        return s, state.index(0)
+
+    def unpack(self, s):
+        bits, mask = self.bits, self.mask
+        return [(s >> (i * bits)) & mask for i in range(self.size)]
+
+    def blank(self, s):
+        bits, mask = self.bits, self.mask
+        for i in range(self.size):
+            if not (s >> (i * bits)) & mask:
+                return i
+        raise ValueError("board has no blank")
+
+    def manhattan(self, s):
+        bits, mask, dist = self.bits, self.mask, self.dist
+        return sum(dist[(s >> (i * bits)) & mask][i] for i in range(self.size))
+
+    def solvable(self, state):
+        """Inversion parity test (plus blank row for even widths) against the standard goal."""
+        tiles = [v for v in state if v]
+        inv = sum(1 for i in range(len(tiles)) for j in range(i + 1, len(tiles)) if tiles[i] > tiles[j])
+        if self.n % 2:
+            return inv % 2 == 0
+        return (inv + self.n - 1 - state.index(0) // self.n) % 2 == 0
+
+    def successors(self, s, z):
+        """Yield (next state, next blank, moved tile) for every legal slide."""
+        mask = self.mask
+        for nz, sn, sz in self.moves[z]:
+            t = (s >> sn) & mask
+            yield s ^ (t << sn) ^ (t << sz), nz, t
+
+    def scramble(self, moves=20, rng=random):
+        """Random walk of the blank away from the goal; returns a tile list."""
+        s, z = self.goal, self.goal_blank
+        for _ in range(moves):
+            s, z, _t = rng.choice(list(self.successors(s, z)))
+        return self.unpack(s)
+
+    def trace(self, parent, s):
+        """Follow parent links back to the root and return the path as tile lists."""
+        path = []
+        while s != -1:
+            path.append(self.unpack(s))
+            s = parent[s]
+        return path[::-1]
+
+
+# --- A* on packed states ---
+def astar(board, start, limit=200000, heuristic=None, open_list=HeapOpenList, monitor=None):
+    """A* over packed ints; the heuristic is updated from the moved tile only.
+
+    open_list is a factory for one of the queues in puzzle/openlist.py;
+    monitor is an optional puzzle.monitor.SearchMonitor.
+    """
+    s0, z0 = board.pack(start)
+    if heuristic is None:
+        heuristic = Manhattan(board)
+    h0 = heuristic(s0)
+    goal, moves, mask, update = board.goal, board.moves, board.mask, heuristic.update
+    dist = heuristic.dist if type(heuristic) is Manhattan else None  # inline the common case
+    open_set = open_list()
+    push, pop = open_set.push, open_set.pop
+
+    push(h0, 0, (s0, z0, h0))
+    gscore = {s0: 0}
+    parent = {s0: -1}
+    steps = 0; expanded = 0
+    if monitor:
+        monitor.start()
+    next_sample = monitor.every if monitor else -1
+
+    while open_set:
+        f, g, (s, z, h) = pop()
+        if g > gscore[s]:
+            continue  # stale entry, a cheaper copy was pushed later
+        steps += 1
+        if s == goal:
+            return board.trace(parent, s), steps, expanded
+        expanded += 1
+        if expanded == next_sample:
+            monitor.sample(len(open_set), len(gscore), expanded)
+            next_sample += monitor.every
+        if steps > limit:
+            return None, None, None
+
+        tg = g + 1
+        for nz, sn, sz in moves[z]:
+            t = (s >> sn) & mask
+            ns = s ^ (t << sn) ^ (t << sz)
+            if tg < gscore.get(ns, tg + 1):
+                gscore[ns] = tg
+                parent[ns] = s
+                nh = h + dist[t][z] - dist[t][nz] if dist else update(h, ns, t, nz, z)
+                push(tg + nh, tg, (ns, nz, nh))
+    return None, None, None
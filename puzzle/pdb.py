@@ -0,0 +1,197 @@
+# pdb.py  –  additive disjoint pattern databases, built once and memory-mapped
+import argparse
+import mmap
+import os
+from collections import deque
+from math import perm
+
+UNSEEN = 255
+PDB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdb")  # tables live with the package, not the cwd
+# Largest scratch array build() accepts.  A 6-tile group on the 15-puzzle needs
+# 92 MB and builds in minutes; a 7-tile group needs 0.9 GB and an 8-tile group
+# (the 7-8 partition) 8.3 GB, each with as many BFS states -- days of pure
+# Python, so those partitions are refused rather than attempted.
+MAX_SCRATCH = 256 << 20
+
+
+# --- Ranking of pattern tile positions ---
+def rank(positions, size):
+    """Cells of k distinct tiles -> index in [0, size!/(size-k)!)."""
+    r = 0; used = 0
+    for i, p in enumerate(positions):
+        r = r * (size - i) + p - (used & ((1 << p) - 1)).bit_count()
+        used |= 1 << p
+    return r
+
+
+def unrank(r, k, size):
+    digits = []
+    for i in range(k - 1, -1, -1):
+        r, d = divmod(r, size - i)
+        digits.append(d)
+    free = list(range(size))
+    return [free.pop(d) for d in reversed(digits)]
+
+
+def pdb_path(directory, n, tiles):
+    return os.path.join(directory, f"pdb{n}x{n}-{'-'.join(map(str, tiles))}.bin")
+
+
+# --- Builder ---
+def check_size(n, tiles, max_scratch=MAX_SCRATCH):
+    """ValueError when the table for tiles needs more than max_scratch bytes to build."""
+    size = n * n
+    scratch = perm(size, len(tiles)) * size
+    if scratch > max_scratch:
+        raise ValueError(f"tiles {tuple(tiles)}: {scratch / 2**30:.1f} GiB of scratch and as many BFS states, "
+                         f"too big to build in pure Python; use groups of at most 6 tiles (e.g. 6-6-3)")
+
+
+def build(n, tiles, max_scratch=MAX_SCRATCH):
+    """Backward 0-1 BFS from the goal over (pattern cells, blank cell).
+
+    Only slides of pattern tiles cost a move, so the tables of a disjoint
+    partition can be summed.  Needs size * size!/(size-k)! bytes of scratch
+    (ValueError above max_scratch); returns a bytearray of the minimum over
+    blank cells for every pattern rank.
+    """
+    check_size(n, tiles, max_scratch)
+    size = n * n
+    k = len(tiles)
+    moves = []
+    for z in range(size):
+        r, c = divmod(z, n)
+        moves.append([nr * n + nc for nr, nc in [(r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)]
+                      if 0 <= nr < n and 0 <= nc < n])
+
+    dist = bytearray([UNSEEN]) * (perm(size, k) * size)
+    code = rank([t - 1 for t in tiles], size) * size + size - 1
+    dist[code] = 0
+    queue = deque([code])
+    while queue:
+        code = queue.popleft()
+        d = dist[code]
+        r, z = divmod(code, size)
+        cells = unrank(r, k, size)
+        for nz in moves[z]:
+            if nz in cells:
+                # a pattern tile slides into the blank: one real move
+                j = cells.index(nz)
+                cells[j] = z
+                nxt = rank(cells, size) * size + nz
+                cells[j] = nz
+                if dist[nxt] > d + 1:
+                    dist[nxt] = d + 1
+                    queue.append(nxt)
+            else:
+                nxt = r * size + nz
+                if dist[nxt] > d:
+                    dist[nxt] = d
+                    queue.appendleft(nxt)
+
+    table = bytearray(perm(size, k))
+    for r in range(len(table)):
+        table[r] = min(dist[r * size:(r + 1) * size])
+    return table
+
+
+def build_partition(n, partition, directory, force=False, max_scratch=MAX_SCRATCH):
+    """Write one table file per pattern; files already on disk are kept unless force."""
+    for tiles in partition:  # refuse an infeasible partition before spending minutes on its first group
+        if force or not os.path.exists(pdb_path(directory, n, tiles)):
+            check_size(n, tiles, max_scratch)
+    os.makedirs(directory, exist_ok=True)
+    for tiles in partition:
+        path = pdb_path(directory, n, tiles)
+        if os.path.exists(path) and not force:
+            continue
+        table = build(n, tiles, max_scratch)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(table)
+        os.replace(tmp, path)  # readers never see a half-written table
+
+
+# --- Loading ---
+class PatternDB:
+    """One read-only, memory-mapped table; pages are shared by every process that maps it."""
+
+    def __init__(self, path, n, tiles):
+        self.path = path
+        self.n = n
+        self.tiles = tuple(tiles)
+        self.size = n * n
+        with open(path, "rb") as f:
+            self.table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.table) != perm(self.size, len(self.tiles)):
+            raise ValueError(f"{path}: wrong size for tiles {self.tiles} on a {n}x{n} board")
+
+    def lookup(self, cells):
+        return self.table[rank(cells, self.size)]
+
+    # workers re-map the file instead of pickling its contents
+    def __getstate__(self):
+        return self.path, self.n, self.tiles
+
+    def __setstate__(self, state):
+        self.__init__(*state)
+
+
+class PatternDBHeuristic:
+    """Sum of disjoint pattern tables; a slide only re-ranks the moved tile's pattern."""
+
+    def __init__(self, board, dbs):
+        self.board = board
+        self.dbs = list(dbs)
+        self.owner = {}
+        for db in self.dbs:
+            for t in db.tiles:
+                if t in self.owner:
+                    raise ValueError(f"tile {t} appears in more than one pattern")
+                self.owner[t] = db
+
+    def cells(self, s):
+        """tile -> cell for the packed state s."""
+        bits, mask = self.board.bits, self.board.mask
+        where = [0] * self.board.size
+        for i in range(self.board.size):
+            where[(s >> (i * bits)) & mask] = i
+        return where
+
+    def __call__(self, s):
+        where = self.cells(s)
+        return sum(db.lookup([where[t] for t in db.tiles]) for db in self.dbs)
+
+    def update(self, h, ns, tile, src, dst):
+        db = self.owner.get(tile)
+        if db is None:
+            return h
+        where = self.cells(ns)
+        cells = [where[t] for t in db.tiles]
+        new = db.lookup(cells)
+        cells[db.tiles.index(tile)] = src
+        return h - db.lookup(cells) + new
+
+
+def load_partition(board, partition, directory, build_missing=True):
+    """Heuristic over the tables in directory, building any that are missing first."""
+    if build_missing:
+        build_partition(board.n, partition, directory)
+    return PatternDBHeuristic(board, [PatternDB(pdb_path(directory, board.n, tiles), board.n, tiles)
+                                      for tiles in partition])
+
+
+def parse_partition(text):
+    """'1,2,3,4/5,6,7,8' -> [(1, 2, 3, 4), (5, 6, 7, 8)]"""
+    return [tuple(int(t) for t in part.split(",")) for part in text.split("/")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build additive pattern databases")
+    parser.add_argument("--n", type=int, default=4, help="board width")
+    parser.add_argument("--partition", default="1,2,3,4,5,6/7,8,9,10,11,12/13,14,15",
+                        help="tile groups separated by '/' (at most 6 tiles each; 7-8 is infeasible)")
+    parser.add_argument("--out", default=PDB_DIR, help="directory for the table files")
+    parser.add_argument("--force", action="store_true", help="rebuild tables that already exist")
+    args = parser.parse_args()
+    build_partition(args.n, parse_partition(args.partition), args.out, args.force)
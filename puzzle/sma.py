@@ -0,0 +1,192 @@
+# sma.py  –  memory-bounded A* (SMA*) over preallocated node arrays
+import heapq
+from array import array
+
+from puzzle.heuristics import Manhattan
+
+INF = 1 << 30       # f of a node that cannot reach the goal inside the memory bound
+NODE_BYTES = 600    # per stored node: arrays, index dict entry and heap entries, measured with tracemalloc
+COMPACT = 2         # rebuild the heaps once they grow this many times past their live size
+
+
+def sma(board, start, budget_bytes=64 << 20, heuristic=None, limit=None, monitor=None):
+    """SMA*; keeps at most budget_bytes // NODE_BYTES nodes and returns (path, steps, expanded).
+
+    Nodes live in fixed arrays indexed by slot (packed state, parent slot, g,
+    h, f, blank, child count), so parent pointers cost four bytes.  When every
+    slot is taken, the worst open leaf (highest f, then shallowest) is dropped
+    and its f is remembered by its parent.  The parent is queued again under
+    the smallest remembered f, a backed-up bound that is still admissible, and
+    regenerates the dropped children once that is the best f left; a parent
+    that has lost all its children becomes an open leaf itself.  The answer stays optimal whenever the optimal path fits in the
+    budget; otherwise (None, None, None) is returned.  `limit` caps expansions.
+    """
+    if heuristic is None:
+        heuristic = Manhattan(board)
+    if not board.solvable(start):
+        return None, None, None
+    cap = max(2, budget_bytes // NODE_BYTES)
+    goal, moves, mask, update = board.goal, board.moves, board.mask, heuristic.update
+    push, pop = heapq.heappush, heapq.heappop
+
+    state = array("Q", bytes(8 * cap)) if board.size * board.bits <= 64 else [0] * cap
+    parent = array("i", bytes(4 * cap))
+    gs = array("H", bytes(2 * cap))
+    hs = array("H", bytes(2 * cap))
+    fs = array("i", bytes(4 * cap))
+    forgot = array("i", bytes(4 * cap))   # lowest f among dropped children
+    blank = bytearray(cap)
+    kids = bytearray(cap)
+    is_open = bytearray(cap)
+    version = array("I", bytes(4 * cap))
+    free = []       # slots given back by dropped nodes
+    used = 1        # slots below this have been handed out; slot 0 is the root
+    index = {}      # packed state -> slot
+    best = []       # (f, -g, version, slot): lowest f, deepest first
+    worst = []      # (-f, g, version, slot): highest f, shallowest first
+    n_open = 0
+    busy = -1       # slot being expanded; not reopened while its children are added
+    compact_at = 1024
+
+    def reopen(i):
+        nonlocal n_open
+        if not is_open[i]:
+            is_open[i] = 1
+            n_open += 1
+        push(best, (fs[i], -gs[i], version[i], i))
+        push(worst, (-fs[i], gs[i], version[i], i))
+
+    def valid(i, v, f):
+        return is_open[i] and version[i] == v and fs[i] == f
+
+    def regen_due(i, v, f):
+        # an expanded node with dropped children is queued again under their best f
+        return not is_open[i] and kids[i] and version[i] == v and forgot[i] == f
+
+    def drop(w):
+        """Forget open leaf w and back its f up into its parent."""
+        nonlocal n_open
+        is_open[w] = 0
+        n_open -= 1
+        if index.get(state[w]) == w:
+            del index[state[w]]
+        version[w] += 1
+        free.append(w)
+        p = parent[w]
+        if fs[w] < forgot[p]:
+            forgot[p] = fs[w]
+        kids[p] -= 1
+        if p != busy:
+            if not kids[p]:
+                fs[p] = forgot[p]
+                reopen(p)
+            elif forgot[p] == fs[w]:
+                push(best, (forgot[p], -gs[p], version[p], p))
+
+    def make_room(f, g):
+        """Free a slot for a node (f, g); False when that node is itself the worst."""
+        while worst:
+            nf, wg, v, w = worst[0]
+            if not valid(w, v, -nf):
+                pop(worst)
+                continue
+            if parent[w] < 0 or f > -nf or (f == -nf and g <= wg):
+                return False
+            pop(worst)
+            drop(w)
+            return True
+        return False
+
+    s0, z0 = board.pack(start)
+    h0 = heuristic(s0)
+    state[0], parent[0], gs[0], hs[0], fs[0], blank[0] = s0, -1, 0, h0, h0, z0
+    index[s0] = 0
+    reopen(0)
+    steps = 0; expanded = 0
+    if monitor:
+        monitor.start()
+    next_sample = monitor.every if monitor else -1
+
+    while best:
+        f, _g, v, i = pop(best)
+        if valid(i, v, f):
+            is_open[i] = 0
+            n_open -= 1
+        elif not regen_due(i, v, f):
+            continue
+        if f >= INF:
+            break  # every open node needs more memory than the budget allows
+        steps += 1
+        s = state[i]
+        if s == goal:
+            path = []
+            while i >= 0:
+                path.append(board.unpack(state[i]))
+                i = parent[i]
+            return path[::-1], steps, expanded
+        expanded += 1
+        if expanded == next_sample:
+            monitor.sample(n_open, used - len(free), expanded)
+            next_sample += monitor.every
+        if limit and expanded > limit:
+            break
+        busy = i
+        forgot[i] = INF
+        g, h, z = gs[i] + 1, hs[i], blank[i]
+        back = state[parent[i]] if parent[i] >= 0 else -1
+        for nz, sn, sz in moves[z]:
+            t = (s >> sn) & mask
+            ns = s ^ (t << sn) ^ (t << sz)
+            if ns == back:
+                continue
+            j = index.get(ns)
+            if j is not None:
+                if gs[j] <= g:
+                    continue  # already stored at least as cheaply
+                if is_open[j]:
+                    # a cheaper way to an open leaf: hang it under i
+                    op = parent[j]
+                    kids[op] -= 1
+                    if not kids[op] and op != busy:
+                        fs[op] = forgot[op]
+                        reopen(op)
+                    parent[j], gs[j], fs[j] = i, g, max(g + hs[j], f)
+                    kids[i] += 1
+                    reopen(j)
+                    continue
+                # an expanded copy has a subtree built on the worse g; leave it to be
+                # dropped as its leaves lose out and store a fresh node instead
+            nh = update(h, ns, t, nz, z)
+            nf = max(g + nh, f)  # pathmax keeps f monotone along the path
+            if g >= cap - 1 and ns != goal:
+                nf = INF  # a longer path than this cannot be held in memory
+            if free:
+                j = free.pop()
+            elif used < cap:
+                j = used
+                used += 1
+            elif make_room(nf, g):
+                j = free.pop()
+            else:
+                if nf < forgot[i]:
+                    forgot[i] = nf
+                continue
+            state[j], parent[j], gs[j], hs[j], fs[j], blank[j], kids[j] = ns, i, g, nh, nf, nz, 0
+            forgot[j] = INF
+            index[ns] = j
+            kids[i] += 1
+            reopen(j)
+        busy = -1
+        if not kids[i]:
+            fs[i] = forgot[i]
+            reopen(i)
+        elif forgot[i] < INF:
+            push(best, (forgot[i], -gs[i], version[i], i))
+        if len(best) + len(worst) > compact_at:
+            # frontier compaction: drop the stale heap entries left by lazy deletion
+            best[:] = [e for e in best if valid(e[3], e[2], e[0]) or regen_due(e[3], e[2], e[0])]
+            worst[:] = [e for e in worst if valid(e[3], e[2], -e[0])]
+            heapq.heapify(best)
+            heapq.heapify(worst)
+            compact_at = COMPACT * (len(best) + len(worst)) + 1024
+    return None, None, None
@@ -0,0 +1,61 @@
+# solver.py  –  board-size-parameterized search front end
+from puzzle.anytime import anytime
+from puzzle.bidirectional import bidirectional
+from puzzle.heuristics import Manhattan
+from puzzle.ida import TranspositionTable, bits_for, idastar
+from puzzle.openlist import OPEN_LISTS
+from puzzle.packed import PackedBoard, astar
+from puzzle.sma import sma
+
+
+class Solver:
+    """Searches on an n x n board; every method returns (path, steps, expanded).
+
+    astar, idastar, bidirectional, anytime and sma accept monitor=SearchMonitor(...)
+    from puzzle.monitor to sample the search while it runs.
+    """
+
+    def __init__(self, n=3, heuristic=None, open_list="bucket"):
+        self.n = n
+        self.board = PackedBoard(n)
+        self.heuristic = heuristic or Manhattan(self.board)
+        self.open_list = OPEN_LISTS[open_list]
+        self._table = None
+        self._tt = None     # IDA* transposition table, reused by every idastar call
+
+    def astar(self, start, limit=200000, monitor=None):
+        return astar(self.board, start, limit, self.heuristic, self.open_list, monitor)
+
+    def idastar(self, start, limit=None, table_bits=20, monitor=None):
+        bits = bits_for(self.board, table_bits)
+        if self._tt is None or self._tt.bits != bits:
+            self._tt = TranspositionTable(bits)
+        return idastar(self.board, start, limit, self.heuristic, table_bits, monitor, self._tt)
+
+    def bidirectional(self, start, limit=200000, monitor=None):
+        return bidirectional(self.board, start, limit, self.heuristic, monitor)
+
+    def anytime(self, start, budget_ms=None, weight=2.0, limit=None, monitor=None):
+        """Weighted anytime A*; returns (path, steps, expanded, bound)."""
+        return anytime(self.board, start, budget_ms, weight, limit, self.heuristic, monitor)
+
+    def sma(self, start, budget_bytes=64 << 20, limit=None, monitor=None):
+        """Memory-bounded A* that never holds more than about budget_bytes of nodes."""
+        return sma(self.board, start, budget_bytes, self.heuristic, limit, monitor)
+
+    def hda(self, start, workers=None, limit=None):
+        """Hash-distributed A* on worker processes."""
+        from puzzle.hda import hda  # multiprocessing is only paid for when used
+        return hda(self.board, start, workers, self.heuristic, limit)
+
+    def table(self, start):
+        """Greedy descent through the complete 3x3 distance table (needs NumPy)."""
+        if self.n != 3:
+            raise ValueError("the complete distance table only exists for 3x3 boards")
+        if self._table is None:
+            from puzzle.table8 import CompleteTable
+            self._table = CompleteTable()
+        return self._table.solve(start)
+
+    def solve(self, start, method="astar", **kw):
+        return getattr(self, method)(start, **kw)
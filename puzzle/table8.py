@@ -0,0 +1,164 @@
+# table8.py  –  complete distance table for the 8-puzzle, indexed by Lehmer rank
+import argparse
+import mmap
+import os
+from math import factorial
+
+import numpy as np
+
+from puzzle.pdb import PDB_DIR
+
+SIZE = 9
+STATES = factorial(SIZE)   # both parities; the unreachable half stays UNSEEN
+UNSEEN = 255
+GOAL = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+WEIGHTS = [factorial(SIZE - 1 - i) for i in range(SIZE)]
+FACT = np.array(WEIGHTS, dtype=np.int64)
+# blank cell -> cells it can swap with
+MOVES = [[nz for nz in (z - 3, z + 3, z - 1 if z % 3 else -1, z + 1 if z % 3 < 2 else -1) if 0 <= nz < SIZE]
+         for z in range(SIZE)]
+
+
+# --- Lehmer code ranking ---
+def rank(state):
+    r = 0
+    for i, v in enumerate(state):
+        r += sum(1 for w in state[i + 1:] if w < v) * WEIGHTS[i]
+    return r
+
+
+def rank_many(states):
+    """(m, 9) boards -> (m,) ranks."""
+    later = np.triu(np.ones((SIZE, SIZE), dtype=bool), 1)
+    smaller = (states[:, None, :] < states[:, :, None]) & later
+    return smaller.sum(axis=2) @ FACT
+
+
+def unrank_many(ranks):
+    """(m,) ranks -> (m, 9) boards."""
+    m = len(ranks)
+    rows = np.arange(m)
+    free = np.ones((m, SIZE), dtype=bool)
+    out = np.empty((m, SIZE), dtype=np.int8)
+    rest = np.asarray(ranks, dtype=np.int64)
+    for i in range(SIZE):
+        digit, rest = np.divmod(rest, FACT[i])
+        # value = the digit-th value not used yet
+        v = np.argmax(np.cumsum(free, axis=1) > digit[:, None], axis=1)
+        out[:, i] = v
+        free[rows, v] = False
+    return out
+
+
+def neighbors_many(states):
+    """Yield (rows, boards) for each of the four slide directions that is legal."""
+    blank = np.argmax(states == 0, axis=1)
+    r, c = np.divmod(blank, 3)
+    for dr, dc in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+        ok = (0 <= r + dr) & (r + dr < 3) & (0 <= c + dc) & (c + dc < 3)
+        rows = np.nonzero(ok)[0]
+        z = blank[rows]
+        nz = z + dr * 3 + dc
+        boards = states[rows].copy()
+        idx = np.arange(len(rows))
+        boards[idx, z] = boards[idx, nz]
+        boards[idx, nz] = 0
+        yield rows, boards
+
+
+# --- Builder ---
+def build():
+    """Layer-by-layer BFS from the goal, one NumPy pass per depth."""
+    dist = np.full(STATES, UNSEEN, dtype=np.uint8)
+    frontier = np.array([rank(GOAL)], dtype=np.int64)
+    dist[frontier] = 0
+    depth = 0
+    while len(frontier):
+        depth += 1
+        found = []
+        for _rows, boards in neighbors_many(unrank_many(frontier)):
+            r = rank_many(boards)
+            found.append(r[dist[r] == UNSEEN])
+        frontier = np.unique(np.concatenate(found))
+        dist[frontier] = depth
+    return dist
+
+
+class CompleteTable:
+    """Optimal distance of every 8-puzzle board; solving is a greedy walk downhill."""
+
+    def __init__(self, path=os.path.join(PDB_DIR, "table8.bin")):
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            build().tofile(tmp)
+            os.replace(tmp, path)
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.map) != STATES:
+            raise ValueError(f"{path}: expected {STATES} bytes, found {len(self.map)}")
+        # scalar lookups go through the mmap, batches through a NumPy view of the same pages
+        self.dist = np.frombuffer(self.map, dtype=np.uint8)
+
+    def distance(self, state):
+        """Optimal number of moves, or None if the board cannot reach the goal."""
+        d = self.map[rank(state)]
+        return None if d == UNSEEN else d
+
+    def solve(self, start):
+        """(path, steps, expanded) like astar; steps counts table lookups."""
+        d = self.distance(start)
+        if d is None:
+            return None, None, None
+        table = self.map
+        path = [list(start)]
+        cur = list(start)
+        steps = 1
+        while d:
+            z = cur.index(0)
+            for nz in MOVES[z]:
+                nb = cur[:]
+                nb[z], nb[nz] = nb[nz], 0
+                steps += 1
+                if table[rank(nb)] == d - 1:
+                    break
+            cur = nb
+            path.append(cur)
+            d -= 1
+        return path, steps, len(path) - 1
+
+    def distances(self, states):
+        """Batch of boards -> optimal distances, -1 for unsolvable ones."""
+        d = self.dist[rank_many(np.asarray(states, dtype=np.int8))].astype(np.int16)
+        d[d == UNSEEN] = -1
+        return d
+
+    def solve_many(self, states):
+        """Vectorized descent for a batch; returns one path (list of boards) or None per input."""
+        cur = np.asarray(states, dtype=np.int8)
+        d = self.distances(cur)
+        paths = [[b.tolist()] if k >= 0 else None for b, k in zip(cur, d)]
+        live = np.nonzero(d > 0)[0]
+        cur, d = cur[live], d[live]
+        while len(live):
+            nxt = cur.copy()
+            done = np.zeros(len(live), dtype=bool)
+            for rows, boards in neighbors_many(cur):
+                hit = ~done[rows] & (self.dist[rank_many(boards)] == d[rows] - 1)
+                nxt[rows[hit]] = boards[hit]
+                done[rows[hit]] = True
+            for i, b in zip(live, nxt):
+                paths[i].append(b.tolist())
+            d = d - 1
+            keep = d > 0
+            live, cur, d = live[keep], nxt[keep], d[keep]
+        return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the complete 8-puzzle distance table")
+    parser.add_argument("--out", default=os.path.join(PDB_DIR, "table8.bin"))
+    args = parser.parse_args()
+    if os.path.exists(args.out):
+        os.remove(args.out)
+    CompleteTable(args.out)
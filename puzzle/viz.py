@@ -0,0 +1,142 @@
+# viz.py  –  matplotlib front end; matplotlib is only imported once a visualizer is built
+import os
+from math import isqrt
+
+from puzzle.core import SOLVER
+from puzzle.incremental import IncrementalPlanner
+from puzzle.solver import Solver
+
+WRITERS = {".gif": "pillow", ".mp4": "ffmpeg"}
+
+
+# --- Visualization ---
+class PuzzleVisualizer:
+    # tile artists are created once and only moved; with headless=True the figure
+    # is drawn by the Agg canvas directly, so no display or pyplot is needed
+    def __init__(self,start,solver=None,headless=False):
+        from matplotlib.patches import Rectangle
+        self.n=n=isqrt(len(start))
+        self.solver=solver or (SOLVER if n==SOLVER.n else Solver(n))
+        self.start=start
+        self.current=start[:]
+        self.path=[]
+        self.headless=headless
+        if headless:
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            from matplotlib.figure import Figure
+            self.fig=Figure()
+            FigureCanvasAgg(self.fig)
+            self.ax=self.fig.subplots()
+        else:
+            import matplotlib.pyplot as plt
+            self.plt=plt
+            self.fig,self.ax=plt.subplots()
+        self.ax.axis("off")
+        # the status line sits in a strip above the board, inside the axes so blitting repaints it
+        self.ax.set_xlim(0,n); self.ax.set_ylim(n,-0.6)
+        self.txt=self.ax.text(n/2,-0.3,"",ha="center",va="center")
+        self.tiles={}
+        for v in range(n*n):
+            if v:
+                rect=Rectangle((0,0),1,1,fc="skyblue",ec="black")
+                label=self.ax.text(0,0,str(v),ha="center",va="center",fontsize=16*3//n,fontweight="bold")
+            else:
+                rect=Rectangle((0,0),1,1,fc="white",ec="gray",linestyle="--")
+                label=None
+            self.ax.add_patch(rect)
+            self.tiles[v]=(rect,label)
+        self.speed=500  # ms per frame
+        self.anim=None
+        self.planner=IncrementalPlanner(self.solver.board)  # repairs its last search when the board is nudged
+        self.draw_board(self.current)
+
+    def artists(self):
+        return [a for pair in self.tiles.values() for a in pair if a is not None]+[self.txt]
+
+    def draw_board(self,state):
+        for i,v in enumerate(state):
+            r,c=divmod(i,self.n)
+            rect,label=self.tiles[v]
+            rect.set_xy((c,r))
+            if label is not None: label.set_position((c+0.5,r+0.5))
+        return self.artists()
+
+    def do_solve(self,budget_ms=None):
+        # with a time budget: best path found in time plus its suboptimality bound
+        bound=None
+        if budget_ms:
+            self.path,steps,expanded,bound = self.solver.anytime(self.current,budget_ms)
+        else:
+            self.path,steps,expanded = self.solver.astar(self.current)
+        if not self.path:
+            self.txt.set_text("No solution found")
+        else:
+            msg=f"Solved in {len(self.path)-1} moves | Steps={steps}, Expanded={expanded}"
+            if bound is not None: msg+=f" | Bound≤{bound:.2f}"
+            self.txt.set_text(msg)
+
+    def make_animation(self,blit=True):
+        import matplotlib.animation as animation
+        def init():
+            return self.draw_board(self.path[0])
+        def update(frame):
+            self.current=self.path[frame]
+            self.txt.set_text(f"Step {frame}/{len(self.path)-1}")
+            return self.draw_board(self.current)
+        return animation.FuncAnimation(self.fig,update,frames=len(self.path),init_func=init,
+                                       interval=self.speed,repeat=False,blit=blit)
+
+    def animate_solution(self):
+        # headless figures have no window (and no pyplot): the animation is only built, for export or stepping
+        if not self.path: self.do_solve()
+        if not self.path: return None
+        self.anim=self.make_animation(blit=not self.headless)
+        if not self.headless: self.plt.show()
+        return self.anim
+
+    def export(self,out,fps=None):
+        """Render the solution path to out (.gif via Pillow, .mp4 via ffmpeg)."""
+        if not self.path: self.do_solve()
+        if not self.path: return False
+        writer=WRITERS.get(os.path.splitext(out)[1].lower())
+        if writer is None: raise ValueError(f"unsupported video format: {out}")
+        import matplotlib.animation as animation
+        if not animation.writers.is_available(writer): raise RuntimeError(f"{writer} is not installed, cannot write {out}")
+        self.make_animation(blit=False).save(out,writer=writer,fps=fps or 1000/self.speed)
+        return True
+
+    def step_once(self):
+        if not self.path: self.do_solve()
+        if not self.path: return
+        if self.current not in self.path:
+            self.path,steps,expanded=self.planner.plan(self.current)
+            if not self.path:
+                self.txt.set_text("No solution found")
+                return
+            self.txt.set_text(f"Replanned: {len(self.path)-1} moves | Steps={steps}, Expanded={expanded}")
+        idx=self.path.index(self.current)
+        if idx+1<len(self.path):
+            self.current=self.path[idx+1]
+            self.draw_board(self.current)
+            self.fig.canvas.draw_idle()
+
+    def reset(self):
+        self.current=self.solver.board.unpack(self.solver.board.goal)
+        self.path=[]
+        self.draw_board(self.current)
+        self.fig.canvas.draw_idle()
+
+
+def export_paths(paths,directory,fmt="gif",fps=4):
+    """Write one video per solution path with a single reused headless figure; returns the files."""
+    os.makedirs(directory,exist_ok=True)
+    viz=None; files=[]
+    for key,path in paths:
+        if not path: continue
+        if viz is None or viz.n!=isqrt(len(path[0])):
+            viz=PuzzleVisualizer(path[0],headless=True)
+        viz.path=path
+        out=os.path.join(directory,f"{key}.{fmt}")
+        viz.export(out,fps)
+        files.append(out)
+    return files
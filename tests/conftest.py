@@ -0,0 +1,41 @@
+# conftest.py  –  exact 8-puzzle distances by breadth-first search, the reference for every test
+import random
+from collections import deque
+
+import pytest
+
+GOAL = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+
+
+def neighbors(state):
+    z = state.index(0)
+    r, c = divmod(z, 3)
+    for nr, nc in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+        if 0 <= nr < 3 and 0 <= nc < 3:
+            s = list(state)
+            s[z], s[nr * 3 + nc] = s[nr * 3 + nc], s[z]
+            yield tuple(s)
+
+
+@pytest.fixture(scope="session")
+def distances():
+    """Every solvable 3x3 board -> its optimal number of moves (181,440 boards)."""
+    dist = {GOAL: 0}
+    queue = deque([GOAL])
+    while queue:
+        s = queue.popleft()
+        for t in neighbors(s):
+            if t not in dist:
+                dist[t] = dist[s] + 1
+                queue.append(t)
+    return dist
+
+
+@pytest.fixture(scope="session")
+def boards(distances):
+    """Two fixed boards for every depth from 0 to 22, as (list, optimal moves)."""
+    rng = random.Random(8)
+    by_depth = {}
+    for s, d in distances.items():
+        by_depth.setdefault(d, []).append(s)
+    return [(list(s), d) for d in range(23) for s in rng.sample(sorted(by_depth[d]), min(2, len(by_depth[d])))]
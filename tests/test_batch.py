@@ -0,0 +1,31 @@
+import json
+
+from puzzle.batch import done_ids, solve_batch
+
+UNSOLVABLE = [2, 1, 3, 4, 5, 6, 7, 8, 0]
+
+
+def test_only_solved_boards_are_counted(tmp_path, boards):
+    out = tmp_path / "out.jsonl"
+    items = [(i, b) for i, (b, _d) in enumerate(boards[:6])] + [("odd", UNSOLVABLE)]
+    assert solve_batch(items, str(out), workers=2, chunksize=1) == 6
+    recs = {r["id"]: r for r in map(json.loads, out.read_text().splitlines())}
+    assert len(recs) == 7
+    assert recs["odd"]["moves"] is None
+    assert all(recs[i]["moves"] == d for i, (_b, d) in enumerate(boards[:6]))
+
+
+def test_resume_skips_written_ids(tmp_path, boards):
+    out = tmp_path / "out.jsonl"
+    items = [(i, b) for i, (b, _d) in enumerate(boards[:4])]
+    solve_batch(items[:2], str(out), workers=1)
+    assert solve_batch(items, str(out), workers=1) == 2
+    assert done_ids(str(out)) == {0, 1, 2, 3}
+
+
+def test_hda_runs_outside_the_pool(tmp_path, boards):
+    out = tmp_path / "out.jsonl"
+    items = [(i, b) for i, (b, _d) in enumerate(boards[10:13])]
+    assert solve_batch(items, str(out), method="hda", workers=2) == 3
+    recs = sorted(map(json.loads, out.read_text().splitlines()), key=lambda r: r["id"])
+    assert [r["moves"] for r in recs] == [d for _b, d in boards[10:13]]
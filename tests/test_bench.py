@@ -0,0 +1,47 @@
+import copy
+
+import pytest
+
+from puzzle.bench import benchmark, compare, configs, corpus
+
+
+@pytest.fixture(scope="module")
+def report():
+    return benchmark(configs(["astar", "idastar"], ["manhattan"], ["heap", "bucket"]),
+                     depths=(8, 12), per_depth=3, isolate=False, every=4)
+
+
+def test_corpus_is_seeded():
+    assert corpus(depths=(6,), per_depth=4, seed=1) == corpus(depths=(6,), per_depth=4, seed=1)
+    assert corpus(depths=(6,), per_depth=4, seed=1) != corpus(depths=(6,), per_depth=4, seed=2)
+
+
+def test_report_covers_every_config(report):
+    assert [(r["method"], r["open_list"]) for r in report["results"]] == [
+        ("astar", "heap"), ("astar", "bucket"), ("idastar", "heap")]
+    for r in report["results"]:
+        assert r["solved"] == 6 and r["expanded"] > 0 and r["peak_open"] > 0
+
+
+def test_compare_flags_only_regressions(report):
+    assert compare(report, report) == []
+    worse = copy.deepcopy(report)
+    worse["results"][0]["expanded"] += 1
+    worse["results"][1]["seconds"] = report["results"][1]["seconds"] * 3 + 1
+    assert [p.split(":")[1].split()[0] for p in compare(worse, report)] == ["expanded", "seconds"]
+    worse["corpus"]["seed"] += 1
+    assert compare(worse, report) == ["corpus differs from the baseline; results are not comparable"]
+
+
+def test_compare_skips_counts_that_depend_on_the_clock(report):
+    baseline = copy.deepcopy(report)
+    for r, method, options in zip(baseline["results"], ["anytime", "hda"], [{"budget_ms": 5}, {}]):
+        r.update(method=method, open_list="heap", options=options)
+    runs = copy.deepcopy(baseline)
+    runs["results"][0]["expanded"] += 100
+    runs["results"][0]["moves"] += 2
+    runs["results"][1]["expanded"] += 100
+    assert compare(runs, baseline) == []
+    runs["results"][1]["moves"] += 2
+    assert compare(runs, baseline) == [f"hda/manhattan/heap: total moves {runs['results'][1]['moves']} > "
+                                       f"{baseline['results'][1]['moves']}"]
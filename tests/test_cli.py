@@ -0,0 +1,30 @@
+import json
+import os
+import subprocess
+import sys
+
+from puzzle.__main__ import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_core_cli_and_demo_import_without_plotting():
+    code = ("import sys, Apuzzle, puzzle.core, puzzle.__main__\n"
+            "print(sorted(m for m in sys.modules if m.split('.')[0] in ('matplotlib', 'multiprocessing')))")
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+def test_solve_prints_one_record(capsys, distances):
+    board = [4, 1, 3, 7, 2, 6, 0, 5, 8]
+    main(["solve", " ".join(map(str, board)), "--method", "idastar"])
+    rec = json.loads(capsys.readouterr().out)
+    assert rec["start"] == board and rec["moves"] == distances[tuple(board)] == len(rec["tiles"])
+
+
+def test_batch_writes_jsonl(tmp_path, capsys, boards):
+    src, out = tmp_path / "boards.txt", tmp_path / "out.jsonl"
+    src.write_text("".join(json.dumps(b) + "\n" for b, _d in boards[:4]))
+    main(["batch", str(src), str(out), "--workers", "1"])
+    assert capsys.readouterr().out.startswith("4 boards solved")
+    assert [json.loads(line)["moves"] for line in out.read_text().splitlines()] == [d for _b, d in boards[:4]]
@@ -0,0 +1,46 @@
+import os
+import random
+
+import pytest
+
+from puzzle.heuristics import Manhattan
+from puzzle.packed import PackedBoard
+from puzzle.pdb import MAX_SCRATCH, build, build_partition, check_size, load_partition, rank, unrank
+
+
+def test_rank_round_trips():
+    for cells in ([0, 1, 2], [8, 0, 4], [5, 3, 7]):
+        assert unrank(rank(cells, 9), 3, 9) == cells
+
+
+def test_partition_is_admissible_and_dominates_manhattan(tmp_path, distances):
+    board = PackedBoard(3)
+    h = load_partition(board, [(1, 2, 3, 4), (5, 6, 7, 8)], str(tmp_path))
+    manhattan = Manhattan(board)
+    assert h(board.goal) == 0
+    for state in random.Random(3).sample(sorted(distances), 3000):
+        s = board.pack(list(state))[0]
+        assert manhattan(s) <= h(s) <= distances[state]
+
+
+def test_update_matches_full_evaluation(tmp_path):
+    board = PackedBoard(3)
+    h = load_partition(board, [(1, 2, 3, 4), (5, 6, 7, 8)], str(tmp_path))
+    s, z = board.pack([4, 1, 3, 7, 2, 6, 0, 5, 8])
+    value = h(s)
+    for nz, nshift, zshift in board.moves[z]:
+        tile = (s >> nshift) & board.mask
+        ns = s & ~(board.mask << nshift) | tile << zshift
+        assert h.update(value, ns, tile, nz, z) == h(ns)
+
+
+def test_seven_eight_partition_is_refused_before_building(tmp_path):
+    with pytest.raises(ValueError, match="at most 6 tiles"):
+        build_partition(4, [(1, 2, 3, 4, 5, 6, 7), (8, 9, 10, 11, 12, 13, 14, 15)], str(tmp_path))
+    assert os.listdir(tmp_path) == []
+    with pytest.raises(ValueError):
+        build(4, (1, 2, 3, 4, 5, 6, 7, 8))
+
+
+def test_six_tile_groups_fit():
+    check_size(4, (1, 2, 3, 4, 5, 6), MAX_SCRATCH)
@@ -0,0 +1,180 @@
+import random
+
+import pytest
+
+from puzzle.ida import TranspositionTable, bits_for, idastar
+from puzzle.incremental import IncrementalPlanner
+from puzzle.monitor import SearchMonitor
+from puzzle.openlist import OPEN_LISTS
+from puzzle.packed import PackedBoard
+from puzzle.pdb import load_partition
+from puzzle.sma import NODE_BYTES
+from puzzle.solver import Solver
+
+GOAL = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+UNSOLVABLE = [2, 1, 3, 4, 5, 6, 7, 8, 0]
+
+
+def check_path(path, start, moves):
+    """A legal sequence of single slides from start to the goal of the given length."""
+    assert path[0] == start and path[-1] == GOAL
+    assert len(path) - 1 == moves
+    for a, b in zip(path, path[1:]):
+        za, zb = a.index(0), b.index(0)
+        assert abs(za // 3 - zb // 3) + abs(za % 3 - zb % 3) == 1
+        assert a[zb] == b[za] and sum(x != y for x, y in zip(a, b)) == 2
+
+
+def test_packing_round_trips(boards):
+    board = PackedBoard(3)
+    for start, depth in boards:
+        s, z = board.pack(start)
+        assert board.unpack(s) == start and board.blank(s) == z == start.index(0)
+        assert board.manhattan(s) <= depth
+
+
+def test_successors_update_manhattan_incrementally():
+    board = PackedBoard(3)
+    s, z = board.pack([4, 1, 3, 7, 2, 6, 0, 5, 8])
+    h = board.manhattan(s)
+    for ns, nz, tile in board.successors(s, z):
+        assert board.blank(ns) == nz
+        assert board.manhattan(ns) == h + board.dist[tile][z] - board.dist[tile][nz]
+
+
+def test_wide_boards_scramble_to_solvable_states():
+    rng = random.Random(2)
+    for n, bits in ((3, 4), (4, 4), (5, 5)):
+        board = PackedBoard(n)
+        start = board.scramble(40, rng)
+        assert board.bits == bits and board.solvable(start)
+        assert board.unpack(board.pack(start)[0]) == start
+    assert not PackedBoard(3).solvable(UNSOLVABLE)
+
+
+@pytest.mark.parametrize("open_list", sorted(OPEN_LISTS))
+def test_open_lists_pop_the_lowest_f_first(open_list):
+    rng = random.Random(4)
+    entries = [(rng.randrange(12), rng.randrange(5), i) for i in range(300)]
+    ol = OPEN_LISTS[open_list]()
+    for f, g, i in entries:
+        ol.push(f, g, i)
+    popped = [ol.pop() for _ in range(len(ol))]
+    assert sorted(popped) == sorted(entries) and [f for f, _g, _i in popped] == sorted(f for f, _g, _i in entries)
+
+
+@pytest.mark.parametrize("open_list", sorted(OPEN_LISTS))
+def test_astar_is_optimal(boards, open_list):
+    solver = Solver(3, open_list=open_list)
+    for start, depth in boards:
+        check_path(solver.astar(start)[0], start, depth)
+
+
+@pytest.mark.parametrize("method", ["idastar", "bidirectional", "hda", "table"])
+def test_optimal_methods(boards, method):
+    solver = Solver(3)
+    options = {"workers": 2} if method == "hda" else {}
+    sample = boards[::4] if method == "hda" else boards  # every HDA* call starts processes
+    for start, depth in sample:
+        check_path(solver.solve(start, method, **options)[0], start, depth)
+
+
+def test_anytime_converges_to_the_optimum(boards):
+    solver = Solver(3)
+    for start, depth in boards:
+        path, _steps, _expanded, bound = solver.anytime(start)
+        check_path(path, start, depth)
+        assert bound == 1.0
+
+
+def test_anytime_bound_brackets_the_optimum_when_cut_short(boards):
+    solver = Solver(3)
+    cut = 0
+    for start, depth in boards:
+        path, _steps, _expanded, bound = solver.anytime(start, weight=3.0, limit=40)
+        if path is not None:
+            cut += bound > 1.0
+            assert depth <= len(path) - 1 and (len(path) - 1) / bound <= depth
+    assert cut
+@pytest.mark.parametrize("method", ["astar", "bidirectional", "anytime"])
+def test_monitors_see_the_stored_states(boards, method):
+    start, _depth = boards[-1]
+    monitor = SearchMonitor(every=1, keep=True)
+    Solver(3).solve(start, method, monitor=monitor)
+    last = monitor.samples[-1]
+    assert last["closed"] > last["expanded"]  # generated states are stored before they are expanded
+
+
+def test_sma_is_optimal_under_a_tight_budget(boards):
+    solver = Solver(3)
+    for start, depth in boards:
+        check_path(solver.sma(start, budget_bytes=64 << 10)[0], start, depth)
+
+
+def test_sma_never_stores_more_nodes_than_its_budget(boards):
+    start, depth = boards[-1]
+    monitor = SearchMonitor(every=1)
+    path, _steps, _expanded = Solver(3).sma(start, budget_bytes=64 << 10, monitor=monitor)
+    check_path(path, start, depth)
+    assert 0 < monitor.peak_closed <= (64 << 10) // NODE_BYTES
+
+
+def test_pattern_database_searches_stay_optimal(tmp_path, boards):
+    solver = Solver(3)
+    solver.heuristic = load_partition(solver.board, [(1, 2, 3, 4), (5, 6, 7, 8)], str(tmp_path))
+    for start, depth in boards:
+        check_path(solver.astar(start)[0], start, depth)
+        check_path(solver.idastar(start)[0], start, depth)
+
+
+def test_incremental_replanning_is_optimal(boards):
+    planner = IncrementalPlanner(PackedBoard(3))
+    for start, depth in boards:  # each plan reuses the tree of the previous one
+        check_path(planner.plan(start)[0], start, depth)
+
+
+def test_replanning_after_a_nudge_reuses_the_tree(boards, distances):
+    planner = IncrementalPlanner(PackedBoard(3))
+    start, _depth = boards[-1]
+    first = planner.plan(start)[2]
+    nudged = list(start)
+    z = nudged.index(0)
+    side = z + 1 if z % 3 < 2 else z - 1   # one slide off the planned path
+    nudged[z], nudged[side] = nudged[side], 0
+    path, _steps, again = planner.plan(nudged)
+    check_path(path, nudged, distances[tuple(nudged)])
+    assert again < first
+
+
+def test_hda_limit_below_the_worker_count_still_stops(boards):
+    start, _depth = boards[-1]
+    assert Solver(3).hda(start, workers=3, limit=2) == (None, None, None)
+
+
+@pytest.mark.parametrize("method", ["astar", "idastar", "bidirectional", "anytime", "sma", "hda"])
+def test_unsolvable_boards(method):
+    assert Solver(3).solve(UNSOLVABLE, method)[0] is None
+
+
+def test_idastar_table_is_sized_to_the_board_and_reused(boards):
+    board = PackedBoard(3)
+    assert bits_for(board) == 18            # 181,440 reachable 8-puzzle states
+    assert bits_for(PackedBoard(4)) == 20   # capped
+    table = TranspositionTable(bits_for(board))
+    for start, depth in boards:             # stale slots from earlier searches never cut a branch
+        check_path(idastar(board, start, table=table)[0], start, depth)
+    solver = Solver(3)
+    solver.idastar(boards[5][0])
+    first = solver._tt
+    solver.idastar(boards[6][0])
+    assert solver._tt is first
+
+
+def test_idastar_limit_and_monitor(boards):
+    start, depth = boards[-1]
+    assert Solver(3).idastar(start, limit=10) == (None, None, None)
+    monitor = SearchMonitor(every=8)
+    path, _steps, expanded = Solver(3).idastar(start, monitor=monitor)
+    monitor.finish(expanded)
+    check_path(path, start, depth)
+    assert 0 < monitor.peak_open <= depth + 1
@@ -0,0 +1,35 @@
+import inspect
+import os
+import random
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from puzzle.pdb import PDB_DIR
+from puzzle.table8 import CompleteTable
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    return CompleteTable(str(tmp_path_factory.mktemp("pdb") / "table8.bin"))
+
+
+def test_default_path_is_in_the_package():
+    default = inspect.signature(CompleteTable).parameters["path"].default
+    assert os.path.dirname(default) == PDB_DIR
+    assert os.path.isabs(default)
+
+
+def test_distances_match_bfs(table, distances):
+    sample = random.Random(5).sample(sorted(distances), 2000)
+    assert [table.distance(list(s)) for s in sample] == [distances[s] for s in sample]
+    assert table.distances(sample).tolist() == [distances[s] for s in sample]
+    assert table.distance([2, 1, 3, 4, 5, 6, 7, 8, 0]) is None  # odd permutation
+
+
+def test_solve_walks_an_optimal_path(table, boards):
+    for start, depth in boards:
+        path, steps, expanded = table.solve(start)
+        assert len(path) - 1 == depth
+        assert path[-1] == [1, 2, 3, 4, 5, 6, 7, 8, 0]
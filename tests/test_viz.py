@@ -0,0 +1,22 @@
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from puzzle.viz import PuzzleVisualizer, export_paths
+
+
+@pytest.mark.filterwarnings("ignore:Animation was deleted")
+def test_headless_animation_needs_no_pyplot():
+    viz = PuzzleVisualizer([1, 2, 3, 4, 5, 6, 0, 7, 8], headless=True)
+    anim = viz.animate_solution()
+    assert anim is viz.anim
+    assert len(viz.path) == 3
+    assert viz.draw_board(viz.path[-1])
+
+
+def test_export_paths_writes_one_file_per_path(tmp_path):
+    pytest.importorskip("PIL")
+    path = [[1, 2, 3, 4, 5, 6, 0, 7, 8], [1, 2, 3, 4, 5, 6, 7, 0, 8], [1, 2, 3, 4, 5, 6, 7, 8, 0]]
+    files = export_paths([("a", path), ("empty", None)], str(tmp_path), "gif", fps=10)
+    assert [f.rsplit("/", 1)[1] for f in files] == ["a.gif"]
+    assert (tmp_path / "a.gif").stat().st_size > 0